@@ -0,0 +1,191 @@
+"""
+Консольный запуск генерации тестов без графического интерфейса.
+
+    python -m app.cli generate project1.json project2.json -s all_transitions -f csv -o out/
+
+PyQt6 здесь не импортируется, поэтому команда работает на машинах без дисплея.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from .core.project_io import load_project
+from .core.test_generator import TestGenerator, GenerationLimits, STRATEGIES, STRATEGY_ALL_PATHS
+from .core.exporters import EXPORTERS, get_exporter, export_test_cases
+from .core.path_cache import PathCache, generate_cached, default_cache_dir
+from .core.minimization import MINIMIZE_MODES, MINIMIZE_NONE, minimize_paths
+from .core.sampling import WEIGHTINGS, WEIGHT_TYPE
+from .utils.profiling import profiler
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="MBT-Assistant: генерация тестов из файлов проектов")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="сгенерировать тест-кейсы для проектов")
+    generate.add_argument("projects", nargs="+", help="файлы проектов (.json или .mbtp)")
+    generate.add_argument("-s", "--strategy", choices=list(STRATEGIES), default=STRATEGY_ALL_PATHS,
+                          help="стратегия генерации (по умолчанию: %(default)s)")
+    generate.add_argument("-f", "--format", choices=list(EXPORTERS), default="csv",
+                          help="формат экспорта (по умолчанию: %(default)s)")
+    generate.add_argument("-o", "--output-dir", default=".",
+                          help="каталог для результатов (файл называется как проект, "
+                               "при совпадении имен - с расширением проекта или номером)")
+    generate.add_argument("--max-depth", type=int, help="максимальная длина пути")
+    generate.add_argument("--max-paths", type=int, help="максимальное число путей")
+    generate.add_argument("--loop-unroll", type=int, default=1, help="сколько раз переход может повториться в пути")
+    generate.add_argument("--time-budget", type=float, help="бюджет времени на один проект, сек")
+    generate.add_argument("--seed", type=int, default=0, help="зерно случайных блужданий (по умолчанию: %(default)s)")
+    generate.add_argument("--weighting", choices=list(WEIGHTINGS), default=WEIGHT_TYPE,
+                          help="веса переходов для случайных блужданий (по умолчанию: %(default)s)")
+    generate.add_argument("-w", "--workers", type=int, default=1,
+                          help="процессов для полного перебора внутри одного проекта")
+    generate.add_argument("-j", "--jobs", type=int, default=1,
+                          help="сколько проектов обрабатывать параллельно")
+    generate.add_argument("--cache-dir", default=default_cache_dir(),
+                          help="каталог кэша путей (по умолчанию: %(default)s)")
+    generate.add_argument("--no-cache", action="store_true", help="не использовать кэш путей")
+    generate.add_argument("--minimize", choices=list(MINIMIZE_MODES), default=MINIMIZE_NONE,
+                          help="сократить набор: redundant - убрать повторы и пути-префиксы, "
+                               "coverage - еще и пути, без которых покрытие не меняется (по умолчанию: %(default)s)")
+    generate.add_argument("--trace", metavar="FILE",
+                          help="записать замеры этапов в JSON-трассировку (chrome://tracing, Perfetto)")
+    generate.add_argument("--cprofile", metavar="FILE", help="записать обработку первого проекта в cProfile (.prof)")
+    return parser
+
+
+def output_paths(projects, output_dir, extension):
+    """
+    Пути результатов для проектов: файл называется как проект. Если имена совпали
+    (a.json и a.mbtp, model.json из разных каталогов), к имени добавляется расширение
+    проекта, а если и этого мало - номер: a.json.csv, model.json.csv, model.json-2.csv
+    """
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in projects]
+    counts = Counter(os.path.normcase(stem) for stem in stems)
+    names = [os.path.basename(path) if counts[os.path.normcase(stem)] > 1 else stem
+             for path, stem in zip(projects, stems)]
+
+    paths = []
+    taken = set()
+    for name in names:
+        candidate, number = name, 1
+        while os.path.normcase(candidate) in taken:
+            number += 1
+            candidate = f"{name}-{number}"
+        taken.add(os.path.normcase(candidate))
+        paths.append(os.path.join(output_dir, candidate + extension))
+    return paths
+
+
+def generate_project(project_path, output_path, strategy, exporter_key, limits, workers=1, cache_dir=None,
+                     minimize=MINIMIZE_NONE):
+    """
+    Полный цикл для одного проекта: загрузка, генерация (с дисковым кэшем
+    путей в cache_dir, если он задан), сокращение набора в режиме minimize, экспорт в output_path.
+    Возвращает словарь с итогами (его удобно передавать между процессами)
+    """
+    started = time.perf_counter()
+    exporter = get_exporter(exporter_key)
+    with profiler.span("cli.project", project=project_path, strategy=strategy):
+        graph, _ = load_project(project_path)
+
+        generator = TestGenerator(graph)
+        if not generator.find_start_node():
+            raise ValueError("не найден начальный узел (is_initial)")
+
+        # Между запусками живет только дисковая часть кэша
+        cache = PathCache(cache_dir, memory_entries=0) if cache_dir else None
+        result = generate_cached(generator, cache, strategy, limits, workers)
+        with profiler.span("cli.minimize", mode=minimize):
+            paths, minimization = minimize_paths(result.paths, generator.edges, minimize, strategy)
+        rows = export_test_cases(exporter.func, generator.iter_test_cases(paths), output_path)
+
+    return {
+        "project": project_path,
+        "output": output_path,
+        "paths": len(paths),
+        "removed": minimization.removed,
+        "steps": rows,
+        "coverage": result.coverage,
+        "truncation": result.truncation.summary(),
+        "cached": bool(cache and cache.hits),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def _generate_safe(args):
+    """Обертка для пула процессов: ошибка одного проекта не роняет остальные"""
+    try:
+        return generate_project(*args), None
+    except Exception as e:
+        return None, f"{args[0]}: {e}"
+
+
+def run_generate(options):
+    exporter = get_exporter(options.format)
+    if not exporter.available:
+        print(f"Для формата {exporter.extension} не установлен пакет {exporter.requires}", file=sys.stderr)
+        return 2
+
+    os.makedirs(options.output_dir, exist_ok=True)
+    limits = GenerationLimits(
+        options.max_depth, options.max_paths, options.loop_unroll, options.time_budget, options.seed, options.weighting
+    )
+    # Имена проверяются до запуска: иначе одинаково названные проекты перезаписали бы
+    # результаты друг друга (а при -j N еще и писали бы в один файл одновременно)
+    outputs = output_paths(options.projects, options.output_dir, exporter.extension)
+    tasks = [
+        (path, output, options.strategy, options.format, limits, options.workers,
+         None if options.no_cache else options.cache_dir, options.minimize)
+        for path, output in zip(options.projects, outputs)
+    ]
+
+    if options.trace:
+        profiler.enabled = True
+    if options.cprofile:
+        profiler.capture_next("cli.project", options.cprofile)
+    # Замеры собираются только в этом процессе, поэтому с ними проекты идут по очереди
+    profiling = options.trace or options.cprofile
+    if options.jobs > 1 and len(tasks) > 1 and profiling:
+        print("С --trace и --cprofile проекты обрабатываются последовательно", file=sys.stderr)
+
+    if options.jobs > 1 and len(tasks) > 1 and not profiling:
+        with ProcessPoolExecutor(max_workers=min(options.jobs, len(tasks))) as executor:
+            outcomes = list(executor.map(_generate_safe, tasks))
+    else:
+        outcomes = [_generate_safe(task) for task in tasks]
+
+    failed = 0
+    for summary, error in outcomes:
+        if error:
+            failed += 1
+            print(f"ОШИБКА {error}", file=sys.stderr)
+            continue
+        line = (f"{summary['project']} -> {summary['output']}: путей {summary['paths']}, "
+                f"шагов {summary['steps']}, покрытие {summary['coverage']:.1f}%, {summary['seconds']:.2f} сек")
+        if summary["removed"]:
+            line += f" [сокращено на {summary['removed']}]"
+        if summary["cached"]:
+            line += " [из кэша]"
+        if summary["truncation"]:
+            line += f" (неполный: {summary['truncation']})"
+        print(line)
+
+    if options.trace:
+        profiler.dump(options.trace)
+        print(f"Трассировка записана в {options.trace}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    if options.command == "generate":
+        return run_generate(options)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+def strongly_connected_components(graph):
+    """
+    Алгоритм Тарьяна (итеративный, без рекурсии) за линейное время.
+    Возвращает список компонент (списков ID узлов) в обратном топологическом
+    порядке: компонента идет раньше всех компонент, из которых в нее можно попасть.
+    """
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+
+    for root in graph.nodes:
+        if root.id in index:
+            continue
+
+        index[root.id] = low[root.id] = counter
+        counter += 1
+        stack.append(root.id)
+        on_stack.add(root.id)
+        work = [(root.id, iter(graph.outgoing(root)))]
+
+        while work:
+            node_id, transitions = work[-1]
+            for trans in transitions:
+                target_id = trans.target.id
+                if target_id not in index:
+                    # Спускаемся в еще не посещенный узел
+                    index[target_id] = low[target_id] = counter
+                    counter += 1
+                    stack.append(target_id)
+                    on_stack.add(target_id)
+                    work.append((target_id, iter(graph.outgoing(trans.target))))
+                    break
+                if target_id in on_stack:
+                    low[node_id] = min(low[node_id], index[target_id])
+            else:
+                # Все переходы узла обработаны - возвращаемся к родителю
+                work.pop()
+                if work:
+                    parent_id = work[-1][0]
+                    low[parent_id] = min(low[parent_id], low[node_id])
+
+                if low[node_id] == index[node_id]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node_id:
+                            break
+                    components.append(component)
+
+    return components
+
+
+def condensation(graph):
+    """
+    Сжимает компоненты сильной связности в вершины DAG.
+    Возвращает (компоненты, словарь ID узла -> номер компоненты)
+    """
+    components = strongly_connected_components(graph)
+    component_of = {}
+    for number, component in enumerate(components):
+        for node_id in component:
+            component_of[node_id] = number
+    return components, component_of
+
+
+def reaching_nodes(graph, target_ids):
+    """
+    Множество ID узлов, из которых достижим хотя бы один узел target_ids
+    (включая сами эти узлы, если они есть в графе). Обход по входящим переходам
+    """
+    reached = {node_id for node_id in target_ids if graph.get_node(node_id) is not None}
+    queue = list(reached)
+    while queue:
+        node = graph.get_node(queue.pop())
+        for trans in graph.incoming(node):
+            source_id = trans.source.id
+            if source_id not in reached:
+                reached.add(source_id)
+                queue.append(source_id)
+    return reached
+
+
+def reachable_nodes(graph, start_node):
+    """Множество ID узлов, достижимых из start_node (включая его самого)"""
+    reached = {start_node.id}
+    queue = [start_node]
+    while queue:
+        for trans in graph.outgoing(queue.pop()):
+            if trans.target.id not in reached:
+                reached.add(trans.target.id)
+                queue.append(trans.target)
+    return reached
+
+
+def live_nodes(graph, components=None, component_of=None):
+    """
+    Множество ID узлов, из которых достижимо конечное состояние (узел без исходящих
+    переходов). Считается по конденсации: компонента живая, если в ней есть конечный
+    узел или из нее есть переход в живую компоненту
+    """
+    if components is None:
+        components, component_of = condensation(graph)
+
+    live_components = set()
+    # Компоненты идут в обратном топологическом порядке: потомки проверены раньше
+    for number, component in enumerate(components):
+        for node_id in component:
+            outgoing = graph.outgoing(graph.get_node(node_id))
+            if not outgoing or any(component_of[t.target.id] in live_components for t in outgoing):
+                live_components.add(number)
+                break
+    return {node_id for number in live_components for node_id in components[number]}
+
+
+class ModelAnalysis:
+    """
+    Итоги анализа модели перед генерацией:
+    unreachable - узлы, до которых нельзя дойти из начального (тестами не покрываются);
+    traps - достижимые узлы, из которых нельзя дойти ни до одного конечного состояния
+    (циклы без выхода). Если конечных состояний не достигает даже начальный узел
+    (замкнутая модель, все сценарии возвращаются по кругу), ловушек нет: closed=True
+    """
+    def __init__(self, start_id, reachable, unreachable, terminals, traps, cyclic_components, closed):
+        self.start_id = start_id
+        self.reachable = reachable
+        self.unreachable = unreachable
+        self.terminals = terminals
+        self.traps = traps
+        self.cyclic_components = cyclic_components
+        self.closed = closed
+
+    @property
+    def has_problems(self):
+        return bool(self.unreachable or self.traps)
+
+    def summary(self):
+        """Краткое описание проблем модели для пользователя"""
+        parts = []
+        if self.unreachable:
+            parts.append(f"недостижимых состояний: {len(self.unreachable)}")
+        if self.traps:
+            parts.append(f"состояний-ловушек (нет пути к конечному): {len(self.traps)}")
+        return "; ".join(parts)
+
+    def __repr__(self):
+        return (f"ModelAnalysis(reachable={len(self.reachable)}, unreachable={len(self.unreachable)}, "
+                f"traps={len(self.traps)}, closed={self.closed})")
+
+
+def analyze_model(graph, start_node):
+    """Достижимость, компоненты сильной связности и ловушки - за линейное время"""
+    components, component_of = condensation(graph)
+    reachable = reachable_nodes(graph, start_node) if start_node is not None else set()
+    nodes = graph.nodes
+    unreachable = {node.id for node in nodes if node.id not in reachable}
+    terminals = {node.id for node in nodes if not graph.outgoing(node)}
+
+    live = live_nodes(graph, components, component_of)
+    closed = start_node is None or start_node.id not in live
+    traps = set() if closed else reachable - live
+
+    cyclic_components = 0
+    for component in components:
+        if len(component) > 1 or graph.find_transition(graph.get_node(component[0]), graph.get_node(component[0])):
+            cyclic_components += 1
+
+    start_id = start_node.id if start_node is not None else None
+    return ModelAnalysis(start_id, reachable, unreachable, terminals, traps, cyclic_components, closed)
+
@@ -0,0 +1,142 @@
+from collections import deque
+
+# Служебное состояние-корень для графа пар переходов
+_ROOT = object()
+
+
+def cover_states(graph, start_node):
+    """
+    Подбирает пути, которые вместе посещают все достижимые состояния.
+    Возвращает (пути, процент покрытия состояний)
+    """
+    def successors(node_id):
+        node = graph.get_node(node_id)
+        return [(t.target.id, t.target.id, t) for t in graph.outgoing(node)]
+
+    targets = {n.id for n in graph.nodes}
+    # Начальное состояние покрывается любым тестом
+    return _greedy_cover(start_node.id, successors, targets, covered={start_node.id})
+
+
+def cover_transitions(graph, start_node):
+    """
+    Подбирает пути, которые вместе проходят каждый достижимый переход хотя бы раз.
+    Возвращает (пути, процент покрытия переходов)
+    """
+    def successors(node_id):
+        node = graph.get_node(node_id)
+        return [(t.id, t.target.id, t) for t in graph.outgoing(node)]
+
+    targets = {t.id for t in graph.transitions}
+    return _greedy_cover(start_node.id, successors, targets)
+
+
+def cover_transition_pairs(graph, start_node):
+    """
+    Подбирает пути, которые вместе проходят каждую пару смежных переходов (t1 -> t2).
+    Обход идет по графу переходов: состояние - последний пройденный переход.
+    Возвращает (пути, процент покрытия пар)
+    """
+    def successors(state):
+        if state is _ROOT:
+            return [(None, t.id, t) for t in graph.outgoing(start_node)]
+        last = graph.get_transition(state)
+        return [((last.id, t.id), t.id, t) for t in graph.outgoing(last.target)]
+
+    targets = {
+        (t1.id, t2.id)
+        for t1 in graph.transitions
+        for t2 in graph.outgoing(t1.target)
+    }
+    return _greedy_cover(_ROOT, successors, targets)
+
+
+def transition_coverage(graph, paths):
+    """Процент переходов модели, пройденных хотя бы одним путем (пути - номера переходов EdgeTable)"""
+    total = graph.transition_count
+    if not total:
+        return 100.0
+    covered = set()
+    for path in paths:
+        covered.update(path)
+    return 100.0 * len(covered) / total
+
+
+def _greedy_cover(root, successors, targets, covered=()):
+    """
+    Жадное покрытие ключей ребер путями от корня.
+    successors(state) возвращает ребра вида (ключ, следующее состояние, переход).
+    Каждый тест начинается с кратчайшего префикса до непокрытого ребра,
+    а затем продлевается к ближайшему непокрытому ребру, пока такие достижимы.
+    """
+    adjacency = {}
+
+    def edges_of(state):
+        if state not in adjacency:
+            adjacency[state] = successors(state)
+        return adjacency[state]
+
+    # Кратчайшие префиксы от корня (BFS) и порядок ребер по удаленности от корня
+    parents = {root: None}
+    ordered_edges = []
+    queue = deque([root])
+    while queue:
+        state = queue.popleft()
+        for edge in edges_of(state):
+            ordered_edges.append((state, edge))
+            if edge[1] not in parents:
+                parents[edge[1]] = (state, edge)
+                queue.append(edge[1])
+
+    uncovered = set(targets) - set(covered)
+    paths = []
+
+    for state, edge in ordered_edges:
+        if edge[0] not in uncovered:
+            continue
+
+        route = _prefix(parents, state) + [edge]
+        for step in route:
+            uncovered.discard(step[0])
+
+        # Продлеваем тест, пока рядом есть непокрытые ребра
+        current = edge[1]
+        while uncovered:
+            extension = _route_to_uncovered(current, edges_of, uncovered)
+            if not extension:
+                break
+            for step in extension:
+                uncovered.discard(step[0])
+            route.extend(extension)
+            current = extension[-1][1]
+
+        paths.append(tuple(step[2] for step in route))
+
+    if not targets:
+        return paths, 100.0
+    return paths, 100.0 * (len(targets) - len(uncovered)) / len(targets)
+
+
+def _prefix(parents, state):
+    """Восстанавливает кратчайший маршрут от корня до состояния"""
+    route = []
+    while parents[state] is not None:
+        state, edge = parents[state]
+        route.append(edge)
+    route.reverse()
+    return route
+
+
+def _route_to_uncovered(start, edges_of, uncovered):
+    """BFS от состояния до ближайшего непокрытого ребра. Возвращает маршрут или None"""
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        state = queue.popleft()
+        for edge in edges_of(state):
+            if edge[0] in uncovered:
+                return _prefix(parents, state) + [edge]
+            if edge[1] not in parents:
+                parents[edge[1]] = (state, edge)
+                queue.append(edge[1])
+    return None
@@ -0,0 +1,60 @@
+from array import array
+
+
+class EdgeTable:
+    """
+    Целочисленный снимок структуры графа для перебора путей.
+    Узлы и переходы нумеруются в порядке добавления (как graph.nodes и graph.transitions),
+    концы переходов лежат в массивах sources/targets, а исходящие переходы узла i -
+    out_edges[out_offsets[i]:out_offsets[i + 1]] (CSR, в порядке добавления).
+    Путь хранится как array('I') номеров переходов.
+    У узлов из sinks (ID) исходящих в таблице нет: путь, дошедший до такого узла,
+    на нем заканчивается (так перебор отсекает ловушки, см. analysis.analyze_model)
+    """
+    def __init__(self, graph, sinks=()):
+        self.nodes = graph.nodes
+        self.transitions = graph.transitions
+        self.node_index = {node.id: i for i, node in enumerate(self.nodes)}
+        self.index_of = {trans: i for i, trans in enumerate(self.transitions)}
+
+        node_index = self.node_index
+        self.sources = array("I", (node_index[t.source.id] for t in self.transitions))
+        self.targets = array("I", (node_index[t.target.id] for t in self.transitions))
+
+        # Подсчет исходящих, затем раскладка номеров переходов по узлам
+        sink_indices = {node_index[node_id] for node_id in sinks if node_id in node_index}
+        counts = [0] * (len(self.nodes) + 1)
+        for source in self.sources:
+            if source not in sink_indices:
+                counts[source + 1] += 1
+        for i in range(len(self.nodes)):
+            counts[i + 1] += counts[i]
+        self.out_offsets = array("I", counts)
+
+        out_edges = array("I", bytes(4 * counts[-1]))
+        fill = counts[:-1]
+        for edge, source in enumerate(self.sources):
+            if source not in sink_indices:
+                out_edges[fill[source]] = edge
+                fill[source] += 1
+        self.out_edges = out_edges
+
+    def __len__(self):
+        return len(self.transitions)
+
+    def outgoing(self, node_index):
+        """Номера исходящих переходов узла"""
+        return self.out_edges[self.out_offsets[node_index]:self.out_offsets[node_index + 1]]
+
+    def has_outgoing(self, node_index):
+        return self.out_offsets[node_index] != self.out_offsets[node_index + 1]
+
+    def to_path(self, transitions):
+        """Путь из последовательности объектов Transition"""
+        index_of = self.index_of
+        return array("I", (index_of[trans] for trans in transitions))
+
+    def path_transitions(self, path):
+        """Объекты Transition пути"""
+        transitions = self.transitions
+        return [transitions[index] for index in path]
@@ -0,0 +1,150 @@
+from .analysis import condensation, analyze_model
+from .test_generator import STRATEGY_ALL_PATHS, STRATEGY_ALL_STATES, STRATEGY_TRANSITION_PAIRS, STRATEGY_RANDOM_WALKS
+from .sampling import DEFAULT_WALKS, DEFAULT_WALK_LENGTH
+
+# Грубые коэффициенты для прогноза (генерация + форматирование одного шага)
+SECONDS_PER_STEP = 2e-6
+BYTES_PER_STEP = 250
+
+# Верхняя граница, выше которой число путей считается "практически бесконечным"
+MAX_EXACT_EXPONENT = 64
+
+
+class PathEstimate:
+    """
+    Прогноз объема генерации для одной стратегии.
+    exact=False означает, что в модели есть циклы и число путей - оценка.
+    """
+    def __init__(self, strategy, paths, steps, exact=True):
+        self.strategy = strategy
+        self.paths = paths
+        self.steps = steps
+        self.exact = exact
+
+    @property
+    def seconds(self):
+        """Ожидаемое время генерации, сек"""
+        return self.steps * SECONDS_PER_STEP
+
+    @property
+    def memory_bytes(self):
+        """Ожидаемый объем памяти под сформированные тест-кейсы, байт"""
+        return self.steps * BYTES_PER_STEP
+
+    def __repr__(self):
+        mark = "" if self.exact else "~"
+        return f"PathEstimate(strategy='{self.strategy}', paths={mark}{self.paths}, steps={mark}{self.steps})"
+
+
+def count_paths(graph, start_node):
+    """
+    Считает пути полного перебора (TestGenerator.iter_paths) динамикой по
+    конденсации графа: компоненты сильной связности сжимаются в вершины DAG.
+    Для ациклических моделей результат точный. Каждая циклическая компонента
+    умножает число путей на 2^(цикломатическое число) - по числу вариантов
+    обхода ее циклов - и добавляет пути, оборванные на замыкании цикла.
+    Ловушки перебор не обходит (см. TestGenerator.edges), для него это тупики.
+    Ограничения GenerationLimits (max_depth, loop_unroll, max_paths) не учитываются:
+    это оценка перебора без ограничений, при развертке циклов путей будет больше,
+    при ограничении длины - меньше.
+    Возвращает (число путей, суммарное число шагов, точность).
+    """
+    if not graph.outgoing(start_node):
+        # Из начального состояния некуда идти - перебор не дает ни одного пути
+        return 0, 0, True
+
+    components, component_of = condensation(graph)
+    traps = analyze_model(graph, start_node).traps
+
+    paths = {}  # номер компоненты -> число путей из нее
+    steps = {}  # номер компоненты -> суммарная длина этих путей
+    exact = {}
+
+    # Тарьян отдает компоненты в обратном топологическом порядке: потомки считаются раньше
+    for number, component in enumerate(components):
+        if component[0] in traps:
+            # Вся компонента - ловушка (ее потомки тоже): путь заканчивается на входе
+            paths[number], steps[number], exact[number] = 1, 0, True
+            continue
+
+        internal = 0
+        exits = []
+        for node_id in component:
+            for trans in graph.outgoing(graph.get_node(node_id)):
+                target = component_of[trans.target.id]
+                if target == number:
+                    internal += 1
+                else:
+                    exits.append(target)
+
+        cyclic = internal > 0
+        comp_paths = sum(paths[t] for t in exits)
+        comp_steps = sum(steps[t] + paths[t] for t in exits)
+        comp_exact = all(exact[t] for t in exits)
+
+        if not exits and not cyclic:
+            # Тупиковое состояние завершает ровно один путь
+            comp_paths = 1
+
+        if cyclic:
+            # Варианты прохода по циклам компоненты и пути, оборванные на цикле
+            cyclomatic = min(internal - len(component) + 1, MAX_EXACT_EXPONENT)
+            variants = 2 ** cyclomatic
+            comp_paths = variants * (comp_paths + 1)
+            comp_steps = variants * comp_steps + comp_paths * len(component)
+            comp_exact = False
+
+        paths[number] = comp_paths
+        steps[number] = comp_steps
+        exact[number] = comp_exact
+
+    start = component_of[start_node.id]
+    return paths[start], steps[start], exact[start]
+
+
+def estimate_generation(graph, start_node, strategy=STRATEGY_ALL_PATHS, limits=None):
+    """
+    Прогноз числа путей и шагов для выбранной стратегии (limits нужны только блужданиям,
+    для полного перебора ограничения не учитываются, см. count_paths)
+    """
+    if strategy == STRATEGY_ALL_PATHS:
+        paths, steps, exact = count_paths(graph, start_node)
+        return PathEstimate(strategy, paths, steps, exact)
+    if strategy == STRATEGY_RANDOM_WALKS:
+        # Число и длина блужданий заданы заранее; длина - верхняя граница
+        walks = limits.max_paths if limits is not None and limits.max_paths is not None else DEFAULT_WALKS
+        length = limits.max_depth if limits is not None and limits.max_depth is not None else DEFAULT_WALK_LENGTH
+        return PathEstimate(strategy, walks, walks * length, False)
+
+    reachable_nodes, reachable_transitions, pairs = _reachable_size(graph, start_node)
+    # Для стратегий покрытия число тестов не превышает числа покрываемых элементов,
+    # а каждый элемент в среднем добавляет не больше пары шагов
+    if strategy == STRATEGY_ALL_STATES:
+        return PathEstimate(strategy, reachable_nodes, 2 * reachable_transitions, False)
+    if strategy == STRATEGY_TRANSITION_PAIRS:
+        return PathEstimate(strategy, pairs, 2 * pairs, False)
+    return PathEstimate(strategy, reachable_transitions, 2 * reachable_transitions, False)
+
+
+def estimate_all(graph, start_node, strategies):
+    """Прогнозы для всех перечисленных стратегий: ключ стратегии -> PathEstimate"""
+    return {strategy: estimate_generation(graph, start_node, strategy) for strategy in strategies}
+
+
+def _reachable_size(graph, start_node):
+    """Число достижимых узлов, переходов и пар смежных переходов"""
+    seen = {start_node.id}
+    stack = [start_node]
+    transitions = 0
+    pairs = 0
+    while stack:
+        node = stack.pop()
+        incoming = len(graph.incoming(node))
+        outgoing = graph.outgoing(node)
+        transitions += len(outgoing)
+        pairs += incoming * len(outgoing)
+        for trans in outgoing:
+            if trans.target.id not in seen:
+                seen.add(trans.target.id)
+                stack.append(trans.target)
+    return len(seen), transitions, pairs
@@ -0,0 +1,259 @@
+import contextlib
+import csv
+import importlib.util
+import json
+import os
+
+from ..utils.profiling import profiler
+
+EXPORT_COLUMNS = [
+    "Test ID", "Step #", "From State", "To State", "Action", "Input Data", "Expected Result"
+]
+
+# Ключи записей шага для построчных форматов (как в TestGenerator.format_test_cases)
+RECORD_FIELDS = ["test_id", "step", "from_node", "to_node", "action", "input", "expected"]
+
+# Ограничение Excel на число строк листа (включая строку заголовка)
+EXCEL_MAX_ROWS = 1048576
+# Как часто (в строках) сообщать о прогрессе и проверять отмену
+PROGRESS_EVERY = 5000
+
+
+class ExportCancelled(Exception):
+    """Экспорт прерван пользователем"""
+
+
+class Exporter:
+    """
+    Описание формата экспорта.
+    func(test_cases, file_path, progress=None, cancel_event=None) -> число строк.
+    requires - модуль, без которого формат недоступен (None - только стандартная библиотека)
+    """
+    def __init__(self, key, title, extension, func, requires=None):
+        self.key = key
+        self.title = title
+        self.extension = extension
+        self.func = func
+        self.requires = requires
+
+    @property
+    def available(self):
+        return self.requires is None or importlib.util.find_spec(self.requires) is not None
+
+    @property
+    def file_filter(self):
+        """Фильтр для QFileDialog"""
+        return f"{self.title} (*{self.extension})"
+
+    def __repr__(self):
+        return f"Exporter(key='{self.key}', extension='{self.extension}')"
+
+
+# Реестр форматов: ключ -> Exporter (в порядке регистрации)
+EXPORTERS = {}
+
+
+def register_exporter(key, title, extension, func, requires=None):
+    """Регистрирует формат экспорта (можно вызывать из внешних модулей)"""
+    EXPORTERS[key] = Exporter(key, title, extension, func, requires)
+    return EXPORTERS[key]
+
+
+def available_exporters():
+    """Форматы, зависимости которых установлены"""
+    return [exporter for exporter in EXPORTERS.values() if exporter.available]
+
+
+def get_exporter(key):
+    """Возвращает формат по ключу или по расширению файла (".csv", "csv")"""
+    if key in EXPORTERS:
+        return EXPORTERS[key]
+    extension = "." + key.lstrip(".").lower()
+    for exporter in EXPORTERS.values():
+        if exporter.extension == extension:
+            return exporter
+    raise ValueError(f"Неизвестный формат экспорта: {key}")
+
+
+def export_test_cases(export_func, test_cases, file_path, progress=None, cancel_event=None):
+    """Вызывает экспортер (при включенном профилировании - с замером строк и байт в секунду)"""
+    with profiler.span("export", path=file_path) as span:
+        rows = export_func(test_cases, file_path, progress, cancel_event)
+        if profiler.enabled:
+            span.info.update(rows=rows, bytes=os.path.getsize(file_path))
+    return rows
+
+
+def iter_step_rows(test_cases):
+    """Разворачивает поток тест-кейсов в плоские строки (в порядке EXPORT_COLUMNS)"""
+    for test in test_cases:
+        test_label = f"Test #{test['id']}"
+        for i, step in enumerate(test["steps"]):
+            yield (
+                test_label,
+                i + 1,
+                step["from_node"],
+                step["to_node"],
+                step["action"],
+                step["input"],
+                step["expected"]
+            )
+
+
+def iter_step_records(test_cases):
+    """Поток записей шагов (словари с ключами RECORD_FIELDS)"""
+    for test in test_cases:
+        for i, step in enumerate(test["steps"]):
+            yield {
+                "test_id": test["id"],
+                "step": i + 1,
+                "from_node": step["from_node"],
+                "to_node": step["to_node"],
+                "action": step["action"],
+                "input": step["input"],
+                "expected": step["expected"]
+            }
+
+
+def _report(written, progress, cancel_event):
+    """Периодическая проверка отмены и отчет о прогрессе"""
+    if written % PROGRESS_EVERY == 0:
+        if cancel_event is not None and cancel_event.is_set():
+            raise ExportCancelled()
+        if progress is not None:
+            progress(written)
+
+
+@contextlib.contextmanager
+def _atomic_output(file_path):
+    """
+    Временный файл рядом с file_path, который заменяет его только после успешной записи:
+    отмененный или упавший экспорт не оставляет обрезанный файл
+    """
+    temp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        yield temp_path
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def export_excel(test_cases, file_path, progress=None, cancel_event=None):
+    """
+    Потоковая запись в .xlsx через write-only книгу openpyxl: строки уходят
+    в файл сразу, без промежуточных списков и DataFrame.
+    При достижении лимита строк Excel начинается новый лист.
+    progress(rows) вызывается каждые PROGRESS_EVERY строк.
+    Возвращает число записанных строк шагов.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    rows_per_sheet = EXCEL_MAX_ROWS - 1 # Одна строка уходит под заголовок
+    sheet = None
+    sheet_rows = 0
+    written = 0
+
+    for row in iter_step_rows(test_cases):
+        if sheet is None or sheet_rows >= rows_per_sheet:
+            sheet = workbook.create_sheet(f"Tests {len(workbook.worksheets) + 1}")
+            sheet.append(EXPORT_COLUMNS)
+            sheet_rows = 0
+
+        sheet.append(row)
+        sheet_rows += 1
+        written += 1
+
+        _report(written, progress, cancel_event)
+
+    if sheet is None:
+        # Пустой экспорт - все равно создаем лист с заголовком
+        workbook.create_sheet("Tests 1").append(EXPORT_COLUMNS)
+
+    workbook.save(file_path)
+    if progress is not None:
+        progress(written)
+    return written
+
+
+def export_csv(test_cases, file_path, progress=None, cancel_event=None):
+    """Потоковая запись в CSV (UTF-8 с BOM, чтобы Excel корректно открыл кириллицу)"""
+    written = 0
+    with _atomic_output(file_path) as temp_path, open(temp_path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for row in iter_step_rows(test_cases):
+            writer.writerow(row)
+            written += 1
+            _report(written, progress, cancel_event)
+
+    if progress is not None:
+        progress(written)
+    return written
+
+
+def export_jsonl(test_cases, file_path, progress=None, cancel_event=None):
+    """Потоковая запись в JSON Lines: одна запись шага на строку"""
+    written = 0
+    with _atomic_output(file_path) as temp_path, open(temp_path, "w", encoding="utf-8") as f:
+        for record in iter_step_records(test_cases):
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write("\n")
+            written += 1
+            _report(written, progress, cancel_event)
+
+    if progress is not None:
+        progress(written)
+    return written
+
+
+# Размер пачки строк для колоночной записи Parquet
+PARQUET_BATCH_ROWS = 65536
+
+
+def export_parquet(test_cases, file_path, progress=None, cancel_event=None):
+    """Колоночная запись в Parquet через pyarrow пачками по PARQUET_BATCH_ROWS строк"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("test_id", pa.uint32()),
+        ("step", pa.uint32()),
+        ("from_node", pa.string()),
+        ("to_node", pa.string()),
+        ("action", pa.string()),
+        ("input", pa.string()),
+        ("expected", pa.string()),
+    ])
+    columns = {name: [] for name in RECORD_FIELDS}
+    written = 0
+
+    def flush(writer):
+        writer.write_batch(pa.record_batch([columns[name] for name in RECORD_FIELDS], schema=schema))
+        for values in columns.values():
+            values.clear()
+
+    with _atomic_output(file_path) as temp_path, pq.ParquetWriter(temp_path, schema) as writer:
+        for record in iter_step_records(test_cases):
+            for name in RECORD_FIELDS:
+                columns[name].append(record[name])
+            written += 1
+            if written % PARQUET_BATCH_ROWS == 0:
+                flush(writer)
+            _report(written, progress, cancel_event)
+        if columns["step"] or not written:
+            flush(writer)
+
+    if progress is not None:
+        progress(written)
+    return written
+
+
+register_exporter("xlsx", "Excel Files", ".xlsx", export_excel, requires="openpyxl")
+register_exporter("csv", "CSV Files", ".csv", export_csv)
+register_exporter("jsonl", "JSON Lines Files", ".jsonl", export_jsonl)
+register_exporter("parquet", "Parquet Files", ".parquet", export_parquet, requires="pyarrow")
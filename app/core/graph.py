@@ -1,75 +1,204 @@
+import sys
 import uuid
 
+
+def intern_keys(properties):
+    """
+    Словарь свойств с интернированными ключами: одинаковые ключи
+    ("expected_result", "input_data", ...) всех элементов - один объект строки
+    """
+    return {sys.intern(key) if type(key) is str else key: value for key, value in properties.items()}
+
+
 class Node:
     """
     Класс, описывающий Узел (Состояние/Экран).
     """
-    def __init__(self, name ="New State"):
-        self.id = str(uuid.uuid4())
+    __slots__ = ("id", "name", "_properties")
+
+    def __init__(self, name ="New State", node_id=None):
+        self.id = node_id or str(uuid.uuid4())
         self.name = name
 
-        self.properties = {}
+        self._properties = {}
+
+    @property
+    def properties(self):
+        return self._properties
+
+    @properties.setter
+    def properties(self, value):
+        self._properties = intern_keys(value)
 
     def __repr__(self):
         return f"Node(name='{self.name}', id={self.id[:4]}...)"
-    
+
 class Transition:
     """
     Класс, описавающий переход (Стрелку)
     Связывает два узла: откуда -> куда
     """
-    def __init__(self, source_node: Node, target_node: Node, action_name="Action"):
-        self.id = str(uuid.uuid4())
+    __slots__ = ("id", "source", "target", "action", "_properties")
+
+    def __init__(self, source_node: Node, target_node: Node, action_name="Action", trans_id=None):
+        self.id = trans_id or str(uuid.uuid4())
         self.source = source_node
         self.target = target_node
         self.action = action_name
 
-        self.properties = {}
+        self._properties = {}
+
+    @property
+    def properties(self):
+        return self._properties
+
+    @properties.setter
+    def properties(self, value):
+        self._properties = intern_keys(value)
 
     def __repr__(self):
         return f"Transition({self.source.name} -> {self.target.name}, action='{self.action}')"
-    
+
+class ChangeSet:
+    """
+    Изменения модели с момента последней генерации.
+    structure_nodes - узлы, у которых изменился набор исходящих переходов
+    (пути через них нужно перебрать заново), text_changed - правились только
+    тексты (имена, действия, входные данные, ожидаемый результат),
+    full - изменение, после которого переиспользовать нечего (например, сменился начальный узел)
+    """
+    def __init__(self):
+        self.structure_nodes = set()
+        self.text_changed = False
+        self.full = False
+
+    @property
+    def structural(self):
+        return self.full or bool(self.structure_nodes)
+
+    def __bool__(self):
+        return self.structural or self.text_changed
+
+    def __repr__(self):
+        return f"ChangeSet(structure_nodes={len(self.structure_nodes)}, text_changed={self.text_changed}, full={self.full})"
+
+
 class Graph:
     """
-    Главный класс, который хранит всю модель целиком
+    Главный класс, который хранит всю модель целиком.
+    Узлы и переходы индексируются по ID, а для каждого узла
+    поддерживаются словари исходящих и входящих переходов.
+    Изменения структуры копятся в changes (см. ChangeSet)
     """
     def __init__(self):
-        self.nodes = [] # Список всех узлов
-        self.transitions = [] # Список всех переходов
+        self._nodes = {} # ID -> Node
+        self._transitions = {} # ID -> Transition
+        self._outgoing = {} # ID узла -> {ID перехода: Transition}
+        self._incoming = {} # ID узла -> {ID перехода: Transition}
+        self.changes = ChangeSet()
+
+    @property
+    def nodes(self):
+        """
+        Все узлы в порядке добавления. Кортеж только для чтения (снимок): узлы
+        добавляются через add_node. Для числа узлов - node_count, без копирования
+        """
+        return tuple(self._nodes.values())
 
-    def add_node(self, name="New State") -> Node:
+    @property
+    def transitions(self):
+        """Все переходы в порядке добавления (кортеж-снимок, добавление - через add_transition)"""
+        return tuple(self._transitions.values())
+
+    @property
+    def node_count(self):
+        return len(self._nodes)
+
+    @property
+    def transition_count(self):
+        return len(self._transitions)
+
+    def add_node(self, name="New State", node_id=None) -> Node:
         """Создает новый узел и добавляет его в граф"""
-        new_node = Node(name)
-        self.nodes.append(new_node)
+        new_node = Node(name, node_id)
+        self._nodes[new_node.id] = new_node
+        self._outgoing[new_node.id] = {}
+        self._incoming[new_node.id] = {}
         return new_node
-    
-    def add_transition(self, source: Node, target: Node, action="Action") -> Transition:
+
+    def add_transition(self, source: Node, target: Node, action="Action", trans_id=None) -> Transition:
         """Создаёт переход между двумя узлами"""
-        new_transition = Transition(source, target, action)
-        self.transitions.append(new_transition)
+        new_transition = Transition(source, target, action, trans_id)
+        self._transitions[new_transition.id] = new_transition
+        self._outgoing.setdefault(source.id, {})[new_transition.id] = new_transition
+        self._incoming.setdefault(target.id, {})[new_transition.id] = new_transition
+        self.changes.structure_nodes.add(source.id)
         return new_transition
-    
+
+    def get_node(self, node_id: str) -> Node:
+        """Возвращает узел по ID (или None)"""
+        return self._nodes.get(node_id)
+
+    def get_transition(self, trans_id: str) -> Transition:
+        """Возвращает переход по ID (или None)"""
+        return self._transitions.get(trans_id)
+
+    def outgoing(self, node: Node):
+        """Исходящие переходы узла (в порядке добавления)"""
+        return list(self._outgoing.get(node.id, {}).values())
+
+    def incoming(self, node: Node):
+        """Входящие переходы узла (в порядке добавления)"""
+        return list(self._incoming.get(node.id, {}).values())
+
     def delete_node(self, node_id: str):
         """Удаляет узел и все связанные с ним переходы"""
-        self.nodes = [n for n in self.nodes if n.id != node_id]
+        if node_id not in self._nodes:
+            return
 
-        self.transitions = [
-            t for t in self.transitions
-            if t.source.id != node_id and t.target.id != node_id
-        ]
+        linked = list(self._outgoing.get(node_id, {})) + list(self._incoming.get(node_id, {}))
+        for trans_id in linked:
+            self.delete_transition(trans_id)
+
+        del self._nodes[node_id]
+        self._outgoing.pop(node_id, None)
+        self._incoming.pop(node_id, None)
+        self.changes.structure_nodes.add(node_id)
 
     def find_transition(self, source: Node, target: Node) -> Transition:
         """Ищет существующий переход между двумя узлами"""
-        for t in self.transitions:
-            if t.source.id == source.id and t.target.id == target.id:
+        for t in self._outgoing.get(source.id, {}).values():
+            if t.target.id == target.id:
                 return t
         return None
 
     def delete_transition(self, trans_id: str):
         """Удаляет конкретный переход по ID"""
-        self.transitions = [t for t in self.transitions if t.id != trans_id]
+        trans = self._transitions.pop(trans_id, None)
+        if trans is None:
+            return
+        self._outgoing.get(trans.source.id, {}).pop(trans_id, None)
+        self._incoming.get(trans.target.id, {}).pop(trans_id, None)
+        self.changes.structure_nodes.add(trans.source.id)
 
     def clear(self):
         """Очищает весь граф"""
-        self.nodes = []
-        self.transitions = []
\ No newline at end of file
+        self._nodes = {}
+        self._transitions = {}
+        self._outgoing = {}
+        self._incoming = {}
+        self.changes.full = True
+
+    def mark_text_changed(self):
+        """Отмечает правку текстов (имя, действие, входные данные, ожидаемый результат)"""
+        self.changes.text_changed = True
+
+    def mark_structure_changed(self):
+        """Отмечает изменение, после которого пути нужно перебрать заново целиком"""
+        self.changes.full = True
+
+    def take_changes(self):
+        """Возвращает накопленные изменения и начинает отсчет заново"""
+        changes = self.changes
+        self.changes = ChangeSet()
+        return changes
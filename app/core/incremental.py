@@ -0,0 +1,103 @@
+from array import array
+
+from .analysis import reaching_nodes
+
+# Номер для переходов, удаленных из модели после прошлой генерации
+_MISSING = 0xFFFFFFFF
+
+
+class PathReuse:
+    """
+    Переиспользование путей предыдущей генерации при повторном полном переборе.
+
+    Путь затронут изменениями, если проходит через узел, у которого изменился
+    набор исходящих переходов (changes.structure_nodes). Остальные пути перебор
+    выдал бы точно такими же и в том же относительном порядке, поэтому поддерево,
+    из которого измененные узлы недостижимы, не обходится заново: его пути
+    берутся из старого списка одним непрерывным блоком.
+
+    Старые пути записаны номерами переходов прошлой EdgeTable (previous.transitions);
+    при выдаче они переводятся в номера текущей таблицы table.
+    """
+    def __init__(self, graph, table, previous, dirty_ids):
+        self.table = table
+        self.old_paths = previous.paths
+        dirty_ids = {node_id for node_id in dirty_ids if node_id in table.node_index}
+
+        # Узлы, из которых можно дойти до измененных: их поддеревья перебираются
+        self.reaches_dirty = {table.node_index[node_id] for node_id in reaching_nodes(graph, dirty_ids)}
+        # Переходы в измененные узлы: путь затронут, если содержит хотя бы один из них
+        # (удаленные переходы отдельно не нужны: их источник уже среди измененных,
+        # и путь попадает в него по неудаленному переходу)
+        dirty_nodes = {table.node_index[node_id] for node_id in dirty_ids}
+        self.dirty_edges = {edge for edge, target in enumerate(table.targets) if target in dirty_nodes}
+
+        # Соответствие номеров переходов старой и новой таблиц
+        old_transitions = previous.transitions
+        self._same_numbering = table.transitions[:len(old_transitions)] == old_transitions
+        if self._same_numbering:
+            self._old_dirty = self.dirty_edges
+            self._old_to_new = None
+            self._new_to_old = None
+        else:
+            index_of = table.index_of
+            self._old_to_new = array("I", (index_of.get(trans, _MISSING) for trans in old_transitions))
+            self._new_to_old = {new: old for old, new in enumerate(self._old_to_new) if new != _MISSING}
+            self._old_dirty = {self._new_to_old[edge] for edge in self.dirty_edges if edge in self._new_to_old}
+        self._cursor = 0
+
+    def is_affected(self, old_path):
+        return not self._old_dirty.isdisjoint(old_path)
+
+    def can_skip(self, target):
+        """Поддерево узла target (при незатронутом префиксе) можно взять из старых путей"""
+        return target not in self.reaches_dirty
+
+    def _skip_affected(self):
+        old_paths = self.old_paths
+        while self._cursor < len(old_paths) and self.is_affected(old_paths[self._cursor]):
+            self._cursor += 1
+
+    def _to_new(self, old_path):
+        if self._same_numbering:
+            return old_path
+        return array("I", map(self._old_to_new.__getitem__, old_path))
+
+    def advance(self):
+        """Перебор сам выдал незатронутый путь - в старом списке он следующий"""
+        self._skip_affected()
+        self._cursor += 1
+
+    def iter_block(self, prefix, limits, report):
+        """Старые пути с началом prefix (поддерево, которое не нужно обходить)"""
+        self._skip_affected()
+        if self._same_numbering:
+            old_prefix = prefix[:]
+        else:
+            old_prefix = array("I", map(self._new_to_old.__getitem__, prefix))
+        size = len(old_prefix)
+        old_paths = self.old_paths
+        while self._cursor < len(old_paths) and old_paths[self._cursor][:size] == old_prefix:
+            path = self._to_new(old_paths[self._cursor])
+            self._cursor += 1
+            if not self._accept(path, limits, report):
+                return
+            yield path
+
+    def iter_all(self, limits, report):
+        """Все старые пути как есть (структура модели не менялась)"""
+        for old_path in self.old_paths:
+            path = self._to_new(old_path)
+            if not self._accept(path, limits, report):
+                return
+            yield path
+
+    def _accept(self, path, limits, report):
+        if not report.accept_path(limits):
+            return False
+        report.reused_paths += 1
+        # Обрезку по глубине восстанавливаем без обхода: последний узел пути не менялся
+        if limits.max_depth is not None and len(path) >= limits.max_depth:
+            if self.table.has_outgoing(self.table.targets[path[-1]]):
+                report.depth_cuts += 1
+        return True
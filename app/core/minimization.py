@@ -0,0 +1,172 @@
+import heapq
+from array import array
+
+from .test_generator import STRATEGY_ALL_STATES, STRATEGY_TRANSITION_PAIRS
+
+# Режимы сокращения набора тестов
+MINIMIZE_NONE = "none"
+MINIMIZE_REDUNDANT = "redundant" # Убрать повторы и пути-префиксы других путей
+MINIMIZE_COVERAGE = "coverage" # Плюс оставить минимум путей с тем же покрытием
+
+MINIMIZE_MODES = {
+    MINIMIZE_NONE: "Без сокращения",
+    MINIMIZE_REDUNDANT: "Убрать повторы и префиксы",
+    MINIMIZE_COVERAGE: "Минимальный набор с тем же покрытием",
+}
+
+# Что должен сохранить минимальный набор
+CRITERION_STATES = "states"
+CRITERION_TRANSITIONS = "transitions"
+CRITERION_PAIRS = "pairs"
+
+
+class MinimizationReport:
+    """Сколько путей убрано и почему"""
+    def __init__(self, before=0):
+        self.before = before
+        self.duplicates = 0
+        self.prefixes = 0
+        self.not_needed = 0 # Пути, без которых покрытие не меняется
+
+    @property
+    def after(self):
+        return self.before - self.duplicates - self.prefixes - self.not_needed
+
+    @property
+    def removed(self):
+        return self.before - self.after
+
+    def summary(self):
+        parts = []
+        if self.duplicates:
+            parts.append(f"повторов: {self.duplicates}")
+        if self.prefixes:
+            parts.append(f"префиксов других путей: {self.prefixes}")
+        if self.not_needed:
+            parts.append(f"не влияющих на покрытие: {self.not_needed}")
+        return "; ".join(parts)
+
+    def __repr__(self):
+        return f"MinimizationReport(before={self.before}, after={self.after})"
+
+
+def remove_redundant(paths, report=None):
+    """
+    Убирает повторяющиеся пути и пути, которые являются началом другого пути:
+    все их шаги и так выполняет более длинный тест.
+    Пути складываются в префиксное дерево (trie) по номерам переходов; остается путь,
+    который заканчивается в листе дерева, причем первое его вхождение.
+    Порядок оставшихся путей не меняется.
+    """
+    if report is None:
+        report = MinimizationReport(len(paths))
+
+    # Дерево хранится плоско: (номер вершины, переход) -> номер дочерней вершины
+    stride = max((max(path) for path in paths if path), default=0) + 1
+    children = {}
+    has_children = array("B", [0])
+    ends = [] # Вершина, в которой заканчивается каждый путь
+    first_path = {} # Вершина -> первый путь, который в ней заканчивается
+
+    for number, path in enumerate(paths):
+        vertex = 0
+        for edge in path:
+            key = vertex * stride + edge
+            child = children.get(key)
+            if child is None:
+                child = len(has_children)
+                children[key] = child
+                has_children.append(0)
+                has_children[vertex] = 1
+            vertex = child
+        ends.append(vertex)
+        first_path.setdefault(vertex, number)
+
+    kept = []
+    for number, vertex in enumerate(ends):
+        if has_children[vertex]:
+            report.prefixes += 1
+        elif first_path[vertex] != number:
+            report.duplicates += 1
+        else:
+            kept.append(paths[number])
+    return kept
+
+
+def _items(path, criterion, targets, start):
+    """Элементы покрытия, которые дает путь (номера переходов, узлов или пары переходов)"""
+    if criterion == CRITERION_TRANSITIONS:
+        return set(path)
+    if criterion == CRITERION_STATES:
+        items = {targets[edge] for edge in path}
+        items.add(start)
+        return items
+    # Пары вместе с самими переходами: иначе пропал бы путь из одного шага
+    items = set(zip(path, path[1:]))
+    items.update(path)
+    return items
+
+
+def cover_paths(paths, table, criterion=CRITERION_TRANSITIONS, report=None):
+    """
+    Жадно выбирает подмножество путей с тем же покрытием по criterion, что у всех
+    paths: каждый раз берется путь, добавляющий больше всего непокрытых элементов
+    (при равенстве - более ранний). Очередь с ленивым пересчетом выгоды: выгода пути
+    только убывает, поэтому пересчитывается лишь путь на вершине кучи.
+    Порядок оставшихся путей не меняется.
+    """
+    if report is None:
+        report = MinimizationReport(len(paths))
+    if not paths:
+        return []
+
+    targets = table.targets
+    start = table.sources[paths[0][0]] if paths[0] else None
+    path_items = [_items(path, criterion, targets, start) for path in paths]
+
+    heap = [(-len(items), number) for number, items in enumerate(path_items) if items]
+    heapq.heapify(heap)
+    covered = set()
+    chosen = []
+    while heap:
+        gain, number = heapq.heappop(heap)
+        fresh = len(path_items[number] - covered)
+        if fresh == 0:
+            continue
+        if fresh != -gain:
+            # Выгода устарела - возвращаем путь в очередь с актуальной
+            heapq.heappush(heap, (-fresh, number))
+            continue
+        chosen.append(number)
+        covered |= path_items[number]
+
+    chosen.sort()
+    report.not_needed += len(paths) - len(chosen)
+    return [paths[number] for number in chosen]
+
+
+def criterion_for(strategy):
+    """Критерий покрытия, который сохраняет минимизация для стратегии"""
+    if strategy == STRATEGY_ALL_STATES:
+        return CRITERION_STATES
+    if strategy == STRATEGY_TRANSITION_PAIRS:
+        return CRITERION_PAIRS
+    return CRITERION_TRANSITIONS
+
+
+def minimize_paths(paths, table, mode=MINIMIZE_REDUNDANT, strategy=None):
+    """
+    Сокращает набор путей (array номеров переходов table). Возвращает (пути, MinimizationReport).
+    Покрытие по критерию стратегии (для полного перебора - переходов) не уменьшается
+    """
+    if mode not in MINIMIZE_MODES:
+        raise ValueError(f"Неизвестный режим сокращения: {mode}")
+
+    report = MinimizationReport(len(paths))
+    if mode == MINIMIZE_NONE:
+        return list(paths), report
+
+    paths = remove_redundant(paths, report)
+    if mode == MINIMIZE_COVERAGE:
+        paths = cover_paths(paths, table, criterion_for(strategy), report)
+    return paths, report
@@ -0,0 +1,247 @@
+import multiprocessing
+import os
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+from .graph import Graph
+from .test_generator import TestGenerator, GenerationLimits, TruncationReport, Frontier
+
+# Сколько поддеревьев в среднем приходится на один процесс (для балансировки нагрузки)
+TASKS_PER_WORKER = 4
+# Глубже этого фронт не дробится: префиксы становятся длиннее, а выигрыша нет
+MAX_SPLIT_DEPTH = 8
+# Как часто при ожидании поддерева проверяются отмена и бюджет времени, сек
+POLL_INTERVAL = 0.1
+
+# Граф, восстановленный в процессе-исполнителе (один раз на процесс)
+_worker_generator = None
+
+
+def serialize_graph(graph):
+    """
+    Компактное представление структуры графа для передачи в процессы:
+    (число узлов, индекс начального узла, массив источников, массив целей).
+    Переходы идут в порядке добавления, поэтому порядок обхода сохраняется.
+    """
+    nodes = graph.nodes
+    transitions = graph.transitions
+    node_index = {node.id: i for i, node in enumerate(nodes)}
+    start = next(
+        (i for i, node in enumerate(nodes) if node.properties.get("is_initial", False)),
+        -1
+    )
+    sources = array("I", (node_index[t.source.id] for t in transitions))
+    targets = array("I", (node_index[t.target.id] for t in transitions))
+    return len(node_index), start, sources, targets
+
+
+def deserialize_graph(compact):
+    """Восстанавливает граф из компактного представления (ID - строковые индексы)"""
+    node_count, start, sources, targets = compact
+    graph = Graph()
+    nodes = [graph.add_node(str(i), str(i)) for i in range(node_count)]
+    if start >= 0:
+        nodes[start].properties["is_initial"] = True
+    for i, (source, target) in enumerate(zip(sources, targets)):
+        graph.add_transition(nodes[source], nodes[target], trans_id=str(i))
+    return graph
+
+
+def iter_paths_parallel(graph, limits=None, report=None, workers=None, split_depth=None, cancel_event=None):
+    """
+    Параллельный полный перебор в ProcessPoolExecutor.
+    Фронт поиска делится по первым split_depth переходам от начального узла,
+    поддеревья перебираются в отдельных процессах, а результаты склеиваются
+    в том же порядке, что и у последовательного TestGenerator.iter_paths.
+    limits.time_budget - бюджет на весь перебор: каждое поддерево получает только остаток,
+    после срока новые поддеревья не отправляются и не склеиваются.
+    cancel_event (threading.Event) останавливает склейку, снимает невыполненные задачи
+    и через общий флаг прерывает поддеревья, которые уже перебираются в процессах.
+    """
+    limits = limits or GenerationLimits()
+    if report is None:
+        report = TruncationReport()
+    workers = workers or os.cpu_count() or 1
+
+    generator = TestGenerator(graph)
+    if not generator.find_start_node():
+        return
+    if cancel_event is not None:
+        generator.cancel_event = cancel_event
+
+    # Один общий срок на дробление фронта, поддеревья и склейку
+    deadline = time.monotonic() + limits.time_budget if limits.time_budget else None
+
+    items = _split_frontier(generator, limits, report, workers, split_depth, deadline)
+    frontiers = [item.prefix for item in items if isinstance(item, Frontier)]
+
+    if not frontiers:
+        for path in items:
+            if not report.accept_path(limits):
+                return
+            yield path
+        return
+
+    # Префиксы уже записаны номерами переходов (порядок graph.transitions - как у serialize_graph)
+    tasks = iter(frontiers)
+    workers = min(workers, len(frontiers))
+    # Флаг остановки, который видят процессы-исполнители (проверяется в iter_paths)
+    stop_event = multiprocessing.Event()
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(serialize_graph(graph), stop_event)
+    )
+    pending = deque()
+
+    def submit_next():
+        if _expired(deadline):
+            return
+        prefix = next(tasks, None)
+        if prefix is None:
+            return
+        # Поддереву нужно не больше путей, чем осталось до лимита на момент отправки
+        remaining = None
+        if limits.max_paths is not None:
+            remaining = max(limits.max_paths - report.paths_emitted, 1)
+        subtree_limits = GenerationLimits(limits.max_depth, remaining, limits.loop_unroll, _time_left(deadline))
+        pending.append(executor.submit(_enumerate_subtree, prefix, subtree_limits))
+
+    def stopped():
+        if cancel_event is not None and cancel_event.is_set():
+            report.cancelled = True
+            return True
+        if _expired(deadline):
+            report.timed_out = True
+            return True
+        return False
+
+    finished = False
+    try:
+        # Держим в работе ограниченное окно задач, чтобы не копить результаты впрок
+        for _ in range(workers * 2):
+            submit_next()
+
+        for item in items:
+            if stopped():
+                return
+
+            if isinstance(item, Frontier):
+                if not pending:
+                    # Срок истек до отправки этого поддерева
+                    report.timed_out = True
+                    return
+                future = pending.popleft()
+                submit_next()
+                # Ждем с таймаутом, чтобы отмена и срок проверялись и во время ожидания
+                while True:
+                    try:
+                        flat, offsets, counters = future.result(timeout=POLL_INTERVAL)
+                        break
+                    except FutureTimeoutError:
+                        # Недоперебранное поддерево не ждем: передача его путей между
+                        # процессами сама по себе заняла бы заметное время сверх срока
+                        if stopped():
+                            return
+                _merge_report(report, counters)
+                subtree = _unpack_paths(flat, offsets)
+            else:
+                subtree = (item,)
+
+            for path in subtree:
+                if not report.accept_path(limits):
+                    return
+                yield path
+        finished = True
+    finally:
+        if not finished:
+            # Прерываем поддеревья, которые уже перебираются, и не ждем их
+            stop_event.set()
+        executor.shutdown(wait=finished, cancel_futures=True)
+
+
+def _time_left(deadline):
+    """Остаток бюджета времени в секундах (None - без ограничения)"""
+    if deadline is None:
+        return None
+    # Нулевой бюджет означал бы отсутствие ограничения
+    return max(deadline - time.monotonic(), 1e-3)
+
+
+def _expired(deadline):
+    return deadline is not None and time.monotonic() > deadline
+
+
+def _split_frontier(generator, limits, report, workers, split_depth, deadline=None):
+    """
+    Перебирает начало дерева поиска до глубины split_depth.
+    Если глубина не задана, она растет, пока поддеревьев не хватит на все процессы.
+    Возвращает список готовых путей и Frontier в порядке последовательного обхода.
+    """
+    depths = [split_depth] if split_depth else range(1, MAX_SPLIT_DEPTH + 1)
+    for depth in depths:
+        # Лимит числа путей применяется при склейке, а поддеревья считают его сами
+        depth_limits = GenerationLimits(limits.max_depth, None, limits.loop_unroll, _time_left(deadline))
+        depth_report = TruncationReport()
+        items = list(generator.iter_paths(depth_limits, depth_report, split_depth=depth))
+        if depth_report.timed_out or depth_report.cancelled:
+            break
+        frontier_count = sum(1 for item in items if isinstance(item, Frontier))
+        if frontier_count >= workers * TASKS_PER_WORKER or frontier_count == 0:
+            break
+
+    report.depth_cuts += depth_report.depth_cuts
+    report.loop_cuts += depth_report.loop_cuts
+    report.nodes_expanded += depth_report.nodes_expanded
+    report.max_stack_depth = max(report.max_stack_depth, depth_report.max_stack_depth)
+    report.timed_out = report.timed_out or depth_report.timed_out
+    report.cancelled = report.cancelled or depth_report.cancelled
+    return items
+
+
+def _init_worker(compact, stop_event):
+    """
+    Инициализация процесса: граф восстанавливается один раз.
+    stop_event (multiprocessing.Event) заменяет флаг отмены генератора, поэтому
+    перебор поддерева останавливается при отмене или истечении срока в главном процессе
+    """
+    global _worker_generator
+    _worker_generator = TestGenerator(deserialize_graph(compact))
+    _worker_generator.cancel_event = stop_event
+
+
+def _enumerate_subtree(prefix_indices, limits):
+    """
+    Перебирает поддерево префикса. Пути возвращаются одним плоским массивом
+    индексов переходов и массивом границ путей - так их дешево передать между процессами
+    """
+    report = TruncationReport()
+    flat = array("I")
+    offsets = array("Q", [0])
+    for path in _worker_generator.iter_paths(limits, report, prefix=prefix_indices):
+        flat.extend(path)
+        offsets.append(len(flat))
+    return flat, offsets, (
+        report.depth_cuts, report.loop_cuts, report.nodes_expanded, report.timed_out, report.paths_limit_hit,
+        report.max_stack_depth
+    )
+
+
+def _unpack_paths(flat, offsets):
+    """Нарезает плоский массив индексов обратно на пути (array номеров переходов)"""
+    for begin, end in zip(offsets, offsets[1:]):
+        yield flat[begin:end]
+
+
+def _merge_report(report, counters):
+    """Добавляет счетчики поддерева в общий отчет"""
+    depth_cuts, loop_cuts, nodes_expanded, timed_out, paths_limit_hit, max_stack_depth = counters
+    report.depth_cuts += depth_cuts
+    report.nodes_expanded += nodes_expanded
+    report.loop_cuts += loop_cuts
+    report.timed_out = report.timed_out or timed_out
+    report.paths_limit_hit = report.paths_limit_hit or paths_limit_hit
+    report.max_stack_depth = max(report.max_stack_depth, max_stack_depth)
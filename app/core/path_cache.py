@@ -0,0 +1,324 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+
+from .test_generator import (
+    GenerationResult, GenerationLimits, TruncationReport, STRATEGY_RANDOM_WALKS, STRATEGY_PRIORITY
+)
+from .sampling import transition_weight, backend
+from .priority import transition_cost
+from .analysis import analyze_model
+
+# Формат файла кэша на диске
+CACHE_MAGIC = b"MBTC"
+CACHE_VERSION = 3
+CACHE_SUFFIX = ".paths"
+
+# Переменная окружения с каталогом дискового кэша (например, для CI)
+CACHE_DIR_ENV = "MBT_CACHE_DIR"
+
+DEFAULT_MEMORY_ENTRIES = 8
+DEFAULT_MEMORY_BYTES = 256 * 1024 * 1024
+DEFAULT_DISK_BYTES = 1024 * 1024 * 1024
+
+
+def default_cache_dir():
+    """Каталог дискового кэша: $MBT_CACHE_DIR или ~/.cache/mbt-assistant/paths"""
+    if os.environ.get(CACHE_DIR_ENV):
+        return os.environ[CACHE_DIR_ENV]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "mbt-assistant", "paths")
+
+
+def canonical_transitions(graph, start_node):
+    """
+    Переходы, достижимые из начального узла, в каноническом порядке:
+    узлы нумеруются обходом в ширину от start_node, переходы каждого узла
+    идут в порядке добавления (он же определяет порядок путей при переборе).
+    Возвращает (список переходов, номера узлов: ID -> номер)
+    """
+    number = {start_node.id: 0}
+    order = [start_node]
+    transitions = []
+    for node in order:
+        for trans in graph.outgoing(node):
+            transitions.append(trans)
+            if trans.target.id not in number:
+                number[trans.target.id] = len(order)
+                order.append(trans.target)
+    return transitions, number
+
+
+def structural_hash(graph, start_node, strategy, limits, transitions=None, number=None):
+    """
+    Хэш всего, от чего зависит набор путей: достижимая структура графа (без ID и текстов),
+    стратегия и ограничения перебора. Общее число узлов и переходов тоже входит в хэш,
+    потому что от него зависит процент покрытия. Для случайных блужданий добавляются
+    зерно, веса переходов и способ вычисления (numpy или Python дают разные блуждания),
+    для приоритетной генерации - стоимости переходов
+    """
+    if transitions is None:
+        transitions, number = canonical_transitions(graph, start_node)
+    limits = limits or GenerationLimits()
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps([
+        CACHE_VERSION, strategy, limits.max_depth, limits.max_paths, limits.loop_unroll,
+        graph.node_count, graph.transition_count
+    ]).encode("utf-8"))
+    if strategy == STRATEGY_RANDOM_WALKS:
+        digest.update(json.dumps([
+            limits.seed, backend(), [transition_weight(trans, limits.weighting) for trans in transitions]
+        ]).encode("utf-8"))
+    elif strategy == STRATEGY_PRIORITY:
+        digest.update(json.dumps([transition_cost(trans) for trans in transitions]).encode("utf-8"))
+    edges = array("I")
+    for trans in transitions:
+        edges.append(number[trans.source.id])
+        edges.append(number[trans.target.id])
+    digest.update(edges.tobytes())
+    return digest.hexdigest()
+
+
+class CachedPaths:
+    """
+    Набор путей в компактном виде: все пути подряд в одном массиве номеров
+    переходов (flat) и границы путей (offsets, на один больше числа путей).
+    Номера - как в графе, из которого результат сохранен; numbering[i] - такой номер
+    для i-го канонического перехода, через него пути переводятся в номера другого
+    графа с той же структурой. Если нумерация совпадает (тот же проект), перевода нет
+    """
+    REPORT_FIELDS = ("nodes_expanded", "depth_cuts", "loop_cuts", "paths_limit_hit")
+
+    def __init__(self, strategy, coverage, numbering, flat, offsets, report_counts):
+        self.strategy = strategy
+        self.coverage = coverage
+        self.numbering = numbering
+        self.flat = flat
+        self.offsets = offsets
+        self.report_counts = report_counts
+
+    @classmethod
+    def from_result(cls, result, transitions):
+        """transitions - канонический порядок переходов (см. canonical_transitions)"""
+        index_of = {trans: i for i, trans in enumerate(result.transitions)}
+        numbering = array("I", (index_of[trans] for trans in transitions))
+        flat = array("I")
+        offsets = array("Q", [0])
+        for path in result.paths:
+            flat.extend(path)
+            offsets.append(len(flat))
+        counts = {name: getattr(result.truncation, name) for name in cls.REPORT_FIELDS}
+        return cls(result.strategy, result.coverage, numbering, flat, offsets, counts)
+
+    @property
+    def nbytes(self):
+        return sum(part.itemsize * len(part) for part in (self.numbering, self.flat, self.offsets))
+
+    def iter_paths(self, transitions, graph_transitions):
+        """
+        Пути в номерах переходов текущего графа (порядок graph_transitions);
+        transitions - канонический порядок
+        """
+        index_of = {trans: i for i, trans in enumerate(graph_transitions)}
+        current = array("I", (index_of[trans] for trans in transitions))
+        flat = self.flat
+        if current != self.numbering:
+            # Перенумеровываем весь массив за один проход, а пути - его срезы
+            remap = array("I", bytes(4 * (max(self.numbering, default=0) + 1)))
+            for stored, now in zip(self.numbering, current):
+                remap[stored] = now
+            flat = array("I", map(remap.__getitem__, flat))
+        offsets = self.offsets
+        for begin, end in zip(offsets, offsets[1:]):
+            yield flat[begin:end]
+
+    def make_report(self):
+        report = TruncationReport()
+        for name, value in self.report_counts.items():
+            setattr(report, name, value)
+        report.paths_emitted = len(self.offsets) - 1
+        report.reused_paths = report.paths_emitted
+        return report
+
+    def write(self, f):
+        header = json.dumps({
+            "strategy": self.strategy,
+            "coverage": self.coverage,
+            "report": self.report_counts,
+            "transitions": len(self.numbering),
+            "paths": len(self.offsets) - 1,
+            "steps": len(self.flat),
+            "byteorder": sys.byteorder,
+        }).encode("utf-8")
+        f.write(CACHE_MAGIC + bytes([CACHE_VERSION]) + len(header).to_bytes(4, "little"))
+        f.write(header)
+        self.numbering.tofile(f)
+        self.offsets.tofile(f)
+        self.flat.tofile(f)
+
+    @classmethod
+    def read(cls, f):
+        """Читает запись из файла; None, если файл чужого формата или другой платформы"""
+        prefix = f.read(9)
+        if len(prefix) < 9 or prefix[:4] != CACHE_MAGIC or prefix[4] != CACHE_VERSION:
+            return None
+        header = json.loads(f.read(int.from_bytes(prefix[5:9], "little")).decode("utf-8"))
+        if header["byteorder"] != sys.byteorder:
+            return None
+        numbering = array("I")
+        numbering.fromfile(f, header["transitions"])
+        offsets = array("Q")
+        offsets.fromfile(f, header["paths"] + 1)
+        flat = array("I")
+        flat.fromfile(f, header["steps"])
+        return cls(header["strategy"], header["coverage"], numbering, flat, offsets, header["report"])
+
+
+class PathCache:
+    """
+    Кэш сгенерированных наборов путей по структурному хэшу графа.
+    В памяти - LRU на memory_entries записей и memory_bytes байт,
+    на диске (если задан directory) - файлы <хэш>.paths, самые давно
+    использованные удаляются, когда каталог превышает disk_bytes.
+    Методы можно вызывать из фонового потока.
+    """
+    def __init__(self, directory=None, memory_entries=DEFAULT_MEMORY_ENTRIES,
+                 memory_bytes=DEFAULT_MEMORY_BYTES, disk_bytes=DEFAULT_DISK_BYTES):
+        self.directory = directory
+        self.memory_entries = memory_entries
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._memory = OrderedDict() # Хэш -> CachedPaths
+        self._memory_used = 0
+        self._lock = threading.Lock()
+
+    def get(self, graph, start_node, strategy, limits=None):
+        """GenerationResult из кэша или None"""
+        transitions, number = canonical_transitions(graph, start_node)
+        key = structural_hash(graph, start_node, strategy, limits, transitions, number)
+
+        entry = self._memory_get(key)
+        if entry is None:
+            entry = self._disk_get(key)
+            if entry is not None:
+                self._memory_put(key, entry)
+
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        graph_transitions = graph.transitions
+        paths = list(entry.iter_paths(transitions, graph_transitions))
+        return GenerationResult(
+            paths, strategy, entry.coverage, entry.make_report(), start_node.id, limits, graph_transitions,
+            analyze_model(graph, start_node)
+        )
+
+    def put(self, graph, start_node, result, limits=None):
+        """Сохраняет результат (неполные из-за времени или отмены не сохраняются)"""
+        if result.truncation.timed_out or result.truncation.cancelled:
+            return
+        transitions, number = canonical_transitions(graph, start_node)
+        key = structural_hash(graph, start_node, result.strategy, limits, transitions, number)
+        entry = CachedPaths.from_result(result, transitions)
+        self._memory_put(key, entry)
+        self._disk_put(key, entry)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_used = 0
+
+    def _memory_get(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            return entry
+
+    def _memory_put(self, key, entry):
+        if entry.nbytes > self.memory_bytes:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_used -= old.nbytes
+            self._memory[key] = entry
+            self._memory_used += entry.nbytes
+            while len(self._memory) > self.memory_entries or self._memory_used > self.memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_used -= evicted.nbytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def _disk_get(self, key):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = CachedPaths.read(f)
+            os.utime(path) # Время изменения служит отметкой последнего использования
+        except (OSError, ValueError, EOFError, KeyError):
+            return None
+        return entry
+
+    def _disk_put(self, key, entry):
+        if not self.directory or entry.nbytes > self.disk_bytes:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as f:
+                entry.write(f)
+            os.replace(temp_path, path)
+            self._evict_disk(keep=path)
+        except OSError:
+            # Кэш - только ускорение: ошибки диска не должны ломать генерацию
+            pass
+
+    def _evict_disk(self, keep):
+        """Удаляет самые давно использованные файлы (кроме keep), пока каталог больше disk_bytes"""
+        files = []
+        total = 0
+        with os.scandir(self.directory) as entries:
+            for item in entries:
+                if item.name.endswith(CACHE_SUFFIX) and item.is_file():
+                    stat = item.stat()
+                    files.append((stat.st_mtime, stat.st_size, item.path))
+                    total += stat.st_size
+
+        files.sort()
+        for _, size, path in files:
+            if total <= self.disk_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+def generate_cached(generator, cache, strategy, limits=None, workers=None):
+    """TestGenerator.generate с поиском в кэше (cache=None - без кэша)"""
+    start_node = generator.find_start_node()
+    if cache is None or start_node is None:
+        return generator.generate(strategy, limits, workers)
+
+    result = cache.get(generator.graph, start_node, strategy, limits)
+    if result is None:
+        result = generator.generate(strategy, limits, workers)
+        cache.put(generator.graph, start_node, result, limits)
+    return result
@@ -0,0 +1,178 @@
+"""
+Приоритетная генерация небольшого smoke-набора за миллисекунды вместо полного перебора.
+Стоимость пути складывается из длины и типа переходов (Success дешевле Neutral,
+Error - намного дороже), пути ищутся поиском по первому наилучшему (куча heapq).
+Сначала отдаются самые дешевые успешные сценарии - пути до конечных состояний без
+переходов Error, затем по одному самому дешевому маршруту к каждому переходу Error.
+"""
+import heapq
+import time
+from array import array
+
+# Стоимость шага и добавка за тип перехода
+STEP_COST = 1.0
+TYPE_PENALTIES = {
+    "Success": 0.0,
+    "Neutral": 0.25,
+    "Error": 100.0, # Маршрут идет через чужую ошибку, только если иначе не добраться
+}
+ERROR_TYPE = "Error"
+
+
+def transition_cost(trans):
+    """Стоимость перехода в приоритетном поиске"""
+    return STEP_COST + TYPE_PENALTIES.get(trans.properties.get("type", "Neutral"), TYPE_PENALTIES["Neutral"])
+
+
+class _SearchTree:
+    """
+    Дерево частичных путей поиска: путь хранится ссылкой на родителя и последним
+    переходом, поэтому добавление шага не копирует путь
+    """
+    def __init__(self):
+        self.parents = array("i")
+        self.edges = array("I")
+        self.depths = array("I")
+
+    def extend(self, state, edge):
+        """Новое состояние: путь state плюс переход edge (-1 - пустой путь)"""
+        self.parents.append(state)
+        self.edges.append(edge)
+        self.depths.append(self.depth(state) + 1)
+        return len(self.edges) - 1
+
+    def depth(self, state):
+        return self.depths[state] if state >= 0 else 0
+
+    def path(self, state):
+        """Путь как array('I') номеров переходов"""
+        steps = []
+        while state >= 0:
+            steps.append(self.edges[state])
+            state = self.parents[state]
+        steps.reverse()
+        return array("I", steps)
+
+
+class PrioritySearch:
+    """
+    Поиск приоритетных путей по EdgeTable от узла start.
+    terminals - номера конечных узлов (без исходящих в модели); ловушки в таблице
+    уже тупики (см. TestGenerator.edges), поэтому внутрь ловушек поиск не заходит
+    """
+    CHECK_INTERVAL = 1024 # Как часто проверяются отмена и бюджет времени (извлечений из кучи)
+
+    def __init__(self, table, start, terminals, deadline=None, cancel_event=None):
+        self.table = table
+        self.start = start
+        self.terminals = terminals
+        self.deadline = deadline
+        self.cancel_event = cancel_event
+        self.costs = [transition_cost(trans) for trans in table.transitions]
+        self.errors = [trans.properties.get("type") == ERROR_TYPE for trans in table.transitions]
+
+    def _stopped(self, report):
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            report.cancelled = True
+            return True
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            report.timed_out = True
+            return True
+        return False
+
+    def _search(self, report, max_depth=None, per_node=1, allow_errors=False):
+        """
+        Поиск по первому наилучшему: извлекает из кучи частичные пути по возрастанию
+        стоимости (при равенстве - в порядке добавления), каждый узел - не больше
+        per_node раз (per_node=1 - алгоритм Дейкстры, больше - k кратчайших путей).
+        Лениво отдает (стоимость, узел, состояние в tree) извлеченных путей
+        """
+        table = self.table
+        targets = table.targets
+        out_edges = table.out_edges
+        out_offsets = table.out_offsets
+        costs = self.costs
+        errors = self.errors
+
+        tree = self.tree = _SearchTree()
+        pops = [0] * len(table.nodes)
+        heap = [(0.0, 0, self.start, -1)]
+        pushed = 1
+        extracted = 0
+
+        while heap:
+            cost, _, node, state = heapq.heappop(heap)
+            if pops[node] >= per_node:
+                continue
+            pops[node] += 1
+            extracted += 1
+            if extracted % self.CHECK_INTERVAL == 0 and self._stopped(report):
+                return
+            yield cost, node, state
+
+            depth = tree.depth(state)
+            if max_depth is not None and depth >= max_depth:
+                if out_offsets[node] != out_offsets[node + 1]:
+                    report.depth_cuts += 1
+                continue
+            report.nodes_expanded += 1
+            if depth + 1 > report.max_stack_depth:
+                report.max_stack_depth = depth + 1
+            for edge in out_edges[out_offsets[node]:out_offsets[node + 1]]:
+                if errors[edge] and not allow_errors:
+                    continue
+                target = targets[edge]
+                if pops[target] >= per_node:
+                    continue
+                heapq.heappush(heap, (cost + costs[edge], pushed, target, tree.extend(state, edge)))
+                pushed += 1
+
+    def iter_happy_paths(self, report, max_depth=None, per_terminal=1):
+        """Успешные сценарии по возрастанию стоимости: до per_terminal путей к каждому конечному узлу"""
+        terminals = self.terminals
+        for _, node, state in self._search(report, max_depth, per_terminal):
+            if node in terminals and state >= 0:
+                yield self.tree.path(state)
+
+    def iter_error_routes(self, report, max_depth=None):
+        """
+        По одному самому дешевому маршруту к каждому достижимому переходу Error:
+        путь до его начала плюс сам переход. Маршруты упорядочены по стоимости
+        """
+        table = self.table
+        costs = self.costs
+        errors = self.errors
+        routes = []
+        for cost, node, state in self._search(report, allow_errors=True):
+            for edge in table.outgoing(node):
+                if errors[edge]:
+                    # Номер в routes - порядок обнаружения: он зависит только от структуры модели
+                    routes.append((cost + costs[edge], len(routes), state, edge))
+        if report.cancelled or report.timed_out:
+            return
+
+        routes.sort()
+        for _, _, state, edge in routes:
+            if max_depth is not None and self.tree.depth(state) + 1 > max_depth:
+                report.depth_cuts += 1
+                continue
+            path = self.tree.path(state)
+            path.append(edge)
+            yield path
+
+
+def iter_priority_paths(table, start, terminals, limits, report, cancel_event=None, per_terminal=1):
+    """
+    Smoke-набор: сначала успешные сценарии, затем маршруты к переходам Error.
+    limits.max_paths ограничивает весь набор, limits.max_depth - длину пути
+    """
+    deadline = time.monotonic() + limits.time_budget if limits.time_budget else None
+    search = PrioritySearch(table, start, terminals, deadline, cancel_event)
+    for paths in (search.iter_happy_paths(report, limits.max_depth, per_terminal),
+                  search.iter_error_routes(report, limits.max_depth)):
+        for path in paths:
+            if not report.accept_path(limits):
+                return
+            yield path
+        if report.cancelled or report.timed_out:
+            return
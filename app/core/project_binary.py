@@ -0,0 +1,317 @@
+import json
+import struct
+import uuid
+import zlib
+
+from .graph import Graph
+
+# Заголовок файла: сигнатура, версия формата, флаги
+MAGIC = b"MBTP"
+VERSION = 1
+FLAG_COMPRESSED = 0x01
+
+# Типы записей в теле файла
+REC_END = 0x00
+REC_STRING = 0x01 # Новая строка в таблице строк
+REC_NODE = 0x02
+REC_TRANSITION = 0x03
+REC_UUID = 0x04 # Новая строка-UUID, хранится 16 байтами
+
+# Типы значений в свойствах
+VAL_NONE = 0
+VAL_FALSE = 1
+VAL_TRUE = 2
+VAL_INT = 3
+VAL_FLOAT = 4
+VAL_STRING = 5
+VAL_JSON = 6 # Вложенные структуры - строкой JSON
+
+CHUNK_SIZE = 64 * 1024
+
+_DOUBLE2 = struct.Struct("<dd")
+_DOUBLE = struct.Struct("<d")
+_BLOCK = struct.Struct("<I")
+
+
+class BinaryProjectWriter:
+    """
+    Пишет компактный бинарный проект (.mbtp).
+    Каждая строка (имена, ключи и значения свойств, ID) записывается один раз
+    и дальше упоминается индексом в таблице строк.
+    Записи собираются в блоки примерно по CHUNK_SIZE байт; блок содержит только
+    целые записи и сжимается zlib независимо от остальных.
+    """
+    def __init__(self, f, compress=True):
+        self._file = f
+        self._compress = compress
+        self._buffer = bytearray()
+        self._strings = {}
+        self._node_index = {}
+        self._file.write(MAGIC + bytes([VERSION, FLAG_COMPRESSED if compress else 0]))
+
+    def write_node(self, node, pos):
+        id_ref = self._string(node.id)
+        name_ref = self._string(node.name)
+        props = self._properties(node.properties)
+
+        self._buffer.append(REC_NODE)
+        _put_varint(self._buffer, id_ref)
+        _put_varint(self._buffer, name_ref)
+        self._buffer += _DOUBLE2.pack(*pos)
+        self._buffer += props
+        self._node_index[node.id] = len(self._node_index)
+        self._maybe_flush()
+
+    def write_transition(self, trans, anchor):
+        id_ref = self._string(trans.id)
+        action_ref = self._string(trans.action)
+        props = self._properties(trans.properties)
+
+        self._buffer.append(REC_TRANSITION)
+        _put_varint(self._buffer, id_ref)
+        # Узлы адресуются порядковым номером записи узла
+        _put_varint(self._buffer, self._node_index[trans.source.id])
+        _put_varint(self._buffer, self._node_index[trans.target.id])
+        _put_varint(self._buffer, action_ref)
+        if anchor is None:
+            self._buffer.append(0)
+        else:
+            self._buffer.append(1)
+            self._buffer += _DOUBLE2.pack(*anchor)
+        self._buffer += props
+        self._maybe_flush()
+
+    def close(self):
+        self._buffer.append(REC_END)
+        self._flush()
+
+    def _string(self, text):
+        """Индекс строки в таблице; новая строка сразу пишется отдельной записью"""
+        text = str(text)
+        ref = self._strings.get(text)
+        if ref is not None:
+            return ref
+
+        ref = len(self._strings)
+        self._strings[text] = ref
+        uuid_bytes = _uuid_bytes(text)
+        if uuid_bytes is not None:
+            self._buffer.append(REC_UUID)
+            self._buffer += uuid_bytes
+        else:
+            encoded = text.encode("utf-8")
+            self._buffer.append(REC_STRING)
+            _put_varint(self._buffer, len(encoded))
+            self._buffer += encoded
+        return ref
+
+    def _properties(self, properties):
+        """Кодирует словарь свойств; новые строки попадают в основной буфер раньше записи"""
+        out = bytearray()
+        _put_varint(out, len(properties))
+        for key, value in properties.items():
+            _put_varint(out, self._string(key))
+            if value is None:
+                out.append(VAL_NONE)
+            elif value is True:
+                out.append(VAL_TRUE)
+            elif value is False:
+                out.append(VAL_FALSE)
+            elif isinstance(value, int):
+                out.append(VAL_INT)
+                # Zigzag: знак уходит в младший бит
+                _put_varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+            elif isinstance(value, float):
+                out.append(VAL_FLOAT)
+                out += _DOUBLE.pack(value)
+            elif isinstance(value, str):
+                out.append(VAL_STRING)
+                _put_varint(out, self._string(value))
+            else:
+                out.append(VAL_JSON)
+                _put_varint(out, self._string(json.dumps(value, ensure_ascii=False)))
+        return out
+
+    def _maybe_flush(self):
+        if len(self._buffer) >= CHUNK_SIZE:
+            self._flush()
+
+    def _flush(self):
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        if self._compress:
+            data = zlib.compress(data, 6)
+        # Заголовок блока: длина данных в файле
+        self._file.write(_BLOCK.pack(len(data)))
+        self._file.write(data)
+
+
+def save_binary_project(graph, layout, file_path, compress=True):
+    """Сохраняет граф и раскладку в бинарный проект"""
+    with open(file_path, "wb") as f:
+        writer = BinaryProjectWriter(f, compress)
+        for node in graph.nodes:
+            writer.write_node(node, layout.node_pos(node.id))
+        for trans in graph.transitions:
+            writer.write_transition(trans, layout.anchor_pos(trans.id))
+        writer.close()
+
+
+def iter_binary_project(file_path, graph=None, layout=None):
+    """
+    Потоковое чтение бинарного проекта: граф наполняется по мере чтения файла,
+    после каждого созданного элемента отдается ("node", Node) или ("transition", Transition).
+    Файл не читается в память целиком.
+    """
+    from .project_io import ProjectLayout
+
+    graph = graph if graph is not None else Graph()
+    layout = layout if layout is not None else ProjectLayout()
+
+    with open(file_path, "rb") as f:
+        header = f.read(6)
+        if len(header) < 6 or header[:4] != MAGIC:
+            raise ValueError("Файл не является бинарным проектом MBT-Assistant")
+        if header[4] > VERSION:
+            raise ValueError(f"Неподдерживаемая версия формата: {header[4]}")
+
+        compressed = bool(header[5] & FLAG_COMPRESSED)
+        strings = []
+        nodes = []
+
+        for data in _iter_blocks(f, compressed):
+            pos = 0
+            while pos < len(data):
+                tag = data[pos]
+                pos += 1
+                if tag == REC_STRING:
+                    size, pos = _varint(data, pos)
+                    strings.append(data[pos:pos + size].decode("utf-8"))
+                    pos += size
+                elif tag == REC_UUID:
+                    # Быстрее, чем str(uuid.UUID(bytes=...))
+                    h = data[pos:pos + 16].hex()
+                    strings.append(f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}")
+                    pos += 16
+                elif tag == REC_NODE:
+                    ref, pos = _varint(data, pos)
+                    node_id = strings[ref]
+                    ref, pos = _varint(data, pos)
+                    node = graph.add_node(strings[ref], node_id)
+                    layout.nodes[node_id] = _DOUBLE2.unpack_from(data, pos)
+                    node.properties, pos = _read_properties(data, pos + 16, strings)
+                    nodes.append(node)
+                    yield "node", node
+                elif tag == REC_TRANSITION:
+                    ref, pos = _varint(data, pos)
+                    trans_id = strings[ref]
+                    source, pos = _varint(data, pos)
+                    target, pos = _varint(data, pos)
+                    ref, pos = _varint(data, pos)
+                    trans = graph.add_transition(nodes[source], nodes[target], strings[ref], trans_id)
+                    has_anchor = data[pos]
+                    pos += 1
+                    if has_anchor:
+                        layout.anchors[trans_id] = _DOUBLE2.unpack_from(data, pos)
+                        pos += 16
+                    trans.properties, pos = _read_properties(data, pos, strings)
+                    yield "transition", trans
+                elif tag == REC_END:
+                    return
+                else:
+                    raise ValueError(f"Поврежденный файл проекта: неизвестная запись {tag}")
+
+        raise ValueError("Неожиданный конец файла проекта")
+
+
+def load_binary_project(file_path):
+    """Загружает бинарный проект целиком. Возвращает (Graph, ProjectLayout)"""
+    from .project_io import ProjectLayout
+
+    graph = Graph()
+    layout = ProjectLayout()
+    for _ in iter_binary_project(file_path, graph, layout):
+        pass
+    return graph, layout
+
+
+def _iter_blocks(f, compressed):
+    """Читает блоки тела файла по одному (распаковывая при необходимости)"""
+    while True:
+        header = f.read(_BLOCK.size)
+        if not header:
+            return
+        size, = _BLOCK.unpack(header)
+        data = f.read(size)
+        if len(data) < size:
+            raise ValueError("Неожиданный конец файла проекта")
+        yield zlib.decompress(data) if compressed else data
+
+
+def _read_properties(data, pos, strings):
+    """Разбирает словарь свойств с позиции pos. Возвращает (properties, новая позиция)"""
+    count, pos = _varint(data, pos)
+    properties = {}
+    for _ in range(count):
+        ref, pos = _varint(data, pos)
+        kind = data[pos]
+        pos += 1
+        if kind == VAL_STRING:
+            ref_value, pos = _varint(data, pos)
+            value = strings[ref_value]
+        elif kind == VAL_NONE:
+            value = None
+        elif kind == VAL_FALSE:
+            value = False
+        elif kind == VAL_TRUE:
+            value = True
+        elif kind == VAL_INT:
+            raw, pos = _varint(data, pos)
+            value = (raw >> 1) ^ -(raw & 1)
+        elif kind == VAL_FLOAT:
+            value = _DOUBLE.unpack_from(data, pos)[0]
+            pos += 8
+        elif kind == VAL_JSON:
+            ref_value, pos = _varint(data, pos)
+            value = json.loads(strings[ref_value])
+        else:
+            raise ValueError(f"Поврежденный файл проекта: неизвестный тип значения {kind}")
+        properties[strings[ref]] = value
+    return properties, pos
+
+
+def _varint(data, pos):
+    """Читает LEB128 с позиции pos. Возвращает (значение, новая позиция)"""
+    value = data[pos]
+    pos += 1
+    if value < 0x80:
+        return value, pos
+
+    result = value & 0x7F
+    shift = 7
+    while True:
+        value = data[pos]
+        pos += 1
+        result |= (value & 0x7F) << shift
+        if value < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _put_varint(out, value):
+    """Беззнаковое целое переменной длины (LEB128)"""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _uuid_bytes(text):
+    """16 байт UUID, если строка - канонический UUID, иначе None"""
+    if len(text) != 36:
+        return None
+    try:
+        value = uuid.UUID(text)
+    except ValueError:
+        return None
+    return value.bytes if str(value) == text else None
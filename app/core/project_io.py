@@ -0,0 +1,116 @@
+import json
+import os
+
+from .graph import Graph
+from ..utils.profiling import profiler
+
+# Расширение компактного бинарного формата (см. project_binary)
+BINARY_EXTENSION = ".mbtp"
+
+
+class ProjectLayout:
+    """
+    Координаты элементов на холсте, которые хранятся в файле проекта рядом с моделью.
+    Логическому графу они не нужны, поэтому живут отдельно от него
+    """
+    def __init__(self):
+        self.nodes = {} # ID узла -> (x, y)
+        self.anchors = {} # ID перехода -> (x, y) точки изгиба
+
+    def node_pos(self, node_id, default=(0.0, 0.0)):
+        return self.nodes.get(node_id, default)
+
+    def anchor_pos(self, trans_id):
+        return self.anchors.get(trans_id)
+
+
+def is_binary_project(file_path):
+    return os.path.splitext(file_path)[1].lower() == BINARY_EXTENSION
+
+
+def load_project(file_path):
+    """
+    Загружает проект из файла. Возвращает (Graph, ProjectLayout).
+    Формат определяется по расширению: .mbtp - бинарный, иначе JSON
+    """
+    with profiler.span("project.load", path=file_path, binary=is_binary_project(file_path)) as span:
+        if is_binary_project(file_path):
+            from .project_binary import load_binary_project
+            graph, layout = load_binary_project(file_path)
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            graph, layout = project_from_dict(data)
+        if profiler.enabled:
+            span.info.update(bytes=os.path.getsize(file_path), nodes=graph.node_count, transitions=graph.transition_count)
+    return graph, layout
+
+
+def project_from_dict(data):
+    """Строит граф и раскладку из словаря формата JSON-проекта"""
+    graph = Graph()
+    layout = ProjectLayout()
+
+    # Восстанавливаем узлы с оригинальными ID
+    for n_data in data["nodes"]:
+        node = graph.add_node(n_data["name"], n_data["id"])
+        node.properties = n_data["properties"]
+        layout.nodes[node.id] = (n_data["x"], n_data["y"])
+
+    # Восстанавливаем переходы (старые проекты не хранят ID переходов)
+    for t_data in data["transitions"]:
+        source = graph.get_node(t_data["source_id"])
+        target = graph.get_node(t_data["target_id"])
+        if source and target:
+            trans = graph.add_transition(source, target, t_data["action"], t_data.get("id"))
+            trans.properties = t_data["properties"]
+            if "anchor_x" in t_data:
+                layout.anchors[trans.id] = (t_data["anchor_x"], t_data["anchor_y"])
+
+    return graph, layout
+
+
+def project_to_dict(graph, layout):
+    """Сериализует граф и раскладку в словарь формата JSON-проекта"""
+    project_data = {
+        "nodes": [],
+        "transitions": []
+    }
+
+    for node in graph.nodes:
+        x, y = layout.node_pos(node.id)
+        project_data["nodes"].append({
+            "id": node.id,
+            "name": node.name,
+            "x": x,
+            "y": y,
+            "properties": node.properties
+        })
+
+    for trans in graph.transitions:
+        trans_data = {
+            "id": trans.id,
+            "source_id": trans.source.id,
+            "target_id": trans.target.id,
+            "action": trans.action,
+            "properties": trans.properties
+        }
+        anchor = layout.anchor_pos(trans.id)
+        if anchor is not None:
+            trans_data["anchor_x"], trans_data["anchor_y"] = anchor
+        project_data["transitions"].append(trans_data)
+
+    return project_data
+
+
+def save_project(graph, layout, file_path):
+    """Сохраняет проект в JSON-файл или, для расширения .mbtp, в бинарный"""
+    with profiler.span("project.save", path=file_path, binary=is_binary_project(file_path)) as span:
+        if is_binary_project(file_path):
+            from .project_binary import save_binary_project
+            save_binary_project(graph, layout, file_path)
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(project_to_dict(graph, layout), f, ensure_ascii=False, indent=4)
+        if profiler.enabled:
+            span.info.update(bytes=os.path.getsize(file_path), nodes=graph.node_count, transitions=graph.transition_count)
@@ -0,0 +1,198 @@
+"""
+Случайные блуждания по модели для статистической генерации, когда даже
+стратегии покрытия слишком дороги.
+Блуждание начинается в начальном узле и на каждом шаге выбирает исходящий
+переход с вероятностью, пропорциональной его весу; заканчивается в узле без
+исходящих (конечном или на входе в ловушку) или по достижении максимальной длины.
+С numpy блуждания идут пачками: все блуждания пачки делают шаг одной векторной
+операцией над CSR-массивами EdgeTable. Без numpy тот же алгоритм выполняется
+на чистом Python (медленнее, и при том же зерне получаются другие блуждания).
+"""
+import random
+import time
+from array import array
+from bisect import bisect_right
+
+# Способы задать веса переходов
+WEIGHT_TYPE = "type" # По типу перехода (Success/Neutral/Error)
+WEIGHT_PROPERTY = "property" # По свойству weight, без него - по типу
+WEIGHT_UNIFORM = "uniform"
+
+WEIGHTINGS = {
+    WEIGHT_TYPE: "По типу перехода",
+    WEIGHT_PROPERTY: "По свойству weight",
+    WEIGHT_UNIFORM: "Равные",
+}
+
+# Вес по типу перехода: успешные сценарии выбираются чаще, ошибочные - реже
+TYPE_WEIGHTS = {
+    "Success": 3.0,
+    "Neutral": 2.0,
+    "Error": 1.0,
+}
+
+# Свойство перехода с пользовательским весом
+WEIGHT_KEY = "weight"
+
+# Значения по умолчанию, если в GenerationLimits не заданы max_paths и max_depth
+DEFAULT_WALKS = 1000
+DEFAULT_WALK_LENGTH = 100
+
+# Сколько шагов (номеров переходов) держит в памяти одна пачка блужданий
+BATCH_STEPS = 1 << 22
+
+
+def _load_numpy():
+    """
+    numpy или None, если он не установлен. Импорт отложен до первых блужданий:
+    модуль подключается вместе с test_generator, и numpy не должен замедлять запуск
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def backend():
+    """Чем считаются блуждания: "numpy" или "python" (входит в ключ кэша путей)"""
+    return "numpy" if _load_numpy() is not None else "python"
+
+
+def transition_weight(trans, weighting=WEIGHT_TYPE):
+    """Вес перехода; 0 - переход никогда не выбирается"""
+    if weighting == WEIGHT_UNIFORM:
+        return 1.0
+    if weighting == WEIGHT_PROPERTY:
+        try:
+            value = float(trans.properties.get(WEIGHT_KEY))
+        except (TypeError, ValueError):
+            value = -1.0
+        if value >= 0:
+            return value
+    return TYPE_WEIGHTS.get(trans.properties.get("type", "Neutral"), TYPE_WEIGHTS["Neutral"])
+
+
+class RandomWalkSampler:
+    """
+    Выбор переходов по весам поверх EdgeTable.
+    Веса исходящих переходов раскладываются в порядке out_edges и суммируются
+    накопительно по всему массиву: переход узла v выбирается бинарным поиском
+    значения base[v] + u * totals[v] (u - равномерное на [0, 1)) в cumulative
+    """
+    def __init__(self, table, weighting=WEIGHT_TYPE):
+        self.table = table
+        self.weighting = weighting
+
+        transitions = table.transitions
+        cumulative = []
+        total = 0.0
+        for edge in table.out_edges:
+            total += transition_weight(transitions[edge], weighting)
+            cumulative.append(total)
+        self.cumulative = cumulative
+
+        offsets = table.out_offsets
+        self.base = [cumulative[offsets[i] - 1] if offsets[i] else 0.0 for i in range(len(table.nodes))]
+        self.totals = [
+            (cumulative[offsets[i + 1] - 1] if offsets[i + 1] else 0.0) - self.base[i]
+            for i in range(len(table.nodes))
+        ]
+
+    def iter_walks(self, start, count=DEFAULT_WALKS, max_length=DEFAULT_WALK_LENGTH, seed=0, report=None,
+                   deadline=None, cancel_event=None):
+        """
+        Лениво отдает count блужданий из узла start (номер в EdgeTable) как array('I')
+        номеров переходов. Одинаковые seed и параметры дают одинаковые блуждания.
+        В report (TruncationReport) пишутся число шагов и остановка по времени или отмене
+        """
+        if count <= 0 or max_length <= 0 or self.totals[start] <= 0:
+            return
+        numpy = _load_numpy()
+        if numpy is not None:
+            walks = self._iter_numpy(numpy, start, count, max_length, seed, report, deadline, cancel_event)
+        else:
+            walks = self._iter_python(start, count, max_length, seed, report, deadline, cancel_event)
+        yield from walks
+
+    def _stopped(self, report, deadline, cancel_event):
+        if cancel_event is not None and cancel_event.is_set():
+            if report is not None:
+                report.cancelled = True
+            return True
+        if deadline is not None and time.monotonic() > deadline:
+            if report is not None:
+                report.timed_out = True
+            return True
+        return False
+
+    def _iter_python(self, start, count, max_length, seed, report, deadline, cancel_event):
+        rng = random.Random(seed)
+        uniform = rng.random
+        cumulative = self.cumulative
+        base = self.base
+        totals = self.totals
+        out_offsets = self.table.out_offsets
+        out_edges = self.table.out_edges
+        targets = self.table.targets
+
+        for number in range(count):
+            if number % 64 == 0 and self._stopped(report, deadline, cancel_event):
+                return
+            path = array("I")
+            node = start
+            while len(path) < max_length and totals[node] > 0:
+                last = out_offsets[node + 1] - 1
+                position = bisect_right(cumulative, base[node] + uniform() * totals[node], out_offsets[node], last)
+                edge = out_edges[position]
+                path.append(edge)
+                node = targets[edge]
+            if report is not None:
+                report.paths_emitted += 1
+                report.nodes_expanded += len(path)
+                report.max_stack_depth = max(report.max_stack_depth, len(path))
+            yield path
+
+    def _iter_numpy(self, numpy, start, count, max_length, seed, report, deadline, cancel_event):
+        rng = numpy.random.default_rng(seed)
+        cumulative = numpy.asarray(self.cumulative, dtype=numpy.float64)
+        base = numpy.asarray(self.base, dtype=numpy.float64)
+        totals = numpy.asarray(self.totals, dtype=numpy.float64)
+        last_out = numpy.frombuffer(self.table.out_offsets, dtype=numpy.uint32)[1:].astype(numpy.int64) - 1
+        out_edges = numpy.frombuffer(self.table.out_edges, dtype=numpy.uint32)
+        targets = numpy.frombuffer(self.table.targets, dtype=numpy.uint32)
+        batch_size = max(1, BATCH_STEPS // max_length)
+
+        remaining = count
+        while remaining > 0:
+            size = min(batch_size, remaining)
+            remaining -= size
+            # steps[шаг, блуждание]; шаги после конца блуждания не используются
+            steps = numpy.zeros((max_length, size), dtype=numpy.uint32)
+            lengths = numpy.zeros(size, dtype=numpy.int64)
+            nodes = numpy.full(size, start, dtype=numpy.int64)
+            active = numpy.arange(size)
+
+            for step in range(max_length):
+                if self._stopped(report, deadline, cancel_event):
+                    return
+                current = nodes[active]
+                values = base[current] + rng.random(len(active)) * totals[current]
+                # Округление могло вывести значение за последний переход узла
+                positions = numpy.minimum(numpy.searchsorted(cumulative, values, side="right"), last_out[current])
+                edges = out_edges[positions]
+                steps[step, active] = edges
+                nodes[active] = targets[edges]
+                lengths[active] += 1
+                # Дальше идут только блуждания, у которых есть куда идти
+                active = active[totals[nodes[active]] > 0]
+                if not len(active):
+                    break
+
+            walks = numpy.ascontiguousarray(steps.T)
+            if report is not None:
+                report.paths_emitted += size
+                report.nodes_expanded += int(lengths.sum())
+                report.max_stack_depth = max(report.max_stack_depth, int(lengths.max()))
+            for row, length in zip(walks, lengths.tolist()):
+                yield array("I", row[:length].tobytes())
@@ -1,74 +1,504 @@
+import threading
+import time
+from array import array
+
+from .coverage import cover_states, cover_transitions, cover_transition_pairs, transition_coverage
+from .incremental import PathReuse
+from .edge_table import EdgeTable
+from .analysis import analyze_model
+from .sampling import RandomWalkSampler, WEIGHT_TYPE, DEFAULT_WALKS, DEFAULT_WALK_LENGTH
+from .priority import iter_priority_paths
+from ..utils.profiling import profiler
+
+# Стратегии генерации: ключ -> название для интерфейса
+STRATEGY_ALL_PATHS = "all_paths"
+STRATEGY_ALL_STATES = "all_states"
+STRATEGY_ALL_TRANSITIONS = "all_transitions"
+STRATEGY_TRANSITION_PAIRS = "transition_pairs"
+STRATEGY_RANDOM_WALKS = "random_walks"
+STRATEGY_PRIORITY = "priority"
+
+STRATEGIES = {
+    STRATEGY_ALL_PATHS: "Все пути",
+    STRATEGY_ALL_STATES: "Все состояния",
+    STRATEGY_ALL_TRANSITIONS: "Все переходы",
+    STRATEGY_TRANSITION_PAIRS: "Пары переходов",
+    STRATEGY_RANDOM_WALKS: "Случайные блуждания",
+    STRATEGY_PRIORITY: "Приоритетные (smoke)",
+}
+
+
+class GenerationLimits:
+    """
+    Ограничения полного перебора. None - без ограничения.
+    loop_unroll - сколько раз один переход может встретиться в пути (развертка циклов),
+    time_budget - бюджет времени в секундах.
+    Для случайных блужданий max_paths - число блужданий, max_depth - их длина,
+    seed - зерно генератора случайных чисел, weighting - веса переходов (sampling.WEIGHTINGS)
+    """
+    def __init__(self, max_depth=None, max_paths=None, loop_unroll=1, time_budget=None, seed=0,
+                 weighting=WEIGHT_TYPE):
+        self.max_depth = max_depth
+        self.max_paths = max_paths
+        self.loop_unroll = max(1, loop_unroll)
+        self.time_budget = time_budget
+        self.seed = seed
+        self.weighting = weighting
+
+    def reuse_key(self):
+        """Параметры, при равенстве которых полный перебор дает одинаковые пути"""
+        return (self.max_depth, self.loop_unroll)
+
+    def __repr__(self):
+        return (f"GenerationLimits(max_depth={self.max_depth}, max_paths={self.max_paths}, "
+                f"loop_unroll={self.loop_unroll}, time_budget={self.time_budget}, seed={self.seed}, "
+                f"weighting='{self.weighting}')")
+
+
+class TruncationReport:
+    """Отчет о том, где и почему перебор был обрезан"""
+    def __init__(self):
+        self.paths_emitted = 0
+        self.nodes_expanded = 0 # Сколько раз обход спускался в узел
+        self.depth_cuts = 0 # Пути, обрезанные по максимальной глубине
+        self.loop_cuts = 0 # Ветки, оборванные на повторе перехода сверх loop_unroll
+        self.paths_limit_hit = False
+        self.timed_out = False
+        self.cancelled = False
+        self.reused_paths = 0 # Пути, взятые из предыдущей генерации без перебора
+        self.max_stack_depth = 0 # Наибольшая глубина, до которой спускался обход
+
+    @property
+    def truncated(self):
+        """True, если результат неполный из-за ограничений или отмены"""
+        return bool(self.depth_cuts) or self.paths_limit_hit or self.timed_out or self.cancelled
+
+    def accept_path(self, limits):
+        """Учитывает очередной путь; False, если лимит числа путей уже исчерпан"""
+        if limits.max_paths is not None and self.paths_emitted >= limits.max_paths:
+            self.paths_limit_hit = True
+            return False
+        self.paths_emitted += 1
+        return True
+
+    def summary(self):
+        """Краткое описание обрезки для пользователя"""
+        reasons = []
+        if self.cancelled:
+            reasons.append("генерация отменена")
+        if self.paths_limit_hit:
+            reasons.append("достигнут лимит числа путей")
+        if self.timed_out:
+            reasons.append("исчерпан бюджет времени")
+        if self.depth_cuts:
+            reasons.append(f"обрезано по глубине: {self.depth_cuts}")
+        return "; ".join(reasons)
+
+
+def report_counters(report):
+    """Счетчики отчета для профилирования (см. utils.profiling)"""
+    return {
+        "nodes_expanded": report.nodes_expanded,
+        "paths_emitted": report.paths_emitted,
+        "max_stack_depth": report.max_stack_depth,
+        "reused_paths": report.reused_paths,
+    }
+
+
+class Frontier:
+    """Необойденное поддерево: префикс пути (array номеров переходов), продолжения которого перебираются отдельно"""
+    def __init__(self, prefix):
+        self.prefix = prefix
+
+    def __repr__(self):
+        return f"Frontier(depth={len(self.prefix)})"
+
+
+class GenerationResult:
+    """
+    Результат генерации: пути и процент покрытия по критерию стратегии
+    (для полного перебора - покрытие переходов) и отчет об обрезке.
+    Пути - array('I') номеров переходов в списке transitions (порядок graph.transitions
+    на момент генерации, см. EdgeTable).
+    start_id, limits и analysis (ModelAnalysis модели на момент генерации) нужны,
+    чтобы решить, можно ли переиспользовать результат при следующей генерации
+    (см. TestGenerator.regenerate)
+    """
+    def __init__(self, paths, strategy, coverage, truncation=None, start_id=None, limits=None, transitions=None,
+                 analysis=None):
+        self.paths = paths
+        self.strategy = strategy
+        self.coverage = coverage
+        self.truncation = truncation or TruncationReport()
+        self.start_id = start_id
+        self.limits = limits or GenerationLimits()
+        self.transitions = transitions or []
+        self.analysis = analysis
+
+    def __repr__(self):
+        coverage = "-" if self.coverage is None else f"{self.coverage:.1f}%"
+        return f"GenerationResult(strategy='{self.strategy}', paths={len(self.paths)}, coverage={coverage})"
+
+
 class TestGenerator:
+    """
+    Генерация путей по модели. Структура графа снимается в EdgeTable
+    при первом обращении к edges, поэтому на каждую генерацию создается свой генератор
+    """
     def __init__(self, graph):
         self.graph = graph
-    
+        self.cancel_event = threading.Event()
+        self._edges = None
+        self._analysis = None
+
+    @property
+    def edges(self):
+        """
+        Целочисленная таблица переходов (строится один раз).
+        Ловушки из analysis в ней - тупики: перебор не ходит по циклам, из которых
+        нельзя дойти до конечного состояния, путь заканчивается на входе в ловушку
+        """
+        if self._edges is None:
+            self._edges = EdgeTable(self.graph, sinks=self.analysis.traps)
+        return self._edges
+
+    @property
+    def analysis(self):
+        """Достижимость и ловушки модели (ModelAnalysis, считается один раз)"""
+        if self._analysis is None:
+            self._analysis = analyze_model(self.graph, self.find_start_node())
+        return self._analysis
+
+    def cancel(self):
+        """Просит идущий перебор остановиться (безопасно вызывать из другого потока)"""
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
     def find_start_node(self):
         """Ищет узел, помеченный как начальный"""
         for node in self.graph.nodes:
             if node.properties.get("is_initial", False):
                 return node
-            return None
-        
-    def generate_all_paths(self):
+        return None
+
+    def generate_all_paths(self, limits=None, report=None):
         """
         Генерирует список путей от начального узла до всех конечных точек
         База для формирования тест-кейсов
         """
+        return list(self.iter_paths(limits, report))
+
+    def generate(self, strategy=STRATEGY_ALL_PATHS, limits=None, workers=None):
+        """
+        Генерирует пути выбранной стратегией и считает достигнутое покрытие.
+        Ограничения limits применяются к полному перебору путей, случайным блужданиям
+        и приоритетной генерации: стратегии покрытия и так строят набор ограниченного размера.
+        workers > 1 включает параллельный полный перебор в нескольких процессах
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия генерации: {strategy}")
+
+        limits = limits or GenerationLimits()
         start_node = self.find_start_node()
         if not start_node:
-            return []
-        
-        all_path = []
-        # Запускаем рекурсивный обход
-        self._dfs(start_node, [], all_path, set())
-        return all_path
-    
-    def _dfs(self, current_node, current_path, all_path, visited_transitions):
-        """Внутренний обход графа"""
-        # Находим все выходящие стрелки из графа
-        outgoing_transitions = {
-            t for t in self.graph.transitions if t.source.id == current_node.id
-        }
-
-        # Если идти некуда - мы дошли до конца сценария
-        if not outgoing_transitions:
-            if current_path:
-                all_path.append(list(current_path))
-            return
-        
-        for trans in outgoing_transitions:
+            return GenerationResult([], strategy, 0.0, limits=limits)
+
+        report = TruncationReport()
+
+        with profiler.span("generate", strategy=strategy, workers=workers or 1) as span:
+            if strategy == STRATEGY_ALL_PATHS:
+                with profiler.span("generate.enumerate"):
+                    if workers and workers > 1:
+                        from .parallel import iter_paths_parallel
+                        paths = list(iter_paths_parallel(self.graph, limits, report, workers, cancel_event=self.cancel_event))
+                    else:
+                        paths = self.generate_all_paths(limits, report)
+                with profiler.span("generate.coverage"):
+                    coverage = transition_coverage(self.graph, paths)
+            elif strategy in (STRATEGY_RANDOM_WALKS, STRATEGY_PRIORITY):
+                with profiler.span("generate.enumerate", strategy=strategy):
+                    if strategy == STRATEGY_RANDOM_WALKS:
+                        paths = list(self.iter_random_walks(limits, report))
+                    else:
+                        paths = list(self.iter_priority_paths(limits, report))
+                with profiler.span("generate.coverage"):
+                    coverage = transition_coverage(self.graph, paths)
+            else:
+                with profiler.span("generate.cover", strategy=strategy):
+                    if strategy == STRATEGY_ALL_STATES:
+                        paths, coverage = cover_states(self.graph, start_node)
+                    elif strategy == STRATEGY_ALL_TRANSITIONS:
+                        paths, coverage = cover_transitions(self.graph, start_node)
+                    else:
+                        paths, coverage = cover_transition_pairs(self.graph, start_node)
+                    # Стратегии покрытия строят пути из объектов Transition
+                    paths = [self.edges.to_path(path) for path in paths]
+            span.info.update(report_counters(report), paths=len(paths))
+
+        return GenerationResult(
+            paths, strategy, coverage, report, start_node.id, limits, self.edges.transitions, self.analysis
+        )
+
+    def can_reuse(self, previous, changes, strategy, limits=None):
+        """
+        Можно ли получить результат из предыдущего (previous) с учетом изменений
+        модели changes (Graph.take_changes), не перебирая все заново.
+        Правка текстов не меняет пути ни в одной стратегии; структурные изменения
+        переиспользуются только полным перебором (стратегии покрытия и так быстрые).
+        Случайные блуждания и приоритетные пути не переиспользуются: они зависят от типа
+        перехода, смена которого не считается изменением структуры
+        """
+        if previous is None or changes.full or previous.strategy != strategy:
+            return False
+        if strategy in (STRATEGY_RANDOM_WALKS, STRATEGY_PRIORITY):
+            return False
+        limits = limits or GenerationLimits()
+        if previous.limits.reuse_key() != limits.reuse_key():
+            return False
+
+        # Неполный предыдущий результат не годится как источник путей
+        truncation = previous.truncation
+        if truncation.paths_limit_hit or truncation.timed_out or truncation.cancelled:
+            return False
+
+        start_node = self.find_start_node()
+        if start_node is None or start_node.id != previous.start_id or start_node.id in changes.structure_nodes:
+            return False
+        # Без прежнего анализа неизвестно, какие ловушки отсекал старый перебор
+        if previous.analysis is None:
+            return False
+        return not changes.structural or strategy == STRATEGY_ALL_PATHS
+
+    def iter_regenerated_paths(self, previous, changes, limits=None, report=None):
+        """
+        Пути с учетом изменений (только если can_reuse вернул True).
+        Без структурных изменений отдаются старые пути как есть: тексты шагов
+        берутся из модели при форматировании. Иначе выполняется полный перебор,
+        в котором поддеревья, не затронутые изменениями, берутся из previous
+        """
+        limits = limits or GenerationLimits()
+        if report is None:
+            report = TruncationReport()
+
+        # Узел, который стал ловушкой или перестал ей быть, для перебора тоже изменился:
+        # у него появились или пропали исходящие переходы (см. edges)
+        dirty_ids = changes.structure_nodes | (previous.analysis.traps ^ self.analysis.traps)
+        reuse = PathReuse(self.graph, self.edges, previous, dirty_ids)
+        if not changes.structural:
+            return reuse.iter_all(limits, report)
+        return self.iter_paths(limits, report, reuse=reuse)
+
+    def regenerate(self, previous, changes, strategy=STRATEGY_ALL_PATHS, limits=None, workers=None):
+        """Как generate, но по возможности переиспользует предыдущий результат"""
+        if not self.can_reuse(previous, changes, strategy, limits):
+            return self.generate(strategy, limits, workers)
+
+        limits = limits or GenerationLimits()
+        report = TruncationReport()
+        paths = list(self.iter_regenerated_paths(previous, changes, limits, report))
+        if changes.structural:
+            coverage = transition_coverage(self.graph, paths)
+        else:
+            coverage = previous.coverage
+        return GenerationResult(
+            paths, strategy, coverage, report, previous.start_id, limits, self.edges.transitions, self.analysis
+        )
+
+    def iter_paths(self, limits=None, report=None, prefix=(), split_depth=None, reuse=None):
+        """
+        Лениво перечисляет пути от начального узла (обход в глубину с явным стеком
+        по целочисленной таблице переходов EdgeTable).
+        Каждый путь отдается как array('I') номеров переходов, поэтому глубина модели
+        не упирается в лимит рекурсии, а в памяти держится только текущий путь.
+        Переход повторяется в пути не больше limits.loop_unroll раз: если следующий
+        шаг превысил бы лимит, отдается уже собранный префикс.
+        Ограничения limits и причины обрыва записываются в report.
+
+        Для параллельного перебора: prefix - уже пройденное начало пути (номера
+        переходов, перебирается только его поддерево), split_depth - глубина, на которой
+        вместо спуска отдается Frontier с префиксом необойденного поддерева.
+
+        Для повторной генерации: reuse (PathReuse) позволяет не обходить поддеревья,
+        не затронутые изменениями модели, а брать их пути из предыдущего результата.
+        """
+        limits = limits or GenerationLimits()
+        if report is None:
+            report = TruncationReport()
+
+        table = self.edges
+        targets = table.targets
+        out_edges = table.out_edges
+        out_offsets = table.out_offsets
+
+        if prefix:
+            current_node = targets[prefix[-1]]
+        else:
+            start_node = self.find_start_node()
+            if not start_node:
+                return
+            current_node = table.node_index[start_node.id]
+
+        deadline = time.monotonic() + limits.time_budget if limits.time_budget else None
+        iterations = 0
+        loop_unroll = limits.loop_unroll
+        max_depth = limits.max_depth
+
+        current_path = array("I", prefix)
+        visit_counts = [0] * len(table) # Номер перехода -> сколько раз он уже есть в текущем пути
+        for edge in prefix:
+            visit_counts[edge] += 1
+        # Сколько переходов текущего пути ведут в измененные узлы (только при reuse)
+        dirty_steps = 0
+        dirty_edges = reuse.dirty_edges if reuse is not None else ()
+        # На вершине стека - итератор по еще не пройденным исходящим переходам текущего узла
+        stack = [iter(out_edges[out_offsets[current_node]:out_offsets[current_node + 1]])]
+
+        while stack:
+            iterations += 1
+            if iterations % 1024 == 0:
+                # Кооперативная проверка бюджета времени и отмены
+                if self.cancel_event.is_set():
+                    report.cancelled = True
+                    return
+                if deadline is not None and time.monotonic() > deadline:
+                    report.timed_out = True
+                    return
+
+            edge = next(stack[-1], None)
+
+            if edge is None:
+                # Все ветки узла исследованы - откатываемся на шаг назад
+                stack.pop()
+                if current_path:
+                    popped = current_path.pop()
+                    visit_counts[popped] -= 1
+                    if popped in dirty_edges:
+                        dirty_steps -= 1
+                continue
+
             # Защита от бесконечного цикла
-            if trans.id in outgoing_transitions:
+            if visit_counts[edge] >= loop_unroll:
+                report.loop_cuts += 1
                 # Если уперлись в цикл, сохраняем то, что успели собрать
-                all_path.append(list(current_path))
+                if current_path:
+                    if not report.accept_path(limits):
+                        return
+                    if reuse is not None and not dirty_steps:
+                        reuse.advance()
+                    yield current_path[:]
+                continue
+
+            current_path.append(edge)
+            target = targets[edge]
+
+            if reuse is not None:
+                if edge in dirty_edges:
+                    dirty_steps += 1
+                elif not dirty_steps and reuse.can_skip(target):
+                    # Поддерево не затронуто изменениями - берем его пути из прошлого результата
+                    for path in reuse.iter_block(current_path, limits, report):
+                        yield path
+                    if report.paths_limit_hit:
+                        return
+                    current_path.pop()
+                    continue
+
+            first_out = out_offsets[target]
+            last_out = out_offsets[target + 1]
+            depth_reached = max_depth is not None and len(current_path) >= max_depth
+
+            # Если идти некуда (или дальше нельзя по глубине) - сценарий заканчивается
+            if first_out == last_out or depth_reached:
+                if first_out != last_out:
+                    report.depth_cuts += 1
+                if not report.accept_path(limits):
+                    return
+                if reuse is not None and not dirty_steps:
+                    reuse.advance()
+                yield current_path[:]
+                popped = current_path.pop()
+                if popped in dirty_edges:
+                    dirty_steps -= 1
                 continue
 
-            # Добавляем переход в текущий путь
-            visited_transitions.add(trans.id)
-            current_path.append(trans)
+            if split_depth is not None and len(current_path) >= split_depth:
+                # Поддерево будет перебрано отдельно
+                yield Frontier(current_path[:])
+                current_path.pop()
+                continue
 
             # Идем глубже к след узлу
-            self._dfs(trans.target, current_path, all_path, visited_transitions)
+            report.nodes_expanded += 1
+            visit_counts[edge] += 1
+            stack.append(iter(out_edges[first_out:last_out]))
+            if len(current_path) > report.max_stack_depth:
+                report.max_stack_depth = len(current_path)
 
-            # Откат для исследования других веток
-            current_path.pop()
-            visited_transitions.remove(trans.id)
+    def iter_random_walks(self, limits=None, report=None):
+        """
+        Лениво отдает случайные блуждания от начального узла (см. sampling.RandomWalkSampler):
+        limits.max_paths блужданий длиной не больше limits.max_depth шагов,
+        переходы выбираются по весам limits.weighting, зерно - limits.seed.
+        Ловушки в таблице переходов - тупики, поэтому в них блуждание заканчивается
+        """
+        limits = limits or GenerationLimits()
+        if report is None:
+            report = TruncationReport()
+        start_node = self.find_start_node()
+        if not start_node:
+            return iter(())
 
-    def format_test_cases(self, paths):
-        """Превращает сырые пути в читаемые сценарии"""
-        formatted_tests = []
-        for i, path in enumerate(paths):
+        table = self.edges
+        deadline = time.monotonic() + limits.time_budget if limits.time_budget else None
+        sampler = RandomWalkSampler(table, limits.weighting)
+        return sampler.iter_walks(
+            table.node_index[start_node.id],
+            count=limits.max_paths if limits.max_paths is not None else DEFAULT_WALKS,
+            max_length=limits.max_depth if limits.max_depth is not None else DEFAULT_WALK_LENGTH,
+            seed=limits.seed, report=report, deadline=deadline, cancel_event=self.cancel_event
+        )
+
+    def iter_priority_paths(self, limits=None, report=None):
+        """
+        Лениво отдает smoke-набор (см. priority.PrioritySearch): самые дешевые успешные
+        сценарии до каждого конечного состояния, затем по одному кратчайшему маршруту
+        к каждому переходу Error. Стоимость складывается из длины и типов переходов
+        """
+        limits = limits or GenerationLimits()
+        if report is None:
+            report = TruncationReport()
+        start_node = self.find_start_node()
+        if not start_node:
+            return iter(())
+
+        table = self.edges
+        terminals = {table.node_index[node_id] for node_id in self.analysis.terminals}
+        return iter_priority_paths(
+            table, table.node_index[start_node.id], terminals, limits, report, cancel_event=self.cancel_event
+        )
+
+    def iter_test_cases(self, paths, first_id=1):
+        """Лениво превращает пути (номера переходов EdgeTable) в читаемые сценарии (по одному тест-кейсу)"""
+        transitions = self.edges.transitions
+        for i, path in enumerate(paths, start=first_id):
             test_case = {
-                "id": i + 1,
+                "id": i,
                 "steps": []
             }
-            for step in path:
-                 test_case["steps"].append({
+            for index in path:
+                step = transitions[index]
+                test_case["steps"].append({
                     "from_node": step.source.name,
                     "action": step.action,
                     "input": step.properties.get("input_data", "N/A"),
-                    "to_node": step.target.name,    
+                    "to_node": step.target.name,
                     "expected": step.target.properties.get("expected_result", "N/A")
                 })
-            formatted_tests.append(test_case)
-        return formatted_tests
\ No newline at end of file
+            yield test_case
+
+    def format_test_cases(self, paths):
+        """Превращает сырые пути в читаемые сценарии"""
+        return list(self.iter_test_cases(paths))
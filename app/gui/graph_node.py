@@ -1,9 +1,14 @@
-from PyQt6.QtWidgets import QGraphicsEllipseItem, QGraphicsTextItem, QInputDialog, QCheckBox
+from PyQt6.QtWidgets import QGraphicsEllipseItem, QInputDialog, QCheckBox
 from PyQt6.QtGui import QBrush, QColor, QTextOption
 from PyQt6.QtCore import Qt
 
 from ..core.graph import Node
 from .property_dialogs import NodePropertiesDialog
+from .lod import LodTextItem, is_detailed
+
+# Подсветка проблем, найденных анализом модели (см. core.analysis.ModelAnalysis)
+STATE_UNREACHABLE = "unreachable"
+STATE_TRAP = "trap"
 
 class GraphNodeItem(QGraphicsEllipseItem):
     """
@@ -16,16 +21,19 @@ class GraphNodeItem(QGraphicsEllipseItem):
         # Список всех стрелок, которые присоединены к этому узлу
         self.transitions = [] 
 
+        # Результат анализа модели для узла (None, STATE_UNREACHABLE или STATE_TRAP)
+        self.analysis_state = None
+
         # Цвет состояния
         self.setBrush(QBrush(QColor("#aaddff"))) # Цвет заливки
 
         # Флаги
         self.setFlag(QGraphicsEllipseItem.GraphicsItemFlag.ItemIsMovable)
         self.setFlag(QGraphicsEllipseItem.GraphicsItemFlag.ItemIsSelectable)
-        self.setFlag(QGraphicsEllipseItem.GraphicsItemFlag.ItemSendsScenePositionChanges)
+        self.setFlag(QGraphicsEllipseItem.GraphicsItemFlag.ItemSendsGeometryChanges)
 
         # Имя поверх кружка
-        self.text_item = QGraphicsTextItem(self.logical_node.name, self)
+        self.text_item = LodTextItem(self.logical_node.name, self)
         self.text_item.setDefaultTextColor(QColor("black"))
         self.text_item.setTextWidth(90)
         option = QTextOption(Qt.AlignmentFlag.AlignCenter)
@@ -43,12 +51,21 @@ class GraphNodeItem(QGraphicsEllipseItem):
             (100 - rect.height()) / 2
         )
 
+    def paint(self, painter, option, widget=None):
+        if is_detailed(painter):
+            super().paint(painter, option, widget)
+            return
+        # При мелком масштабе - просто залитый квадрат без обводки
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.brush())
+        painter.drawRect(self.rect())
+
     def itemChange(self, change, value):
         """Событие срабатывает при любом движении узла"""
-        if change == QGraphicsEllipseItem.GraphicsItemChange.ItemPositionChange:
-            # Просим все связанные стрелки обновить свои координаты
+        if change == QGraphicsEllipseItem.GraphicsItemChange.ItemPositionHasChanged:
+            # Просим все связанные стрелки обновить свои координаты (один раз за кадр)
             for transition in self.transitions:
-                transition.update_position()
+                transition.schedule_update()
         return super().itemChange(change, value)
     
     def mouseDoubleClickEvent(self, event):
@@ -80,6 +97,13 @@ class GraphNodeItem(QGraphicsEllipseItem):
                 return
 
             # Иначе просто обновляем данные
+            graph = self.scene().views()[0].window().graph_model
+            if new_name != current_name or new_expected != current_expected:
+                graph.mark_text_changed()
+            if now_initial != is_initial:
+                # Сменился начальный узел - пути нужно перебрать заново
+                graph.mark_structure_changed()
+
             self.logical_node.name = new_name
             self.text_item.setPlainText(new_name)
             self.update_text_position()
@@ -93,10 +117,19 @@ class GraphNodeItem(QGraphicsEllipseItem):
                         item.refresh_color()
             self.refresh_color()
 
+    def set_analysis_state(self, state):
+        if state != self.analysis_state:
+            self.analysis_state = state
+            self.refresh_color()
+
     def refresh_color(self):
         """Устанавливает цвет узла в зависимости от его статуса"""
         if self.logical_node.properties.get("is_initial", False):
             self.setBrush(QBrush(QColor("#ccffcc"))) # Зеленый для начального
+        elif self.analysis_state == STATE_UNREACHABLE:
+            self.setBrush(QBrush(QColor("#dddddd"))) # Серый: до узла нельзя дойти
+        elif self.analysis_state == STATE_TRAP:
+            self.setBrush(QBrush(QColor("#ffbbbb"))) # Красный: из узла нет выхода к концу сценария
         else:
             self.setBrush(QBrush(QColor("#aaddff"))) # Голубой для обычного
 
@@ -1,28 +1,90 @@
 import math
-from PyQt6.QtWidgets import QGraphicsPathItem, QGraphicsRectItem, QGraphicsPolygonItem, QGraphicsTextItem
+from PyQt6.QtWidgets import QGraphicsPathItem, QGraphicsRectItem
 from PyQt6.QtGui import QPen, QColor, QPainterPath, QPolygonF, QBrush, QTextOption
-from PyQt6.QtCore import QLineF, QPointF, Qt
+from PyQt6.QtCore import QLineF, QPointF, Qt, QTimer
 
 from .property_dialogs import TransitionPropertiesDialog
+from .lod import LodTextItem, LodPolygonItem, is_detailed
+
+# Цвет стрелки по типу перехода
+TRANSITION_COLORS = {
+    "Neutral": "#555555", # Серый
+    "Success": "#27ae60", # Зеленый
+    "Error": "#c0392b",   # Красный
+}
+
+# Кэш перьев и кистей: тип перехода -> (перо линии, кисть наконечника, перо наконечника)
+_STYLE_CACHE = {}
+
+
+def transition_style(trans_type):
+    """Общие для всех стрелок одного типа перо и кисти (создаются один раз)"""
+    style = _STYLE_CACHE.get(trans_type)
+    if style is None:
+        color = QColor(TRANSITION_COLORS.get(trans_type, TRANSITION_COLORS["Neutral"]))
+        style = (QPen(color, 2), QBrush(color), QPen(color, 1))
+        _STYLE_CACHE[trans_type] = style
+    return style
+
+
+class GeometryUpdateQueue:
+    """
+    Объединяет пересчеты геометрии стрелок: сколько бы раз за кадр ни сдвинулся
+    узел или якорь, каждая стрелка пересчитывается не чаще одного раза за FRAME_MS
+    """
+    FRAME_MS = 16
+
+    def __init__(self):
+        self._items = {} # Упорядоченное множество стрелок
+        self._timer = None
+
+    def schedule(self, transition_item):
+        self._items[transition_item] = None
+        if self._timer is None:
+            # Таймер создается лениво: нужен уже созданный QApplication
+            self._timer = QTimer()
+            self._timer.setSingleShot(True)
+            self._timer.timeout.connect(self.flush)
+        if not self._timer.isActive():
+            self._timer.start(self.FRAME_MS)
+
+    def flush(self):
+        items, self._items = self._items, {}
+        for transition_item in items:
+            # Стрелку могли удалить со сцены, пока она ждала обновления
+            if transition_item.scene() is not None:
+                transition_item.update_position()
+
+
+geometry_updates = GeometryUpdateQueue()
 
 class GraphTransitionItem(QGraphicsPathItem):
-    """Визуальная стрелка с точкой изгиба"""
-    def __init__(self, source_item, target_item, logical_transition):
+    """
+    Визуальная стрелка с точкой изгиба.
+    anchor_pos - сохраненное положение якоря (иначе середина между узлами).
+    defer_geometry=True откладывает расчет геометрии до apply_deferred_geometry()
+    (используется при пакетной загрузке сцены)
+    """
+    def __init__(self, source_item, target_item, logical_transition, anchor_pos=None, defer_geometry=False):
         super().__init__()
         self.source_item = source_item
         self.target_item = target_item
         self.logical_transition = logical_transition
+        # Пока True, update_position ничего не делает
+        self._geometry_deferred = True
+
+        # Что сейчас показано: по ним лишние setPlainText/setPen пропускаются
+        self._label_text = None
+        self._style_type = None
 
         # Настройка линии
-        self.setPen(QPen(QColor("#555555"), 2))
         self.setBrush(QBrush(Qt.BrushStyle.NoBrush))
 
         # Создаем отдельный объект для наконечника
-        self.arrow_head = QGraphicsPolygonItem(self)
-        self.arrow_head.setBrush(QBrush(QColor("#555555")))
-        self.arrow_head.setPen(QPen(QColor("#555555"), 1))
+        self.arrow_head = LodPolygonItem(self)
+        self.refresh_style()
 
-        self.label = QGraphicsTextItem(self)
+        self.label = LodTextItem(self)
         self.label.setDefaultTextColor(QColor("white"))
         self.label.setTextWidth(150)
         font = self.label.font()
@@ -38,12 +100,16 @@ class GraphTransitionItem(QGraphicsPathItem):
         # Создаем якорь (точку изгиба)
         self.anchor = TransitionAnchor(self)
         
-        # Начальное положение якоря - середина между узлами
-        p1 = self.source_item.sceneBoundingRect().center()
-        p2 = self.target_item.sceneBoundingRect().center()
-        self.anchor.setPos((p1 + p2) / 2)
+        if anchor_pos is not None:
+            self.anchor.setPos(*anchor_pos)
+        else:
+            # Начальное положение якоря - середина между узлами
+            p1 = self.source_item.sceneBoundingRect().center()
+            p2 = self.target_item.sceneBoundingRect().center()
+            self.anchor.setPos((p1 + p2) / 2)
 
-        self.update_position()
+        if not defer_geometry:
+            self.apply_deferred_geometry()
 
     def itemChange(self, change, value):
         # Если стрелку добавили на сцену, добавляем и якорь
@@ -53,25 +119,40 @@ class GraphTransitionItem(QGraphicsPathItem):
         return super().itemChange(change, value)
     
     def update_label_text(self):
-        """Обновляет текст подписи на основе Action"""
+        """Обновляет текст подписи на основе Action (без перевёрстки, если текст не менялся)"""
         action_text = self.logical_transition.action
         # Если действие не ввели, показываем пустоту или "Action"
-        self.label.setPlainText(action_text if action_text != "Action" else "")
+        text = action_text if action_text != "Action" else ""
+        if text != self._label_text:
+            self._label_text = text
+            self.label.setPlainText(text)
 
     def refresh_style(self):
-        """Меняет цвет стрелки в зависимости от типа"""
+        """Меняет цвет стрелки в зависимости от типа (перья и кисти берутся из кэша)"""
         trans_type = self.logical_transition.properties.get("type", "Neutral")
-        color = "#555555" # По умолчанию серый
-        if trans_type == "Success": color = "#27ae60" # Зеленый
-        if trans_type == "Error": color = "#c0392b"   # Красный
-        
-        pen = QPen(QColor(color), 2)
-        self.setPen(pen)
-        self.arrow_head.setBrush(QBrush(QColor(color)))
-        self.arrow_head.setPen(QPen(QColor(color), 1))
+        if trans_type == self._style_type:
+            return
+        self._style_type = trans_type
+
+        line_pen, arrow_brush, arrow_pen = transition_style(trans_type)
+        self.setPen(line_pen)
+        self.arrow_head.setBrush(arrow_brush)
+        self.arrow_head.setPen(arrow_pen)
+
+    def schedule_update(self):
+        """Запрашивает пересчет геометрии в ближайшем кадре (см. GeometryUpdateQueue)"""
+        geometry_updates.schedule(self)
+
+    def apply_deferred_geometry(self):
+        """Снимает отложенный режим и один раз рассчитывает геометрию"""
+        self._geometry_deferred = False
+        self.update_position()
 
     def update_position(self):
-        """Пересчет геометрии линии и наконечника"""
+        """Пересчет геометрии линии, наконечника и положения подписи (текст и стиль не трогает)"""
+        if self._geometry_deferred:
+            return
+
         p_start_center = self.source_item.sceneBoundingRect().center()
         p_end_center = self.target_item.sceneBoundingRect().center()
         p_anchor = self.anchor.scenePos()
@@ -108,16 +189,15 @@ class GraphTransitionItem(QGraphicsPathItem):
             p_anchor.x() - label_rect.width() / 2, 
             p_anchor.y() - label_rect.height() - 10  # На 10 пикселей выше якоря
         )
-        
-        self.update_label_text()
-        self.refresh_style()
 
     def mouseDoubleClickEvent(self, event):
         current_action = self.logical_transition.action
         current_input = self.logical_transition.properties.get("input_data", "")
         current_type = self.logical_transition.properties.get("type", "Neutral")
 
-        dialog = TransitionPropertiesDialog(current_action, current_input, current_type)
+        current_weight = self.logical_transition.properties.get("weight")
+
+        dialog = TransitionPropertiesDialog(current_action, current_input, current_type, current_weight)
         
         if dialog.exec():
             new_action, new_input, now_type, now_delete = dialog.get_values()
@@ -139,12 +219,21 @@ class GraphTransitionItem(QGraphicsPathItem):
                 self.scene().removeItem(self)
                 return
 
-            # Обновление данных
+            # Обновление данных (пути не меняются - только тексты шагов)
+            if new_action != current_action or new_input != current_input:
+                self.scene().views()[0].window().graph_model.mark_text_changed()
             self.logical_transition.action = new_action
             self.logical_transition.properties["input_data"] = new_input
             self.logical_transition.properties["type"] = now_type
+            new_weight = dialog.get_weight()
+            if new_weight is None:
+                self.logical_transition.properties.pop("weight", None)
+            else:
+                self.logical_transition.properties["weight"] = new_weight
             
-            self.update_position()
+            self.update_label_text()
+            self.refresh_style()
+            self.update_position() # Размер подписи мог измениться
 
 class TransitionAnchor(QGraphicsRectItem):
     """Точка изгиба"""
@@ -154,10 +243,14 @@ class TransitionAnchor(QGraphicsRectItem):
         self.setBrush(QBrush(Qt.GlobalColor.white))
         self.setPen(QPen(QColor("#555555"), 1))
         self.setFlag(QGraphicsRectItem.GraphicsItemFlag.ItemIsMovable)
-        self.setFlag(QGraphicsRectItem.GraphicsItemFlag.ItemSendsScenePositionChanges)
+        self.setFlag(QGraphicsRectItem.GraphicsItemFlag.ItemSendsGeometryChanges)
 
         self.setZValue(10) 
 
+    def paint(self, painter, option, widget=None):
+        if is_detailed(painter):
+            super().paint(painter, option, widget)
+
     def mousePressEvent(self, event):
         """Срабатывает при нажатии на якорь"""
         # Очищаем выделение сцены, чтобы узлы не двигались вместе с якорем
@@ -171,6 +264,8 @@ class TransitionAnchor(QGraphicsRectItem):
         super().mousePressEvent(event)
 
     def itemChange(self, change, value):
-        if change == QGraphicsRectItem.GraphicsItemChange.ItemPositionChange:
-            self.parent_transition.update_position()
+        # Пересчет после фактического перемещения, не чаще раза за кадр
+        # (пока якорь не на сцене, стрелка сама посчитает геометрию при создании)
+        if change == QGraphicsRectItem.GraphicsItemChange.ItemPositionHasChanged and self.scene() is not None:
+            self.parent_transition.schedule_update()
         return super().itemChange(change, value)
\ No newline at end of file
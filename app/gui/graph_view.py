@@ -0,0 +1,119 @@
+from PyQt6.QtWidgets import QGraphicsView
+from PyQt6.QtGui import QPainter
+from PyQt6.QtCore import Qt, QRectF
+
+from .lod import DETAIL_LOD
+from ..utils.profiling import profiler
+
+
+class GraphView(QGraphicsView):
+    """
+    Холст редактора с навигацией для больших диаграмм:
+    Ctrl + колесо - масштаб относительно курсора, средняя кнопка мыши - панорама.
+    Область прокрутки растет вместе с содержимым сцены (с запасом MARGIN).
+    При мелком масштабе отключается сглаживание (см. также lod.DETAIL_LOD)
+    """
+    MIN_ZOOM = 0.02
+    MAX_ZOOM = 4.0
+    ZOOM_STEP = 1.25
+    MARGIN = 500
+    # Минимальная область, доступная на пустой сцене
+    MIN_RECT = QRectF(0, 0, 2000, 2000)
+
+    def __init__(self, scene, parent=None):
+        super().__init__(scene, parent)
+        self._pan_start = None
+
+        self.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+        self.setResizeAnchor(QGraphicsView.ViewportAnchor.AnchorViewCenter)
+        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.SmartViewportUpdate)
+        self.setCacheMode(QGraphicsView.CacheModeFlag.CacheBackground)
+        self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontSavePainterState)
+        self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontAdjustForAntialiasing)
+
+        # Сцена без явного sceneRect сама расширяется по мере добавления/перемещения элементов
+        scene.sceneRectChanged.connect(self.update_scene_rect)
+        self.update_scene_rect(scene.sceneRect())
+
+    @property
+    def zoom(self):
+        return self.transform().m11()
+
+    def update_scene_rect(self, rect):
+        """Область прокрутки: содержимое сцены плюс поля, но не меньше MIN_RECT"""
+        margin = self.MARGIN
+        self.setSceneRect(rect.adjusted(-margin, -margin, margin, margin).united(self.MIN_RECT))
+
+    def set_zoom(self, zoom):
+        zoom = max(self.MIN_ZOOM, min(self.MAX_ZOOM, zoom))
+        factor = zoom / self.zoom
+        if factor != 1:
+            self.scale(factor, factor)
+            self._update_render_hints()
+
+    def zoom_in(self):
+        self.set_zoom(self.zoom * self.ZOOM_STEP)
+
+    def zoom_out(self):
+        self.set_zoom(self.zoom / self.ZOOM_STEP)
+
+    def reset_zoom(self):
+        self.set_zoom(1.0)
+
+    def fit_all(self):
+        """Показать всю диаграмму целиком"""
+        rect = self.scene().itemsBoundingRect()
+        if rect.isEmpty():
+            return
+        self.fitInView(rect, Qt.AspectRatioMode.KeepAspectRatio)
+        # fitInView не знает об ограничениях масштаба
+        self.set_zoom(self.zoom)
+        self._update_render_hints()
+
+    def _update_render_hints(self):
+        # Сглаживание тысяч мелких фигур - основная цена отрисовки при отдалении
+        self.setRenderHint(QPainter.RenderHint.Antialiasing, self.zoom >= DETAIL_LOD)
+
+    def paintEvent(self, event):
+        if not profiler.enabled:
+            super().paintEvent(event)
+            return
+        # Время перерисовки холста (для строки профилирования и трассировки)
+        with profiler.span("scene.paint", zoom=round(self.zoom, 3)):
+            super().paintEvent(event)
+
+    def wheelEvent(self, event):
+        if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            steps = event.angleDelta().y() / 120
+            if steps:
+                self.set_zoom(self.zoom * self.ZOOM_STEP ** steps)
+            event.accept()
+            return
+        super().wheelEvent(event)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.MiddleButton:
+            self._pan_start = event.position()
+            self.viewport().setCursor(Qt.CursorShape.ClosedHandCursor)
+            event.accept()
+            return
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self._pan_start is not None:
+            delta = event.position() - self._pan_start
+            self._pan_start = event.position()
+            self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() - int(delta.x()))
+            self.verticalScrollBar().setValue(self.verticalScrollBar().value() - int(delta.y()))
+            event.accept()
+            return
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.MouseButton.MiddleButton and self._pan_start is not None:
+            self._pan_start = None
+            self.viewport().unsetCursor()
+            event.accept()
+            return
+        super().mouseReleaseEvent(event)
@@ -0,0 +1,28 @@
+from PyQt6.QtWidgets import QGraphicsTextItem, QGraphicsPolygonItem, QStyleOptionGraphicsItem
+
+# Ниже этого масштаба подписи, наконечники и якоря не рисуются,
+# а узлы рисуются простыми фигурами без обводки
+DETAIL_LOD = 0.4
+
+
+def level_of_detail(painter):
+    """Текущий масштаб отрисовки (1.0 - без увеличения)"""
+    return QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+
+
+def is_detailed(painter):
+    return level_of_detail(painter) >= DETAIL_LOD
+
+
+class LodTextItem(QGraphicsTextItem):
+    """Текст, который не рисуется при мелком масштабе (верстка при этом не выполняется)"""
+    def paint(self, painter, option, widget=None):
+        if is_detailed(painter):
+            super().paint(painter, option, widget)
+
+
+class LodPolygonItem(QGraphicsPolygonItem):
+    """Многоугольник (наконечник стрелки), скрываемый при мелком масштабе"""
+    def paint(self, painter, option, widget=None):
+        if is_detailed(painter):
+            super().paint(painter, option, widget)
@@ -1,20 +1,40 @@
-import json
-from PyQt6.QtWidgets import QMainWindow, QGraphicsView, QGraphicsScene, QToolBar, QMessageBox, QTextEdit, QDialog, QVBoxLayout, QStackedWidget, QFileDialog
+import copy
+
+from PyQt6.QtWidgets import QMainWindow, QGraphicsScene, QToolBar, QMessageBox, QTextEdit, QDialog, QVBoxLayout, QStackedWidget, QFileDialog, QComboBox, QLabel, QInputDialog, QProgressBar, QPushButton
 from PyQt6.QtGui import QAction, QBrush, QColor
 from PyQt6.QtCore import Qt
 
 from ..core.graph import Graph
-from .graph_node import GraphNodeItem
+from ..core import project_io
+from .graph_node import GraphNodeItem, STATE_UNREACHABLE, STATE_TRAP
 from .graph_transition import GraphTransitionItem
-from ..core.test_generator import TestGenerator
-from .results_view import ResultsView
+from .scene_loader import SceneLoader
+from .graph_view import GraphView
+from ..core.test_generator import TestGenerator, STRATEGIES, GenerationLimits, STRATEGY_ALL_PATHS, STRATEGY_ALL_TRANSITIONS
+from ..core.estimation import estimate_generation
+from ..core.path_cache import PathCache, default_cache_dir
+from ..core.minimization import MINIMIZE_NONE
+from ..core.exporters import available_exporters
+from .property_dialogs import GenerationSettingsDialog
+from .profiling_overlay import ProfilingOverlay
+from ..utils.profiling import profiler
+
+# Фильтр диалогов открытия/сохранения: JSON для обмена, .mbtp - компактный бинарный
+PROJECT_FILE_FILTER = "JSON Files (*.json);;MBT Binary (*.mbtp)"
 
 class MainWindow(QMainWindow):
     """
     Главное окно приложения. Здесь располагаются все эл. интерфейса
     """
+    # Порог числа путей, выше которого перед полным перебором выводится предупреждение
+    PATH_COUNT_THRESHOLD = 10000
+
     def __init__(self):
         super().__init__()
+        self.path_count_threshold = self.PATH_COUNT_THRESHOLD
+        self.generation_limits = GenerationLimits()
+        self.generation_workers = 1 # Число процессов для полного перебора
+        self.generation_minimize = MINIMIZE_NONE # Режим сокращения набора тестов
 
         # Хранилище данных
         self.graph_model = Graph()
@@ -27,30 +47,50 @@ class MainWindow(QMainWindow):
         self.central_stack = QStackedWidget()
         self.setCentralWidget(self.central_stack)
 
-        # Создание холста для рисования
+        # Создание холста для рисования (размер растет вместе с содержимым)
         self.scene = QGraphicsScene()
-        self.scene.setSceneRect(0, 0, 2000, 2000)
 
-        # Создание "камеры", которая смотрит на холст
-        self.view = QGraphicsView(self.scene, self)
-        self.view.setRenderHint(self.view.renderHints().Antialiasing) # Сглаживание
+        # Создание "камеры", которая смотрит на холст: масштаб, панорама, упрощенная отрисовка при отдалении
+        self.view = GraphView(self.scene, self)
+
+        # Пакетное заполнение сцены при открытии проекта
+        self.scene_loader = SceneLoader(self.scene, self.view, self.create_node_item)
 
-        # Страница результатов
-        self.results_page = ResultsView()
+        # Страница результатов создается при первом обращении (см. results_page)
+        self._results_page = None
 
         # Добавляем страницы в стек
         self.central_stack.addWidget(self.view)         # Индекс 0
-        self.central_stack.addWidget(self.results_page)  # Индекс 1
 
         # Списки для управления видимостью кнопок тулбара
         self.editor_actions = []
 
         self.first_node_for_link = None 
 
+        # Фоновая генерация
+        self.generation_worker = None
+        self.generation_thread = None
+        self.generation_strategy = None
+        self.generation_analysis = None # ModelAnalysis модели на момент запуска генерации
+        # Результат прошлой генерации: из него берутся пути, не затронутые правками модели
+        self.last_generation = None
+        # Кэш путей по структуре графа (в памяти и на диске)
+        self.path_cache = PathCache(default_cache_dir())
+
         self._create_menus()
         self._create_toolbar()
+        self._create_status_bar()
         self.show_editor()
 
+    @property
+    def results_page(self):
+        """Страница результатов; строится лениво, чтобы не замедлять запуск редактора"""
+        if self._results_page is None:
+            from .results_view import ResultsView
+            self._results_page = ResultsView()
+            self.central_stack.addWidget(self._results_page)  # Индекс 1
+        return self._results_page
+
     def show_editor(self):
         """Переключить на редактор графов"""
         self.central_stack.setCurrentIndex(0)
@@ -59,12 +99,12 @@ class MainWindow(QMainWindow):
 
     def show_results(self):
         """Переключить на страницу с таблицей"""
-        self.central_stack.setCurrentIndex(1)
+        self.central_stack.setCurrentWidget(self.results_page)
         # Скрываем кнопки редактора
         self.toolbar.hide()
 
     def _create_menus(self):
-        """Создание верхнего меню (Файл, Результаты)"""
+        """Создание верхнего меню (Файл, Вид, Результаты)"""
         menu_bar = self.menuBar()
 
         file_menu = menu_bar.addMenu("Файл")
@@ -87,6 +127,35 @@ class MainWindow(QMainWindow):
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
 
+        view_menu = menu_bar.addMenu("Вид")
+
+        zoom_in_act = QAction("Увеличить", self)
+        zoom_in_act.setShortcut("Ctrl+=")
+        zoom_in_act.triggered.connect(self.view.zoom_in)
+        view_menu.addAction(zoom_in_act)
+
+        zoom_out_act = QAction("Уменьшить", self)
+        zoom_out_act.setShortcut("Ctrl+-")
+        zoom_out_act.triggered.connect(self.view.zoom_out)
+        view_menu.addAction(zoom_out_act)
+
+        reset_zoom_act = QAction("Исходный масштаб", self)
+        reset_zoom_act.setShortcut("Ctrl+0")
+        reset_zoom_act.triggered.connect(self.view.reset_zoom)
+        view_menu.addAction(reset_zoom_act)
+
+        fit_act = QAction("Показать всю диаграмму", self)
+        fit_act.setShortcut("Ctrl+F")
+        fit_act.triggered.connect(self.view.fit_all)
+        view_menu.addAction(fit_act)
+
+        view_menu.addSeparator()
+
+        analyze_act = QAction("Проверить модель", self)
+        analyze_act.setShortcut("Ctrl+Shift+A")
+        analyze_act.triggered.connect(self.analyze_model)
+        view_menu.addAction(analyze_act)
+
         results_menu = menu_bar.addMenu("Результаты")
         
         view_results_act = QAction("Посмотреть таблицу", self)
@@ -97,22 +166,57 @@ class MainWindow(QMainWindow):
         view_editor_act.triggered.connect(self.show_editor)
         results_menu.addAction(view_editor_act)
 
+        limits_act = QAction("Параметры генерации...", self)
+        limits_act.triggered.connect(self.edit_generation_limits)
+        results_menu.addAction(limits_act)
+
+        threshold_act = QAction("Порог предупреждения о числе путей...", self)
+        threshold_act.triggered.connect(self.set_path_count_threshold)
+        results_menu.addAction(threshold_act)
+
         results_menu.addSeparator()
 
         export_act = QAction("Экспортировать в Excel", self)
-        export_act.triggered.connect(self.results_page.export_to_excel)
+        export_act.triggered.connect(lambda: self.results_page.export_to_excel())
         results_menu.addAction(export_act)
 
+        # Остальные форматы из реестра экспортеров
+        export_menu = results_menu.addMenu("Экспортировать в...")
+        for exporter in available_exporters():
+            act = QAction(exporter.title, self)
+            act.triggered.connect(lambda checked=False, key=exporter.key: self.results_page.export_as(key))
+            export_menu.addAction(act)
+
+        profiling_menu = menu_bar.addMenu("Профилирование")
+
+        self.profiling_act = QAction("Собирать замеры", self)
+        self.profiling_act.setCheckable(True)
+        self.profiling_act.setChecked(profiler.enabled)
+        self.profiling_act.toggled.connect(self.set_profiling_enabled)
+        profiling_menu.addAction(self.profiling_act)
+
+        trace_act = QAction("Сохранить трассировку (JSON)...", self)
+        trace_act.triggered.connect(self.save_profiling_trace)
+        profiling_menu.addAction(trace_act)
+
+        capture_act = QAction("Записать следующую генерацию в cProfile...", self)
+        capture_act.triggered.connect(self.capture_next_generation)
+        profiling_menu.addAction(capture_act)
+
+        reset_act = QAction("Сбросить замеры", self)
+        reset_act.triggered.connect(profiler.reset)
+        profiling_menu.addAction(reset_act)
+
     def _create_toolbar(self):
         """Панель инструментов для быстрого доступа"""
         self.toolbar = QToolBar("Панель инструментов")
         self.addToolBar(self.toolbar)
         
         # Кнопка добавления состояния
-        add_state_action = QAction("Добавить состояние", self)
-        add_state_action.triggered.connect(self.add_state_node)
-        self.toolbar.addAction(add_state_action)
-        self.editor_actions.append(add_state_action)
+        self.add_state_action = QAction("Добавить состояние", self)
+        self.add_state_action.triggered.connect(self.add_state_node)
+        self.toolbar.addAction(self.add_state_action)
+        self.editor_actions.append(self.add_state_action)
 
         # Кнопка для соединения
         self.link_action = QAction("Соединить", self)
@@ -120,32 +224,77 @@ class MainWindow(QMainWindow):
         self.toolbar.addAction(self.link_action)
         self.editor_actions.append(self.link_action)
 
+        # Выбор стратегии генерации
+        self.toolbar.addSeparator()
+        self.toolbar.addWidget(QLabel(" Стратегия: "))
+        self.strategy_combo = QComboBox()
+        for key, title in STRATEGIES.items():
+            self.strategy_combo.addItem(title, key)
+        self.toolbar.addWidget(self.strategy_combo)
+
         # Кнопка для генерации тестов
-        gen_action = QAction("Генерировать тесты", self)
-        gen_action.triggered.connect(self.run_generation)
-        self.toolbar.addAction(gen_action)
-        self.editor_actions.append(gen_action)
+        self.gen_action = QAction("Генерировать тесты", self)
+        self.gen_action.triggered.connect(self.run_generation)
+        self.toolbar.addAction(self.gen_action)
+        self.editor_actions.append(self.gen_action)
+
+    def _create_status_bar(self):
+        """Строка состояния с прогрессом фоновой генерации и кнопкой отмены"""
+        status = self.statusBar()
+
+        # Последние замеры профилирования (видна, только пока оно включено)
+        self.profiling_overlay = ProfilingOverlay()
+        status.addPermanentWidget(self.profiling_overlay)
+
+        self.progress_label = QLabel()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0) # Бегущий индикатор: итоговое число путей заранее неизвестно
+        self.progress_bar.setMaximumWidth(150)
+        self.cancel_button = QPushButton("Отмена")
+        self.cancel_button.clicked.connect(self.cancel_generation)
+
+        status.addPermanentWidget(self.progress_label)
+        status.addPermanentWidget(self.progress_bar)
+        status.addPermanentWidget(self.cancel_button)
+        self._set_generation_running(False)
+
+    def _set_generation_running(self, running):
+        """Переключает интерфейс между режимом генерации и режимом редактирования"""
+        self.progress_bar.setVisible(running)
+        self.cancel_button.setVisible(running)
+        self.cancel_button.setEnabled(running)
+        self.gen_action.setEnabled(not running)
+        # Пока генератор читает модель, редактировать граф нельзя
+        self.view.setInteractive(not running)
+        self.add_state_action.setEnabled(not running)
+        self.link_action.setEnabled(not running)
 
     def add_state_node(self):
         """Метод-обработчик для добавления нового узла-состояния"""
+        if self.is_generation_running():
+            return
         # Создаем узел в логической модели
         logical_node = self.graph_model.add_node("Новое состояние")
         
-        # Создаем визуальное представление для этого узла
-        visual_node = GraphNodeItem(logical_node)
-
-        if len(self.graph_model.nodes) == 1:
+        if self.graph_model.node_count == 1:
             logical_node.properties["is_initial"] = True
-            visual_node.refresh_color()
 
-        visual_node.mousePressEvent = lambda event: self.handle_node_click(visual_node, event)
+        # Создаем визуальное представление для этого узла
+        visual_node = self.create_node_item(logical_node)
         
         # Добавляем визуальный узел на сцену
         scene_center = self.view.mapToScene(self.view.viewport().rect().center())
         visual_node.setPos(scene_center.x() - 50, scene_center.y() - 50)
         self.scene.addItem(visual_node)
         
-        print(f"Добавлен узел: {logical_node}. Всего узлов в модели: {len(self.graph_model.nodes)}")
+        print(f"Добавлен узел: {logical_node}. Всего узлов в модели: {self.graph_model.node_count}")
+
+    def create_node_item(self, logical_node):
+        """Создает визуальный узел для логического и подключает обработку кликов"""
+        visual_node = GraphNodeItem(logical_node)
+        visual_node.refresh_color()
+        visual_node.mousePressEvent = lambda event, item=visual_node: self.handle_node_click(item, event)
+        return visual_node
 
     def handle_node_click(self, node_item, event):
         """Логика клика по узлу (для перемещения или для создания связи)"""
@@ -171,7 +320,9 @@ class MainWindow(QMainWindow):
 
     def create_link(self, source, target):
         """Создает связь или удаляет существующую"""
-        # Проверяем, существует ли уже такая связь в логике
+        if self.is_generation_running():
+            return
+        # Проверяем, существует ли уже такая связь в логике (через индекс исходящих переходов)
         existing_logic_trans = self.graph_model.find_transition(source.logical_node, target.logical_node)
 
         if existing_logic_trans:
@@ -199,6 +350,31 @@ class MainWindow(QMainWindow):
             target.transitions.append(visual_trans)
             print(f"Связь создана: {source.logical_node.name} -> {target.logical_node.name}")
 
+    def analyze_model(self):
+        """Подсвечивает недостижимые состояния и ловушки, итог - в строке состояния"""
+        generator = TestGenerator(self.graph_model)
+        if not generator.find_start_node():
+            QMessageBox.warning(self, "Ошибка", "Не найден начальный узел! Откройте свойства узла и поставьте галочку 'Начальное состояние'.")
+            return
+        analysis = generator.analysis
+        self.highlight_analysis(analysis)
+        if analysis.has_problems:
+            self.statusBar().showMessage(f"Проверка модели: {analysis.summary()}", 10000)
+        else:
+            self.statusBar().showMessage("Проверка модели: проблем не найдено", 5000)
+
+    def highlight_analysis(self, analysis):
+        """Раскрашивает узлы на сцене по результату анализа модели"""
+        for item in self.scene.items():
+            if isinstance(item, GraphNodeItem):
+                node_id = item.logical_node.id
+                if node_id in analysis.unreachable:
+                    item.set_analysis_state(STATE_UNREACHABLE)
+                elif node_id in analysis.traps:
+                    item.set_analysis_state(STATE_TRAP)
+                else:
+                    item.set_analysis_state(None)
+
     def run_generation(self):
         generator = TestGenerator(self.graph_model)
         
@@ -207,16 +383,179 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Ошибка", "Не найден начальный узел! Откройте свойства узла и поставьте галочку 'Начальное состояние'.")
             return
 
-        # Генерируем пути
-        paths = generator.generate_all_paths()
-        test_cases = generator.format_test_cases(paths)
+        # Недостижимые состояния тестами не покрываются, а ловушки перебор не обходит - показываем их
+        self.highlight_analysis(generator.analysis)
+
+        strategy = self.strategy_combo.currentData()
+        limits = self.generation_limits
+        if strategy == STRATEGY_ALL_PATHS:
+            choice = self.confirm_path_count(generator.find_start_node())
+            if choice is None:
+                return
+            strategy, limits = choice
+
+        from .workers import GenerationWorker, start_worker
+
+        # Генерация идет в фоновом потоке, таблица заполняется пачками
+        self.results_page.begin_tests()
+        self.generation_strategy = strategy
+        self.generation_analysis = generator.analysis
+        self.generation_worker = GenerationWorker(
+            self.graph_model, strategy, limits, self.generation_workers,
+            previous=self.last_generation, changes=self.graph_model.take_changes(),
+            cache=self.path_cache, minimize=self.generation_minimize
+        )
+        self.last_generation = None
+        self.generation_worker.batch_ready.connect(self.results_page.append_tests)
+        self.generation_worker.progress.connect(self.on_generation_progress)
+        self.generation_worker.finished.connect(self.on_generation_finished)
+        self.generation_worker.failed.connect(self.on_generation_failed)
+
+        self._set_generation_running(True)
+        self.progress_label.setText("Генерация...")
+        self.generation_thread = start_worker(self.generation_worker, self)
 
-        # Заполняем таблицу данными
-        self.results_page.display_tests(test_cases)
-        
         # Переключаем экран
         self.show_results()
 
+    def cancel_generation(self):
+        """Кооперативная остановка фоновой генерации"""
+        if self.generation_worker is not None:
+            self.generation_worker.cancel()
+            self.cancel_button.setEnabled(False)
+            self.progress_label.setText("Остановка...")
+
+    def on_generation_progress(self, paths_found, nodes_expanded):
+        self.progress_label.setText(f"Найдено путей: {paths_found:,}  Раскрыто узлов: {nodes_expanded:,}")
+
+    def on_generation_finished(self, result):
+        report = result.truncation
+        self.results_page.show_summary(STRATEGIES[self.generation_strategy], result.coverage, report)
+        if not report.cancelled:
+            self.last_generation = result
+        minimization = self.generation_worker.minimization
+        if minimization is not None and minimization.removed:
+            self.statusBar().showMessage(
+                f"Набор сокращен: {minimization.before:,} -> {minimization.after:,} ({minimization.summary()})", 10000
+            )
+        elif report.reused_paths:
+            self.statusBar().showMessage(f"Переиспользовано путей (кэш или прошлая генерация): {report.reused_paths:,}", 5000)
+        elif self.generation_analysis is not None and self.generation_analysis.has_problems:
+            self.statusBar().showMessage(f"Проверка модели: {self.generation_analysis.summary()}", 10000)
+        self._finish_generation()
+
+    def on_generation_failed(self, message):
+        self._finish_generation()
+        QMessageBox.critical(self, "Ошибка", f"Не удалось сгенерировать тесты:\n{message}")
+
+    def _finish_generation(self):
+        self.generation_worker = None
+        self.generation_thread = None
+        self._set_generation_running(False)
+
+    def is_generation_running(self, warn=True):
+        """True, если идет фоновая генерация (модель в это время менять нельзя)"""
+        if self.generation_worker is None:
+            return False
+        if warn:
+            QMessageBox.warning(self, "Генерация", "Дождитесь окончания генерации или отмените ее.")
+        return True
+
+    def closeEvent(self, event):
+        """Перед закрытием останавливаем фоновую генерацию"""
+        if self.generation_worker is not None:
+            self.generation_worker.cancel()
+            self.generation_thread.quit()
+            self.generation_thread.wait()
+        super().closeEvent(event)
+
+    def confirm_path_count(self, start_node):
+        """
+        Оценивает объем полного перебора до запуска.
+        Возвращает (стратегия, ограничения) для этого запуска или None при отмене.
+        Ограничение "первые N путей" действует только на этот запуск, настройки не меняются
+        """
+        limits = self.generation_limits
+        max_paths = limits.max_paths
+        if max_paths is not None and max_paths <= self.path_count_threshold:
+            return STRATEGY_ALL_PATHS, limits
+
+        estimate = estimate_generation(self.graph_model, start_node, STRATEGY_ALL_PATHS)
+        if estimate.paths <= self.path_count_threshold:
+            return STRATEGY_ALL_PATHS, limits
+
+        prefix = "" if estimate.exact else "≈ "
+        paths_text = f"{estimate.paths:,}" if estimate.paths < 10 ** 12 else f"{float(estimate.paths):.2e}"
+        box = QMessageBox(self)
+        box.setIcon(QMessageBox.Icon.Warning)
+        box.setWindowTitle("Слишком много путей")
+        box.setText(
+            f"Полный перебор даст {prefix}{paths_text} путей.\n"
+            f"Ожидаемое время: {prefix}{estimate.seconds:,.0f} сек, "
+            f"память: {prefix}{estimate.memory_bytes / 2 ** 20:,.0f} МБ.\n"
+            "Оценка без учета ограничений длины пути и проходов по циклу.\n\n"
+            "Сгенерировать набор, покрывающий все переходы, или ограничить перебор?"
+        )
+        coverage_btn = box.addButton("Покрыть переходы", QMessageBox.ButtonRole.AcceptRole)
+        bounded_btn = box.addButton(f"Первые {self.path_count_threshold:,} путей", QMessageBox.ButtonRole.AcceptRole)
+        continue_btn = box.addButton("Все пути", QMessageBox.ButtonRole.DestructiveRole)
+        box.addButton(QMessageBox.StandardButton.Cancel)
+        box.exec()
+
+        if box.clickedButton() == coverage_btn:
+            self.strategy_combo.setCurrentIndex(self.strategy_combo.findData(STRATEGY_ALL_TRANSITIONS))
+            return STRATEGY_ALL_TRANSITIONS, limits
+        if box.clickedButton() == bounded_btn:
+            bounded = copy.copy(limits)
+            bounded.max_paths = self.path_count_threshold
+            return STRATEGY_ALL_PATHS, bounded
+        if box.clickedButton() == continue_btn:
+            return STRATEGY_ALL_PATHS, limits
+        return None
+
+    def edit_generation_limits(self):
+        """Диалог ограничений генерации (глубина, число путей, циклы, время)"""
+        dialog = GenerationSettingsDialog(
+            self.generation_limits, self.generation_workers, self.generation_minimize, self
+        )
+        if dialog.exec():
+            self.generation_limits = dialog.get_limits()
+            self.generation_workers = dialog.get_workers()
+            self.generation_minimize = dialog.get_minimize()
+
+    def set_path_count_threshold(self):
+        """Настройка порога предупреждения о числе путей"""
+        value, ok = QInputDialog.getInt(
+            self, "Порог предупреждения", "Предупреждать, если путей больше:",
+            self.path_count_threshold, 1, 2 ** 31 - 1
+        )
+        if ok:
+            self.path_count_threshold = value
+
+    def set_profiling_enabled(self, enabled):
+        profiler.enabled = enabled
+        self.profiling_overlay.set_active(enabled)
+
+    def save_profiling_trace(self):
+        """Сохраняет накопленные замеры в JSON (формат Trace Event: chrome://tracing, Perfetto)"""
+        file_path, _ = QFileDialog.getSaveFileName(self, "Сохранить трассировку", "mbt-trace.json", "JSON Files (*.json)")
+        if not file_path:
+            return
+        try:
+            profiler.dump(file_path)
+        except OSError as e:
+            QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить трассировку:\n{e}")
+            return
+        self.statusBar().showMessage(f"Трассировка сохранена: {file_path}", 5000)
+
+    def capture_next_generation(self):
+        """Следующая генерация целиком записывается профайлером cProfile в файл .prof"""
+        file_path, _ = QFileDialog.getSaveFileName(self, "Файл cProfile", "generation.prof", "cProfile (*.prof)")
+        if not file_path:
+            return
+        profiler.capture_next("generation", file_path)
+        self.statusBar().showMessage("Следующая генерация будет записана в cProfile", 5000)
+
     def show_results_popup(self, text):
         dialog = QDialog(self)
         dialog.setWindowTitle("Сгенерированные тесты")
@@ -231,108 +570,71 @@ class MainWindow(QMainWindow):
         dialog.exec()
 
     def save_project(self):
-        """Превращает весь граф в JSON и сохраняет в файл"""
-        file_path, _ = QFileDialog.getSaveFileName(self, "Сохранить проект", "", "JSON Files (*.json)")
+        """Сохраняет граф в файл: JSON или компактный бинарный формат (по выбранному фильтру)"""
+        file_path, _ = QFileDialog.getSaveFileName(self, "Сохранить проект", "", PROJECT_FILE_FILTER)
         if not file_path:
             return
 
-        project_data = {
-            "nodes": [],
-            "transitions": []
-        }
+        # Элементы, которые еще не успели появиться на сцене, нужны для раскладки
+        self.scene_loader.finish()
+        project_io.save_project(self.graph_model, self.collect_layout(), file_path)
+        
+        QMessageBox.information(self, "Успех", "Проект успешно сохранен!")
 
-        # Собираем данные об узлах
+    def collect_layout(self):
+        """Собирает координаты узлов и точек изгиба со сцены"""
+        layout = project_io.ProjectLayout()
         for item in self.scene.items():
             if isinstance(item, GraphNodeItem):
-                node_data = {
-                    "id": item.logical_node.id,
-                    "name": item.logical_node.name,
-                    "x": item.scenePos().x(),
-                    "y": item.scenePos().y(),
-                    "properties": item.logical_node.properties
-                }
-                project_data["nodes"].append(node_data)
-
-        # Собираем данные о переходах
-        for item in self.scene.items():
-            if isinstance(item, GraphTransitionItem):
-                trans_data = {
-                    "source_id": item.source_item.logical_node.id,
-                    "target_id": item.target_item.logical_node.id,
-                    "action": item.logical_transition.action,
-                    "anchor_x": item.anchor.scenePos().x(),
-                    "anchor_y": item.anchor.scenePos().y(),
-                    "properties": item.logical_transition.properties
-                }
-                project_data["transitions"].append(trans_data)
-
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(project_data, f, ensure_ascii=False, indent=4)
-        
-        QMessageBox.information(self, "Успех", "Проект успешно сохранен!")
+                layout.nodes[item.logical_node.id] = (item.scenePos().x(), item.scenePos().y())
+            elif isinstance(item, GraphTransitionItem):
+                layout.anchors[item.logical_transition.id] = (item.anchor.scenePos().x(), item.anchor.scenePos().y())
+        return layout
 
     def load_project(self):
-        """Загружает проект из JSON-файла"""
-        file_path, _ = QFileDialog.getOpenFileName(self, "Открыть проект", "", "JSON Files (*.json)")
+        """Загружает проект из JSON- или бинарного файла"""
+        if self.is_generation_running():
+            return
+
+        file_path, _ = QFileDialog.getOpenFileName(self, "Открыть проект", "", PROJECT_FILE_FILTER)
         if not file_path:
             return
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            graph, layout = project_io.load_project(file_path)
 
-            # Очищаем текущий проект
+            # Очищаем текущий проект и подменяем модель загруженной
+            self.scene_loader.cancel()
             self.scene.clear()
-            self.graph_model.clear()
-            
-            # Словарь для быстрого поиска созданных визуальных узлов по их ID
-            id_to_visual_node = {}
-
-            # Восстанавливаем узлы
-            for n_data in data["nodes"]:
-                logical_node = self.graph_model.add_node(n_data["name"])
-                logical_node.id = n_data["id"] # Восстанавливаем оригинальный ID
-                logical_node.properties = n_data["properties"]
-                
-                visual_node = GraphNodeItem(logical_node)
-                visual_node.setPos(n_data["x"], n_data["y"])
-                visual_node.mousePressEvent = lambda event, item=visual_node: self.handle_node_click(item, event)
-                
-                self.scene.addItem(visual_node)
-                visual_node.refresh_color()
-                id_to_visual_node[logical_node.id] = visual_node
-
-            # Восстанавливаем переходы
-            for t_data in data["transitions"]:
-                source_item = id_to_visual_node.get(t_data["source_id"])
-                target_item = id_to_visual_node.get(t_data["target_id"])
-                
-                if source_item and target_item:
-                    # Создаем логический переход
-                    logical_trans = self.graph_model.add_transition(
-                        source_item.logical_node, 
-                        target_item.logical_node, 
-                        t_data["action"]
-                    )
-                    logical_trans.properties = t_data["properties"]
-                    
-                    # Создаем визуальный переход
-                    visual_trans = GraphTransitionItem(source_item, target_item, logical_trans)
-                    self.scene.addItem(visual_trans)
-                    
-                    # Восстанавливаем положение якоря (точки изгиба)
-                    visual_trans.anchor.setPos(t_data["anchor_x"], t_data["anchor_y"])
-                    
-                    # Регистрируем стрелку в узлах
-                    source_item.transitions.append(visual_trans)
-                    target_item.transitions.append(visual_trans)
+            self.first_node_for_link = None
+            self.graph_model = graph
+            self.last_generation = None
+            self.populate_scene(layout)
 
             QMessageBox.information(self, "Успех", "Проект успешно загружен!")
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить файл:\n{str(e)}")
 
+    def populate_scene(self, layout):
+        """
+        Создает визуальные элементы для всех узлов и переходов текущей модели.
+        Видимая область строится сразу, остальное - пачками в фоне (см. SceneLoader)
+        """
+        self.scene_loader.start(
+            self.graph_model, layout,
+            on_progress=self.on_scene_load_progress,
+            on_finished=lambda: self.statusBar().showMessage("Проект загружен", 3000)
+        )
+
+    def on_scene_load_progress(self, created, total):
+        if created < total:
+            self.statusBar().showMessage(f"Загрузка сцены: {created} из {total} элементов")
+
     def clear_editor(self):
         """Полностью очищает редактор после подтверждения пользователем"""
+        if self.is_generation_running():
+            return
+
         # Создаем окно вопроса
         reply = QMessageBox.question(
             self, 
@@ -344,9 +646,11 @@ class MainWindow(QMainWindow):
 
         if reply == QMessageBox.StandardButton.Yes:
             # Очищаем визуальную часть (сцену)
+            self.scene_loader.cancel()
             self.scene.clear()
             # Очищаем логическую часть (модель графа)
             self.graph_model.clear()
+            self.last_generation = None
             # Сбрасываем вспомогательные переменные
             self.first_node_for_link = None
             
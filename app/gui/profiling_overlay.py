@@ -0,0 +1,71 @@
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtCore import QTimer
+
+from ..utils.profiling import profiler
+
+
+def _format_rate(value, unit):
+    if value >= 1024 * 1024 and unit == "Б":
+        return f"{value / (1024 * 1024):.1f} МБ/с"
+    if value >= 1024 and unit == "Б":
+        return f"{value / 1024:.0f} КБ/с"
+    return f"{value:,.0f} {unit}/с"
+
+
+class ProfilingOverlay(QLabel):
+    """
+    Строка состояния с последними замерами профилирования: генерация, отрисовка холста,
+    заполнение таблицы, сохранение/загрузка и экспорт.
+    Данные берутся из profiler по таймеру, поэтому фоновым потокам не нужны сигналы
+    """
+    REFRESH_MS = 500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setStyleSheet("color: #555; font-family: monospace;")
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+        self.set_active(profiler.enabled)
+
+    def set_active(self, active):
+        self.setVisible(active)
+        if active:
+            self._timer.start()
+            self.refresh()
+        else:
+            self._timer.stop()
+
+    def refresh(self):
+        parts = []
+
+        generation = profiler.last_event("generation")
+        if generation is not None:
+            info = generation["info"]
+            text = f"Генерация {generation['duration']:.2f} с"
+            enumerate_event = profiler.last_event("generation.enumerate")
+            if enumerate_event is not None:
+                text += f" (перебор {enumerate_event['duration']:.2f} с)"
+            text += (f", путей {info.get('paths', 0):,}, узлов {info.get('nodes_expanded', 0):,},"
+                     f" глубина {info.get('max_stack_depth', 0)}")
+            parts.append(text)
+
+        paint = profiler.stat("scene.paint")
+        last_paint = profiler.last_event("scene.paint")
+        if paint and last_paint is not None:
+            parts.append(f"Кадр {1000 * last_paint['duration']:.1f} мс (макс. {1000 * paint['max']:.1f})")
+
+        table = profiler.last_event("results.display_tests") or profiler.last_event("results.append_tests")
+        if table is not None:
+            parts.append(f"Таблица {1000 * table['duration']:.1f} мс")
+
+        for name, title in (("project.load", "Загрузка"), ("project.save", "Сохранение")):
+            event = profiler.last_event(name)
+            if event is not None and "bytes_per_sec" in event["info"]:
+                parts.append(f"{title} {event['duration']:.2f} с, {_format_rate(event['info']['bytes_per_sec'], 'Б')}")
+
+        export = profiler.last_event("export")
+        if export is not None and "rows_per_sec" in export["info"]:
+            parts.append(f"Экспорт {_format_rate(export['info']['rows_per_sec'], 'строк')}")
+
+        self.setText("  |  ".join(parts) if parts else "Профилирование включено")
@@ -1,4 +1,10 @@
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QFormLayout, QLineEdit, QDialogButtonBox, QTextEdit, QCheckBox, QPushButton, QHBoxLayout, QComboBox
+import os
+
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QFormLayout, QLineEdit, QDialogButtonBox, QTextEdit, QCheckBox, QPushButton, QHBoxLayout, QComboBox, QSpinBox, QDoubleSpinBox
+
+from ..core.test_generator import GenerationLimits
+from ..core.minimization import MINIMIZE_MODES, MINIMIZE_NONE
+from ..core.sampling import WEIGHTINGS
 
 class NodePropertiesDialog(QDialog):
     def __init__(self, name, expected_result, is_initial, parent=None):
@@ -53,7 +59,7 @@ class NodePropertiesDialog(QDialog):
 
 
 class TransitionPropertiesDialog(QDialog):
-    def __init__(self, action, input_data, trans_type="Neutral", parent=None):
+    def __init__(self, action, input_data, trans_type="Neutral", weight=None, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Свойства перехода")
         self.delete_requested = False
@@ -75,9 +81,16 @@ class TransitionPropertiesDialog(QDialog):
         self.type_combo.addItems(["Neutral", "Success", "Error"])
         self.type_combo.setCurrentText(trans_type)
 
+        # Вес для случайных блужданий (0 - вес по типу перехода)
+        self.weight_spin = QDoubleSpinBox()
+        self.weight_spin.setRange(0, 1000000)
+        self.weight_spin.setSpecialValueText("по типу")
+        self.weight_spin.setValue(weight or 0)
+
         form.addRow("Действие (Action):", self.action_edit)
         form.addRow("Входные данные (Input):", self.input_edit)
         form.addRow("Тип перехода:", self.type_combo)
+        form.addRow("Вес перехода:", self.weight_spin)
 
         layout.addLayout(form)
 
@@ -99,4 +112,87 @@ class TransitionPropertiesDialog(QDialog):
         self.accept()
 
     def get_values(self):
-        return self.action_edit.text(), self.input_edit.toPlainText(), self.type_combo.currentText(), self.delete_requested
\ No newline at end of file
+        return self.action_edit.text(), self.input_edit.toPlainText(), self.type_combo.currentText(), self.delete_requested
+
+    def get_weight(self):
+        """Вес перехода или None, если вес берется по типу"""
+        return self.weight_spin.value() or None
+
+
+class GenerationSettingsDialog(QDialog):
+    """
+    Ограничения полного перебора путей. 0 в поле означает отсутствие ограничения.
+    Для случайных блужданий число путей - число блужданий, длина пути - их длина
+    """
+    def __init__(self, limits, workers=1, minimize=MINIMIZE_NONE, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Параметры генерации")
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+
+        self.depth_spin = QSpinBox()
+        self.depth_spin.setRange(0, 1000000)
+        self.depth_spin.setValue(limits.max_depth or 0)
+
+        self.paths_spin = QSpinBox()
+        self.paths_spin.setRange(0, 2 ** 31 - 1)
+        self.paths_spin.setValue(limits.max_paths or 0)
+
+        self.loop_spin = QSpinBox()
+        self.loop_spin.setRange(1, 100)
+        self.loop_spin.setValue(limits.loop_unroll)
+
+        self.time_spin = QDoubleSpinBox()
+        self.time_spin.setRange(0, 86400)
+        self.time_spin.setSuffix(" сек")
+        self.time_spin.setValue(limits.time_budget or 0)
+
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, os.cpu_count() or 1)
+        self.workers_spin.setValue(workers)
+
+        self.minimize_combo = QComboBox()
+        for key, title in MINIMIZE_MODES.items():
+            self.minimize_combo.addItem(title, key)
+        self.minimize_combo.setCurrentIndex(self.minimize_combo.findData(minimize))
+
+        self.seed_spin = QSpinBox()
+        self.seed_spin.setRange(0, 2 ** 31 - 1)
+        self.seed_spin.setValue(limits.seed)
+
+        self.weighting_combo = QComboBox()
+        for key, title in WEIGHTINGS.items():
+            self.weighting_combo.addItem(title, key)
+        self.weighting_combo.setCurrentIndex(self.weighting_combo.findData(limits.weighting))
+
+        form.addRow("Макс. длина пути:", self.depth_spin)
+        form.addRow("Макс. число путей:", self.paths_spin)
+        form.addRow("Проходов по циклу:", self.loop_spin)
+        form.addRow("Бюджет времени:", self.time_spin)
+        form.addRow("Процессов для перебора:", self.workers_spin)
+        form.addRow("Сокращение набора:", self.minimize_combo)
+        form.addRow("Зерно блужданий:", self.seed_spin)
+        form.addRow("Веса блужданий:", self.weighting_combo)
+        layout.addLayout(form)
+
+        self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        self.button_box.accepted.connect(self.accept)
+        self.button_box.rejected.connect(self.reject)
+        layout.addWidget(self.button_box)
+
+    def get_limits(self):
+        return GenerationLimits(
+            max_depth=self.depth_spin.value() or None,
+            max_paths=self.paths_spin.value() or None,
+            loop_unroll=self.loop_spin.value(),
+            time_budget=self.time_spin.value() or None,
+            seed=self.seed_spin.value(),
+            weighting=self.weighting_combo.currentData()
+        )
+
+    def get_workers(self):
+        return self.workers_spin.value()
+
+    def get_minimize(self):
+        return self.minimize_combo.currentData()
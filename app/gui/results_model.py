@@ -0,0 +1,117 @@
+from array import array
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+HEADERS = [
+    "ID Теста", "Шаг", "Из состояния", "В состояние", "Действие (Action)", "Ожидаемый результат"
+]
+
+
+class TestStepStore:
+    """
+    Компактное колоночное хранилище шагов тестов.
+    Числа лежат в массивах array, строки - в общем пуле без повторов,
+    а в колонках хранятся только индексы строк в пуле.
+    """
+    STRING_COLUMNS = ("from_node", "to_node", "action", "input", "expected")
+
+    def __init__(self):
+        self.test_ids = array("I") # ID теста для каждой строки
+        self.step_numbers = array("I") # Номер шага внутри теста
+        self.columns = {name: array("I") for name in self.STRING_COLUMNS}
+        self.test_count = 0
+
+        self._strings = []
+        self._string_index = {}
+
+    def __len__(self):
+        return len(self.test_ids)
+
+    def _intern(self, text):
+        text = str(text)
+        index = self._string_index.get(text)
+        if index is None:
+            index = len(self._strings)
+            self._strings.append(text)
+            self._string_index[text] = index
+        return index
+
+    def append_test(self, test):
+        """Добавляет тест-кейс в формате TestGenerator.format_test_cases"""
+        self.test_count += 1
+        for i, step in enumerate(test["steps"]):
+            self.test_ids.append(test["id"])
+            self.step_numbers.append(i + 1)
+            for name in self.STRING_COLUMNS:
+                self.columns[name].append(self._intern(step[name]))
+
+    def value(self, row, name):
+        """Строковое значение колонки name в строке row"""
+        return self._strings[self.columns[name][row]]
+
+    def iter_test_cases(self):
+        """Восстанавливает поток тест-кейсов (для экспорта)"""
+        test = None
+        for row in range(len(self.test_ids)):
+            if self.step_numbers[row] == 1:
+                if test is not None:
+                    yield test
+                test = {"id": self.test_ids[row], "steps": []}
+            test["steps"].append({name: self.value(row, name) for name in self.STRING_COLUMNS})
+        if test is not None:
+            yield test
+
+
+class ResultsTableModel(QAbstractTableModel):
+    """Модель таблицы результатов: Qt запрашивает только видимые ячейки"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.store = TestStepStore()
+
+    def reset(self):
+        self.beginResetModel()
+        self.store = TestStepStore()
+        self.endResetModel()
+
+    def append_tests(self, test_cases):
+        """Дописывает пачку тестов одной операцией вставки строк"""
+        test_cases = list(test_cases)
+        new_rows = sum(len(test["steps"]) for test in test_cases)
+        if not new_rows:
+            self.store.test_count += len(test_cases)
+            return
+
+        first_row = len(self.store)
+        self.beginInsertRows(QModelIndex(), first_row, first_row + new_rows - 1)
+        for test in test_cases:
+            self.store.append_test(test)
+        self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+
+        row = index.row()
+        column = index.column()
+        store = self.store
+        if column == 0:
+            return f"Test #{store.test_ids[row]}" if store.step_numbers[row] == 1 else ""
+        if column == 1:
+            return str(store.step_numbers[row])
+        if column == 2:
+            return store.value(row, "from_node")
+        if column == 3:
+            return store.value(row, "to_node")
+        if column == 4:
+            return f"{store.value(row, 'action')}\n(Input: {store.value(row, 'input')})"
+        return store.value(row, "expected")
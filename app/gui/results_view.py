@@ -1,5 +1,10 @@
-import pandas as pd
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QLabel, QPushButton, QHeaderView, QFileDialog, QMessageBox
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTableView, QLabel, QPushButton, QHeaderView, QFileDialog, QMessageBox, QProgressDialog
+from PyQt6.QtCore import QTimer, Qt
+
+from .results_model import ResultsTableModel
+from .workers import ExportWorker, start_worker
+from ..core.exporters import get_exporter
+from ..utils.profiling import profiler
 
 class ResultsView(QWidget):
     def __init__(self):
@@ -11,79 +16,136 @@ class ResultsView(QWidget):
         self.label.setStyleSheet("font-size: 18px; font-weight: bold; margin: 10px;")
         layout.addWidget(self.label)
 
-        # Таблица
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels([
-            "ID Теста", "Шаг", "Из состояния", "В состояние", "Действие (Action)", "Ожидаемый результат"
-        ])
-        
+        # Таблица: данные лежат в колоночном хранилище модели, Qt рисует только видимые строки
+        self.model = ResultsTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setWordWrap(True)
+
         # Растягиваем колонки, чтобы они занимали всё место
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+
+        # По умолчанию строка вмещает "Action + (Input: ...)"; точная высота
+        # измеряется лениво и только для строк, попавших в область видимости
+        rows_header = self.table.verticalHeader()
+        rows_header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        rows_header.setDefaultSectionSize(self.table.fontMetrics().lineSpacing() * 2 + 10)
         layout.addWidget(self.table)
 
-        # Сохраним данные тестов в переменную класса, чтобы было что экспортировать
-        self.current_test_cases = []
+        self._measured_rows = set()
+        self._measure_timer = QTimer(self)
+        self._measure_timer.setSingleShot(True)
+        self._measure_timer.timeout.connect(self._measure_visible_rows)
+        self.table.verticalScrollBar().valueChanged.connect(self._schedule_measure)
+        self.model.rowsInserted.connect(self._schedule_measure)
+
+        # Фоновый экспорт
+        self.export_worker = None
+        self.export_thread = None
+        self.export_progress = None
+
+    @property
+    def store(self):
+        """Колоночное хранилище текущих результатов (используется для экспорта)"""
+        return self.model.store
 
     def display_tests(self, test_cases):
-        """Заполняет таблицу данными из генератора"""
-        self.table.setRowCount(0) # Очищаем старое
-        self.current_test_cases = test_cases # Сохраняем для экспорта
-        
-        row = 0
-        for test in test_cases:
-            test_id = test["id"]
-            for i, step in enumerate(test["steps"]):
-                self.table.insertRow(row)
-                
-                # Заполняем ячейки
-                self.table.setItem(row, 0, QTableWidgetItem(f"Test #{test_id}" if i == 0 else ""))
-                self.table.setItem(row, 1, QTableWidgetItem(str(i + 1)))
-                self.table.setItem(row, 2, QTableWidgetItem(step["from_node"]))
-                self.table.setItem(row, 3, QTableWidgetItem(step["to_node"]))
-                action_with_input = f"{step['action']}\n(Input: {step['input']})"
-                self.table.setItem(row, 4, QTableWidgetItem(action_with_input))
-                
-                self.table.setItem(row, 5, QTableWidgetItem(step["expected"]))
-                row += 1
-        
-                 # Разрешаем перенос строк
-                self.table.resizeRowsToContents()
-    
+        """Заполняет таблицу данными из генератора (принимает любой итерируемый поток тестов)"""
+        with profiler.span("results.display_tests") as span:
+            self.begin_tests()
+            self.append_tests(test_cases)
+            span.info.update(tests=self.store.test_count, rows=len(self.store))
+
+    def begin_tests(self):
+        """Очищает таблицу перед приемом нового потока тестов"""
+        self.model.reset()
+        self._measured_rows = set()
+        self.label.setText("Сгенерированные тест-кейсы")
+
+    def append_tests(self, test_cases):
+        """Дописывает в таблицу очередную пачку тестов"""
+        with profiler.span("results.append_tests") as span:
+            rows_before = len(self.store)
+            self.model.append_tests(test_cases)
+            span.info["rows"] = len(self.store) - rows_before
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._schedule_measure()
+
+    def _schedule_measure(self, *args):
+        # Схлопываем серию прокруток/вставок в одно измерение
+        self._measure_timer.start(0)
+
+    def _measure_visible_rows(self):
+        """Подгоняет высоту только видимых и еще не измеренных строк"""
+        viewport = self.table.viewport()
+        first = self.table.rowAt(0)
+        if first < 0:
+            return
+        last = self.table.rowAt(viewport.height() - 1)
+        if last < 0:
+            last = self.model.rowCount() - 1
+        for row in range(first, last + 1):
+            if row not in self._measured_rows:
+                self._measured_rows.add(row)
+                self.table.resizeRowToContents(row)
+
+    def show_summary(self, strategy_title, coverage=None, truncation=None):
+        """Показывает в заголовке стратегию, число тестов, покрытие и причины обрезки"""
+        text = f"Сгенерированные тест-кейсы: {self.store.test_count} ({strategy_title}"
+        if coverage is not None:
+            text += f", покрытие {coverage:.1f}%"
+        text += ")"
+        if truncation is not None and truncation.truncated:
+            text += f"\nРезультат неполный: {truncation.summary()}"
+        self.label.setText(text)
+
     def export_to_excel(self):
-        if not self.current_test_cases:
+        self.export_as("xlsx")
+
+    def export_as(self, exporter_key):
+        """Экспорт текущих результатов в формат из реестра экспортеров"""
+        exporter = get_exporter(exporter_key)
+        if not len(self.store):
             QMessageBox.warning(self, "Ошибка", "Нет данных для экспорта!")
             return
+        if not exporter.available:
+            QMessageBox.warning(self, "Ошибка", f"Для формата {exporter.extension} не установлен пакет {exporter.requires}")
+            return
 
         # Спрашиваем пользователя, куда сохранить файл
         file_path, _ = QFileDialog.getSaveFileName(
-            self, "Сохранить тесты", "", "Excel Files (*.xlsx)"
+            self, "Сохранить тесты", "", exporter.file_filter
         )
 
         if file_path:
-            if not file_path.endswith(".xlsx"):
-                file_path += ".xlsx"
-
-            try:
-                # Подготавливаем данные для Pandas
-                flat_data = []
-                for test in self.current_test_cases:
-                    for i, step in enumerate(test["steps"]):
-                        flat_data.append({
-                            "Test ID": f"Test #{test['id']}",
-                            "Step #": i + 1,
-                            "From State": step["from_node"],
-                            "To State": step["to_node"],
-                            "Action": step["action"],
-                            "Input Data": step["input"],
-                            "Expected Result": step["expected"]
-                        })
-
-                # Создаем DataFrame и сохраняем
-                df = pd.DataFrame(flat_data)
-                df.to_excel(file_path, index=False)
-                
-                QMessageBox.information(self, "Успех", f"Файл успешно сохранен:\n{file_path}")
-            except Exception as e:
-                QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить файл: {str(e)}")
\ No newline at end of file
+            if not file_path.endswith(exporter.extension):
+                file_path += exporter.extension
+            self.run_export(exporter.func, file_path)
+
+    def run_export(self, export_func, file_path):
+        """Запускает потоковый экспорт текущих результатов в фоне с окном прогресса"""
+        # Воркер держит ссылку на текущее хранилище: новая генерация создаст другое
+        store = self.store
+        self.export_progress = QProgressDialog("Экспорт тест-кейсов...", "Отмена", 0, len(store), self)
+        self.export_progress.setWindowTitle("Экспорт")
+        self.export_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.export_progress.setMinimumDuration(300)
+
+        self.export_worker = ExportWorker(export_func, store.iter_test_cases(), file_path)
+        self.export_worker.progress.connect(self.export_progress.setValue)
+        self.export_worker.finished.connect(self.on_export_finished)
+        self.export_worker.failed.connect(self.on_export_failed)
+        self.export_worker.cancelled.connect(self.export_progress.close)
+        self.export_progress.canceled.connect(self.export_worker.cancel)
+        self.export_thread = start_worker(self.export_worker, self)
+
+    def on_export_finished(self, file_path, rows):
+        self.export_progress.close()
+        QMessageBox.information(self, "Успех", f"Файл успешно сохранен:\n{file_path}")
+
+    def on_export_failed(self, message):
+        self.export_progress.close()
+        QMessageBox.critical(self, "Ошибка", f"Не удалось сохранить файл: {message}")
@@ -0,0 +1,166 @@
+from PyQt6.QtWidgets import QGraphicsScene
+from PyQt6.QtCore import QTimer, QRectF
+
+from .graph_transition import GraphTransitionItem
+from ..utils.profiling import profiler
+
+# Размер узла на сцене (см. GraphNodeItem)
+NODE_SIZE = 100
+
+
+class SceneLoader:
+    """
+    Пакетное наполнение сцены при открытии проекта.
+    Пока идет загрузка, индекс сцены отключен, а геометрия стрелок не пересчитывается
+    на каждое изменение: она вычисляется один раз в конце пачки.
+    Сначала создаются элементы, попадающие в видимую область, остальные
+    дозаполняются по таймеру пачками по BATCH_SIZE, не блокируя интерфейс.
+    """
+    BATCH_SIZE = 500
+
+    def __init__(self, scene, view, create_node_item):
+        self.scene = scene
+        self.view = view
+        self.create_node_item = create_node_item # logical_node -> GraphNodeItem
+
+        self._timer = QTimer()
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._run_batch)
+
+        self._work = None
+        self._graph = None
+        self._node_items = {}
+        self._pending_geometry = []
+        self._created = 0
+        self._total = 0
+        self._on_progress = None
+        self._on_finished = None
+
+    @property
+    def running(self):
+        return self._work is not None
+
+    def start(self, graph, layout, on_progress=None, on_finished=None):
+        """
+        Начинает заполнение сцены элементами графа.
+        on_progress(created, total) вызывается после каждой пачки, on_finished() - в конце
+        """
+        self.cancel()
+
+        self._graph = graph
+        self._node_items = {}
+        self._created = 0
+        self._total = graph.node_count + graph.transition_count
+        self._on_progress = on_progress
+        self._on_finished = on_finished
+        self._work = self._iter_work(graph, layout)
+
+        self.scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+
+        # Видимая часть строится сразу, одним обновлением экрана
+        self.view.setUpdatesEnabled(False)
+        try:
+            self._run_batch()
+        finally:
+            self.view.setUpdatesEnabled(True)
+
+        if self.running:
+            self._timer.start()
+
+    def finish(self):
+        """Синхронно достраивает оставшиеся элементы (например, перед сохранением)"""
+        while self.running:
+            self._run_batch()
+
+    def cancel(self):
+        """Прерывает загрузку (уже созданные элементы остаются на сцене)"""
+        if self._work is None:
+            return
+        self._timer.stop()
+        self._work = None
+        self._pending_geometry = []
+        self.scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+
+    def _iter_work(self, graph, layout):
+        """Порядок создания: видимые узлы, стрелки между ними, остальные узлы, остальные стрелки"""
+        visible_rect = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+
+        visible_nodes = []
+        other_nodes = []
+        for node in graph.nodes:
+            x, y = layout.node_pos(node.id)
+            if visible_rect.intersects(QRectF(x, y, NODE_SIZE, NODE_SIZE)):
+                visible_nodes.append(node)
+            else:
+                other_nodes.append(node)
+
+        visible_ids = {node.id for node in visible_nodes}
+        visible_transitions = []
+        other_transitions = []
+        for trans in graph.transitions:
+            if trans.source.id in visible_ids and trans.target.id in visible_ids:
+                visible_transitions.append(trans)
+            else:
+                other_transitions.append(trans)
+
+        for nodes, transitions in ((visible_nodes, visible_transitions), (other_nodes, other_transitions)):
+            for node in nodes:
+                self._add_node(node, layout.node_pos(node.id))
+                yield
+            for trans in transitions:
+                self._add_transition(trans, layout.anchor_pos(trans.id))
+                yield
+
+    def _add_node(self, logical_node, pos):
+        item = self.create_node_item(logical_node)
+        item.setPos(*pos)
+        self.scene.addItem(item)
+        self._node_items[logical_node.id] = item
+
+    def _add_transition(self, logical_trans, anchor_pos):
+        # Переход могли удалить из модели, пока сцена еще заполнялась
+        if self._graph.get_transition(logical_trans.id) is None:
+            return
+        source_item = self._node_items.get(logical_trans.source.id)
+        target_item = self._node_items.get(logical_trans.target.id)
+        if source_item is None or target_item is None:
+            return
+
+        visual_trans = GraphTransitionItem(source_item, target_item, logical_trans, anchor_pos, defer_geometry=True)
+        self.scene.addItem(visual_trans)
+        source_item.transitions.append(visual_trans)
+        target_item.transitions.append(visual_trans)
+        self._pending_geometry.append(visual_trans)
+
+    def _run_batch(self):
+        if self._work is None:
+            return
+
+        with profiler.span("scene.load_batch") as span:
+            created_before = self._created
+            done = self._fill_batch()
+            span.info["items"] = self._created - created_before
+
+        if self._on_progress is not None:
+            self._on_progress(self._created, self._total)
+
+        if done:
+            on_finished = self._on_finished
+            self.cancel()
+            if on_finished is not None:
+                on_finished()
+
+    def _fill_batch(self):
+        """Создает очередную пачку элементов; True, если элементы кончились"""
+        done = False
+        for _ in range(self.BATCH_SIZE):
+            if next(self._work, StopIteration) is StopIteration:
+                done = True
+                break
+            self._created += 1
+
+        # Геометрия стрелок пачки считается один раз, когда оба узла уже на месте
+        for visual_trans in self._pending_geometry:
+            visual_trans.apply_deferred_geometry()
+        self._pending_geometry = []
+        return done
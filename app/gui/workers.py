@@ -0,0 +1,192 @@
+import threading
+import time
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+from ..core.test_generator import (
+    TestGenerator, TruncationReport, GenerationResult, GenerationLimits, STRATEGY_ALL_PATHS, report_counters
+)
+from ..core.coverage import transition_coverage
+from ..core.parallel import iter_paths_parallel
+from ..core.minimization import MINIMIZE_NONE, minimize_paths
+from ..core.exporters import ExportCancelled, export_test_cases
+from ..utils.profiling import profiler
+
+
+class GenerationWorker(QObject):
+    """
+    Генерация тестов в фоновом потоке.
+    Тест-кейсы уходят в интерфейс пачками через сигналы, отмена - кооперативная.
+    previous и changes (результат прошлой генерации и изменения модели с тех пор)
+    позволяют не перебирать заново то, что не изменилось.
+    minimize - режим сокращения набора (minimization.MINIMIZE_*): тогда пути сначала
+    перебираются целиком, а в интерфейс уходит уже сокращенный набор
+    """
+    batch_ready = pyqtSignal(list) # Пачка отформатированных тест-кейсов
+    progress = pyqtSignal(int, int) # Найдено путей, раскрыто узлов
+    finished = pyqtSignal(object) # GenerationResult
+    failed = pyqtSignal(str)
+
+    BATCH_SIZE = 500 # Максимум тестов в одной пачке
+    BATCH_INTERVAL = 0.1 # Не чаще, чем раз в столько секунд
+
+    def __init__(self, graph, strategy, limits, workers=1, previous=None, changes=None, cache=None,
+                 minimize=MINIMIZE_NONE):
+        super().__init__()
+        self.generator = TestGenerator(graph)
+        self.strategy = strategy
+        self.limits = limits or GenerationLimits()
+        self.workers = workers
+        self.previous = previous
+        self.changes = changes
+        self.cache = cache # PathCache или None
+        self.minimize = minimize
+        self.minimization = None # MinimizationReport после сокращения набора
+
+    def cancel(self):
+        """Вызывается из GUI-потока"""
+        self.generator.cancel()
+
+    def run(self):
+        try:
+            with profiler.span("generation", strategy=self.strategy, workers=self.workers) as span:
+                result = self._generate(span)
+            self.finished.emit(result)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+    def _generate(self, span):
+        report = TruncationReport()
+        coverage = None
+        start_node = self.generator.find_start_node()
+        cached = None
+        if self.cache is not None and start_node is not None:
+            with profiler.span("generation.cache_get"):
+                cached = self.cache.get(self.generator.graph, start_node, self.strategy, self.limits)
+
+        if cached is not None:
+            paths = cached.paths
+            coverage = cached.coverage
+            report = cached.truncation
+        elif self.changes is not None and self.generator.can_reuse(self.previous, self.changes, self.strategy, self.limits):
+            paths = self.generator.iter_regenerated_paths(self.previous, self.changes, self.limits, report)
+            if not self.changes.structural:
+                coverage = self.previous.coverage
+        elif self.strategy == STRATEGY_ALL_PATHS:
+            if self.workers > 1:
+                paths = iter_paths_parallel(
+                    self.generator.graph, self.limits, report, self.workers,
+                    cancel_event=self.generator.cancel_event
+                )
+            else:
+                paths = self.generator.iter_paths(self.limits, report)
+        else:
+            result = self.generator.generate(self.strategy, self.limits)
+            paths = result.paths
+            coverage = result.coverage
+            report = result.truncation
+
+        # Перебор ленивый и идет вперемешку с форматированием: время перебора считается отдельно
+        paths = profiler.timed_iter("generation.enumerate", paths)
+        # Пути запоминаются для следующей (инкрементальной) генерации
+        if self.minimize == MINIMIZE_NONE:
+            collected = []
+            self._stream(self.generator.iter_test_cases(self._collect(paths, collected)), report)
+        else:
+            # Сокращать можно только готовый набор; в результат (и кэш) идет полный,
+            # иначе следующая генерация не сможет переиспользовать пути
+            collected = list(paths)
+            with profiler.span("generation.minimize", mode=self.minimize) as minimize_span:
+                shown, self.minimization = minimize_paths(
+                    collected, self.generator.edges, self.minimize, self.strategy
+                )
+                minimize_span.info.update(before=len(collected), after=len(shown))
+            self._stream(self.generator.iter_test_cases(shown), report)
+        if coverage is None:
+            # Полный перебор шел потоком - покрытие считается по собранным путям
+            with profiler.span("generation.coverage"):
+                coverage = transition_coverage(self.generator.graph, collected)
+        start_id = start_node.id if start_node else None
+        result = GenerationResult(
+            collected, self.strategy, coverage, report, start_id, self.limits, self.generator.edges.transitions,
+            self.generator.analysis
+        )
+        if cached is None and self.cache is not None and start_node is not None:
+            with profiler.span("generation.cache_put"):
+                self.cache.put(self.generator.graph, start_node, result, self.limits)
+        span.info.update(report_counters(report), paths=len(collected), cached=cached is not None)
+        return result
+
+    @staticmethod
+    def _collect(paths, collected):
+        for path in paths:
+            collected.append(path)
+            yield path
+
+    def _stream(self, test_cases, report):
+        """Отправляет тест-кейсы пачками, пока поток не кончится или не придет отмена"""
+        batch = []
+        sent = 0
+        last_emit = time.monotonic()
+        for test in test_cases:
+            batch.append(test)
+            now = time.monotonic()
+            if len(batch) >= self.BATCH_SIZE or now - last_emit >= self.BATCH_INTERVAL:
+                sent += len(batch)
+                self.batch_ready.emit(batch)
+                self.progress.emit(sent, report.nodes_expanded)
+                batch = []
+                last_emit = now
+            if self.generator.cancelled:
+                report.cancelled = True
+                break
+
+        if batch:
+            sent += len(batch)
+            self.batch_ready.emit(batch)
+        self.progress.emit(sent, report.nodes_expanded)
+
+
+class ExportWorker(QObject):
+    """
+    Экспорт результатов в фоновом потоке.
+    export_func(test_cases, file_path, progress, cancel_event) - потоковый экспортер
+    """
+    progress = pyqtSignal(int) # Записано строк
+    finished = pyqtSignal(str, int) # Путь к файлу, число строк
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, export_func, test_cases, file_path):
+        super().__init__()
+        self.export_func = export_func
+        self.test_cases = test_cases
+        self.file_path = file_path
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Вызывается из GUI-потока"""
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            rows = export_test_cases(self.export_func, self.test_cases, self.file_path, self.progress.emit, self.cancel_event)
+            self.finished.emit(self.file_path, rows)
+        except ExportCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+def start_worker(worker, parent):
+    """Запускает QObject-воркер в отдельном QThread; поток завершается вместе с воркером"""
+    thread = QThread(parent)
+    worker.moveToThread(thread)
+    thread.started.connect(worker.run)
+    for name in ("finished", "failed", "cancelled"):
+        signal = getattr(worker, name, None)
+        if signal is not None:
+            signal.connect(thread.quit)
+    thread.finished.connect(worker.deleteLater)
+    thread.finished.connect(thread.deleteLater)
+    thread.start()
+    return thread
@@ -0,0 +1,228 @@
+"""
+Необязательная инструментация горячих мест: генерация, таблица результатов,
+сохранение/загрузка, экспорт, перерисовка холста.
+Пока профилирование выключено, span() и timed_iter() почти ничего не стоят.
+Накопленные события сохраняются в JSON в формате Trace Event (открывается в
+chrome://tracing или Perfetto); отдельный запуск можно записать через cProfile.
+"""
+import cProfile
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Флаг командной строки и переменная окружения, включающие профилирование
+PROFILE_FLAG = "--profile"
+PROFILE_ENV = "MBT_PROFILE"
+
+# Сколько последних событий хранится (перерисовки идут десятками в секунду)
+MAX_EVENTS = 100000
+
+
+class Span:
+    """
+    Замер одного участка кода. В info можно дописывать подробности прямо внутри
+    блока with; для bytes и rows при записи добавляется скорость в секунду
+    """
+    __slots__ = ("profiler", "name", "info", "started", "_cprofile", "_cprofile_path")
+
+    def __init__(self, profiler, name, info):
+        self.profiler = profiler
+        self.name = name
+        self.info = info
+        self.started = 0.0
+        self._cprofile = None
+        self._cprofile_path = None
+
+    def __enter__(self):
+        self._cprofile_path = self.profiler._take_capture(self.name)
+        if self._cprofile_path is not None:
+            self._cprofile = cProfile.Profile()
+        self.started = time.perf_counter()
+        if self._cprofile is not None:
+            self._cprofile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.started
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self._cprofile_path)
+            self._cprofile = None
+        if exc_type is not None:
+            self.info["error"] = exc_type.__name__
+        self.profiler.record(self.name, self.started, duration, self.info)
+        return False
+
+
+class _NullSpan:
+    """Заглушка для выключенного профилирования"""
+    __slots__ = ("info",)
+
+    def __init__(self):
+        self.info = {}
+
+    def __enter__(self):
+        # Свой словарь на каждый вход: вызывающий код может в него писать
+        self.info = {}
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class Profiler:
+    """
+    Сборщик событий профилирования. Методы можно вызывать из любого потока.
+    Событие - словарь: name, start (сек от создания профайлера), duration, thread, info
+    """
+    def __init__(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.events = deque(maxlen=MAX_EVENTS)
+        self.stats = {} # Имя -> {"count", "total", "max"}
+        self.last = {} # Имя -> последнее событие
+        self._lock = threading.Lock()
+        self._null_span = _NullSpan()
+        self._capture_name = None # Имя участка, следующий запуск которого пишется в cProfile
+        self._capture_path = None
+
+    def enable_from(self, argv):
+        """Включает профилирование по флагу --profile (флаг убирается из argv) или переменной окружения"""
+        if PROFILE_FLAG in argv:
+            argv.remove(PROFILE_FLAG)
+            self.enabled = True
+        if os.environ.get(PROFILE_ENV):
+            self.enabled = True
+        return self.enabled
+
+    def span(self, name, **info):
+        """Контекстный менеджер замера: with profiler.span("project.save", path=...) as span"""
+        if not self.enabled and self._capture_name != name:
+            return self._null_span
+        return Span(self, name, info)
+
+    def timed_iter(self, name, iterable, **info):
+        """
+        Оборачивает ленивый поток (например, перебор путей): в событие попадает
+        только время внутри next(), а не время обработки элементов снаружи
+        """
+        if not self.enabled:
+            return iterable
+        return self._timed_iter(name, iterable, info)
+
+    def _timed_iter(self, name, iterable, info):
+        iterator = iter(iterable)
+        started = time.perf_counter()
+        spent = 0.0
+        count = 0
+        try:
+            while True:
+                before = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    spent += time.perf_counter() - before
+                    break
+                spent += time.perf_counter() - before
+                count += 1
+                yield item
+        finally:
+            info["items"] = count
+            info["wall"] = time.perf_counter() - started
+            self.record(name, started, spent, info)
+
+    def record(self, name, started, duration, info=None):
+        """Записывает готовое событие (started - значение time.perf_counter())"""
+        if not self.enabled:
+            return
+        info = dict(info or {})
+        for key in ("bytes", "rows", "items"):
+            if key in info and duration > 0:
+                info[key + "_per_sec"] = round(info[key] / duration, 1)
+        event = {
+            "name": name,
+            "start": started - self.origin,
+            "duration": duration,
+            "thread": threading.current_thread().name,
+            "tid": threading.get_ident(),
+            "info": info,
+        }
+        with self._lock:
+            self.events.append(event)
+            self.last[name] = event
+            stat = self.stats.get(name)
+            if stat is None:
+                stat = self.stats[name] = {"count": 0, "total": 0.0, "max": 0.0}
+            stat["count"] += 1
+            stat["total"] += duration
+            stat["max"] = max(stat["max"], duration)
+
+    def last_event(self, name):
+        with self._lock:
+            return self.last.get(name)
+
+    def stat(self, name):
+        """Сводка по участку: {"count", "total", "max"} или None"""
+        with self._lock:
+            stat = self.stats.get(name)
+            return dict(stat) if stat is not None else None
+
+    def reset(self):
+        with self._lock:
+            self.events.clear()
+            self.stats = {}
+            self.last = {}
+
+    def capture_next(self, name, file_path):
+        """
+        Записать следующий запуск участка name в cProfile (файл .prof для pstats/snakeviz).
+        cProfile видит только поток, в котором выполняется участок
+        """
+        with self._lock:
+            self._capture_name = name
+            self._capture_path = file_path
+
+    def _take_capture(self, name):
+        """Файл для cProfile, если запуск участка name нужно записать, иначе None"""
+        with self._lock:
+            if self._capture_name != name:
+                return None
+            path = self._capture_path
+            self._capture_name = None
+            self._capture_path = None
+        return path
+
+    def to_trace(self):
+        """События в формате Trace Event (время в микросекундах)"""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+            stats = {name: dict(stat) for name, stat in self.stats.items()}
+
+        trace = []
+        threads = {}
+        for event in events:
+            threads.setdefault(event["tid"], event["thread"])
+            trace.append({
+                "name": event["name"],
+                "cat": event["name"].split(".", 1)[0],
+                "ph": "X",
+                "ts": round(event["start"] * 1e6, 1),
+                "dur": round(event["duration"] * 1e6, 1),
+                "pid": pid,
+                "tid": event["tid"],
+                "args": event["info"],
+            })
+        for tid, thread_name in threads.items():
+            trace.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+        return {"traceEvents": trace, "displayTimeUnit": "ms", "otherData": {"stats": stats}}
+
+    def dump(self, file_path):
+        """Сохраняет накопленные события в JSON-файл трассировки"""
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_trace(), f, ensure_ascii=False, default=str)
+
+
+profiler = Profiler()
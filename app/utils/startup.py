@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+
+# Флаг командной строки и переменная окружения, включающие отчет о запуске
+PROFILE_FLAG = "--profile-startup"
+PROFILE_ENV = "MBT_PROFILE_STARTUP"
+
+
+class StartupTimer:
+    """
+    Отметки времени этапов запуска приложения.
+    Отсчет идет от импорта этого модуля (первое, что делает main.py)
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.marks = [] # (этап, секунды от старта)
+        self.enabled = False
+
+    def enable_from(self, argv):
+        """Включает замеры по флагу --profile-startup (флаг убирается из argv) или переменной окружения"""
+        if PROFILE_FLAG in argv:
+            argv.remove(PROFILE_FLAG)
+            self.enabled = True
+        if os.environ.get(PROFILE_ENV):
+            self.enabled = True
+        return self.enabled
+
+    def mark(self, stage):
+        if self.enabled:
+            self.marks.append((stage, time.perf_counter() - self.started))
+
+    def report(self, stream=None):
+        """Печатает длительность каждого этапа и общее время запуска"""
+        if not self.enabled:
+            return
+        stream = stream or sys.stderr
+        previous = 0.0
+        print("Время запуска MBT-Assistant:", file=stream)
+        for stage, elapsed in self.marks:
+            print(f"  {stage:<30} {1000 * (elapsed - previous):8.1f} мс", file=stream)
+            previous = elapsed
+        print(f"  {'Итого':<30} {1000 * previous:8.1f} мс", file=stream)
+
+
+startup_timer = StartupTimer()
@@ -0,0 +1,149 @@
+"""
+Набор замеров производительности на синтетических моделях.
+
+    python -m benchmarks run --shapes chain ui_flow --sizes small medium -o results.json
+    python -m benchmarks compare base.json results.json --threshold 0.2
+
+PyQt6 не нужен: замеры можно запускать в CI без дисплея.
+"""
+import argparse
+import json
+import sys
+
+from app.core.exporters import EXPORTERS
+from app.core.test_generator import GenerationLimits, STRATEGIES, STRATEGY_ALL_PATHS, STRATEGY_ALL_TRANSITIONS
+
+from .models import SHAPES
+from .runner import SIZES, RESULTS_FORMAT, run_case, environment, parse_size
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="MBT-Assistant: замеры производительности")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="выполнить замеры и записать результаты в JSON")
+    run.add_argument("--shapes", nargs="+", choices=list(SHAPES), default=list(SHAPES),
+                     help="формы моделей (по умолчанию все)")
+    run.add_argument("--sizes", nargs="+", default=["small", "medium"],
+                     help=f"размеры моделей: {', '.join(SIZES)} или число узлов (по умолчанию: small medium)")
+    run.add_argument("--strategies", nargs="+", choices=list(STRATEGIES),
+                     default=[STRATEGY_ALL_PATHS, STRATEGY_ALL_TRANSITIONS], help="стратегии генерации")
+    run.add_argument("--formats", nargs="+", choices=list(EXPORTERS), default=["csv", "jsonl"],
+                     help="форматы экспорта (недоступные пропускаются)")
+    run.add_argument("--seed", type=int, default=0, help="зерно генераторов моделей")
+    run.add_argument("--repeat", type=int, default=3, help="повторов замера времени на этап")
+    run.add_argument("--no-memory", action="store_true", help="не замерять пиковую память (tracemalloc)")
+    run.add_argument("--max-depth", type=int, default=100, help="максимальная длина пути (по умолчанию: %(default)s)")
+    run.add_argument("--max-paths", type=int, default=2000, help="максимальное число путей (по умолчанию: %(default)s)")
+    run.add_argument("--loop-unroll", type=int, default=1, help="сколько раз переход может повториться в пути")
+    run.add_argument("--time-budget", type=float, default=60, help="бюджет времени на генерацию, сек")
+    run.add_argument("-o", "--output", default="benchmark-results.json", help="файл результатов")
+
+    compare = commands.add_parser("compare", help="сравнить два файла результатов")
+    compare.add_argument("base", help="результаты до изменений")
+    compare.add_argument("current", help="результаты после изменений")
+    compare.add_argument("--threshold", type=float, default=0.2,
+                         help="допустимый относительный рост времени и памяти (по умолчанию: %(default)s)")
+    compare.add_argument("--min-seconds", type=float, default=0.005,
+                         help="более быстрые этапы не проверяются по времени: их замер шумный")
+    return parser
+
+
+def _print_stage(shape, size, result):
+    record = result.to_dict()
+    line = f"{shape:<13} {size:>7} {result.stage:<26} {1000 * record['seconds']:10.1f} мс"
+    if result.peak_bytes is not None:
+        line += f" {result.peak_bytes / (1024 * 1024):9.1f} МБ"
+    print(line, file=sys.stderr, flush=True)
+
+
+def run_benchmarks(options):
+    if options.repeat < 1:
+        print("--repeat должен быть не меньше 1", file=sys.stderr)
+        return 2
+    try:
+        sizes = [parse_size(value) for value in options.sizes]
+    except ValueError as e:
+        print(f"Неверный размер модели: {e}", file=sys.stderr)
+        return 2
+
+    limits = GenerationLimits(options.max_depth, options.max_paths, options.loop_unroll, options.time_budget)
+    results = []
+    for shape in options.shapes:
+        for size in sizes:
+            results += run_case(
+                shape, size, options.seed, limits, options.strategies, options.formats,
+                options.repeat, not options.no_memory, on_result=_print_stage
+            )
+
+    with open(options.output, "w", encoding="utf-8") as f:
+        json.dump({"meta": environment(options.seed, options.repeat, limits), "results": results},
+                  f, ensure_ascii=False, indent=2)
+    print(f"Результаты записаны в {options.output}", file=sys.stderr)
+    return 0
+
+
+def _load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("meta", {}).get("format") != RESULTS_FORMAT:
+        raise ValueError(f"{path}: неподдерживаемый формат результатов")
+    return {(r["shape"], r["size"], r["stage"]): r for r in data["results"]}
+
+
+def _ratio(new, old):
+    if new is None or old is None or old <= 0:
+        return None
+    return new / old
+
+
+def compare_results(options):
+    """Печатает изменения по совпадающим этапам; код возврата 1, если есть ухудшения"""
+    try:
+        base = _load_results(options.base)
+        current = _load_results(options.current)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Не удалось прочитать результаты: {e}", file=sys.stderr)
+        return 2
+
+    regressions = 0
+    for key in current:
+        if key not in base:
+            continue
+        shape, size, stage = key
+        time_ratio = _ratio(current[key]["seconds"], base[key]["seconds"])
+        noisy = max(current[key]["seconds"], base[key]["seconds"]) < options.min_seconds
+        memory_ratio = _ratio(current[key]["peak_bytes"], base[key]["peak_bytes"])
+
+        marks = []
+        for title, ratio in (("время", time_ratio), ("память", memory_ratio)):
+            if ratio is not None and ratio > 1 + options.threshold and not (noisy and title == "время"):
+                marks.append(title)
+        if marks:
+            regressions += 1
+
+        line = f"{shape:<13} {size:>7} {stage:<26}"
+        line += f" время x{time_ratio:.2f}" if time_ratio is not None else " время   -  "
+        line += f"  память x{memory_ratio:.2f}" if memory_ratio is not None else "  память   -  "
+        if marks:
+            line += "  УХУДШЕНИЕ: " + ", ".join(marks)
+        print(line)
+
+    missing = len(set(base) - set(current))
+    if missing:
+        print(f"Этапов нет в новых результатах: {missing}")
+    print(f"Ухудшений сверх {options.threshold:.0%}: {regressions}")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    if options.command == "run":
+        return run_benchmarks(options)
+    if options.command == "compare":
+        return compare_results(options)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Синтетические модели для замеров производительности.
+Каждый генератор детерминирован: одинаковые (size, seed) дают один и тот же граф
+с теми же ID, текстами и координатами.
+"""
+import random
+import uuid
+
+from app.core.graph import Graph
+from app.core.project_io import ProjectLayout
+
+# Шаг сетки раскладки на холсте
+GRID = 200
+
+
+class ModelBuilder:
+    """Обертка над Graph и ProjectLayout с воспроизводимыми ID и текстами"""
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.graph = Graph()
+        self.layout = ProjectLayout()
+
+    def _new_id(self):
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def node(self, name, column, row, expected=None, initial=False):
+        node = self.graph.add_node(name, self._new_id())
+        properties = {"expected_result": expected or f"Открыт экран «{name}»"}
+        if initial:
+            properties["is_initial"] = True
+        node.properties = properties
+        self.layout.nodes[node.id] = (float(column * GRID), float(row * GRID))
+        return node
+
+    def transition(self, source, target, action, input_data="N/A", error=False):
+        trans = self.graph.add_transition(source, target, action, self._new_id())
+        trans.properties = {"input_data": input_data, "type": "Error" if error else "Success"}
+        return trans
+
+    def result(self):
+        # Построение модели - не правка пользователя
+        self.graph.take_changes()
+        return self.graph, self.layout
+
+
+def build_chain(size, seed=0):
+    """Цепочка из size состояний: один путь длины size - 1"""
+    builder = ModelBuilder(seed)
+    previous = builder.node("Состояние 0", 0, 0, initial=True)
+    for i in range(1, size):
+        node = builder.node(f"Состояние {i}", i % 100, i // 100)
+        builder.transition(previous, node, f"Шаг {i}", f"Значение {builder.rng.randint(0, 999)}")
+        previous = node
+    return builder.result()
+
+
+def build_fan_out(size, seed=0, width=8):
+    """Дерево с ветвлением width: много коротких путей, число путей ~ числу листьев"""
+    builder = ModelBuilder(seed)
+    nodes = [builder.node("Корень", 0, 0, initial=True)]
+    for i in range(1, size):
+        parent = nodes[(i - 1) // width]
+        node = builder.node(f"Узел {i}", i % 100, i // 100)
+        builder.transition(parent, node, f"Выбор {(i - 1) % width + 1}")
+        nodes.append(node)
+    return builder.result()
+
+
+def build_dense_cyclic(size, seed=0, degree=4):
+    """
+    Сильно связный граф: кольцо плюс degree - 1 случайных переходов из каждого узла.
+    Число путей растет экспоненциально, поэтому перебор держится на ограничениях
+    """
+    builder = ModelBuilder(seed)
+    rng = builder.rng
+    nodes = [builder.node(f"Состояние {i}", i % 100, i // 100, initial=(i == 0)) for i in range(size)]
+    for i, node in enumerate(nodes):
+        builder.transition(node, nodes[(i + 1) % size], f"Далее из {i}")
+        for k in range(degree - 1):
+            target = nodes[rng.randrange(size)]
+            builder.transition(node, target, f"Переход {i}.{k}", error=rng.random() < 0.2)
+    return builder.result()
+
+
+def build_layered_dag(size, seed=0, width=10, fan=2):
+    """
+    Ациклический граф из слоев по width узлов: каждый узел связан с fan случайными
+    узлами следующего слоя. Путей экспоненциально много по числу слоев
+    """
+    builder = ModelBuilder(seed)
+    rng = builder.rng
+    root = builder.node("Старт", 0, 0, initial=True)
+    layers = [[root]]
+    created = 1
+    while created < size:
+        row = len(layers)
+        count = min(width, size - created)
+        layers.append([builder.node(f"Слой {row}, узел {j}", j, row) for j in range(count)])
+        created += count
+
+    for upper, lower in zip(layers, layers[1:]):
+        # Каждый узел слоя достижим хотя бы по одному переходу
+        for j, node in enumerate(lower):
+            builder.transition(upper[j % len(upper)], node, f"В {node.name}")
+        for node in upper:
+            for target in rng.sample(lower, min(fan - 1, len(lower))):
+                builder.transition(node, target, f"{node.name} -> {target.name}")
+    return builder.result()
+
+
+def build_ui_flow(size, seed=0, screens_per_section=12):
+    """
+    Похоже на модель реального приложения: главный экран, разделы с цепочками экранов,
+    формы с успешным и ошибочным вводом, возвраты назад и на главный экран
+    """
+    builder = ModelBuilder(seed)
+    rng = builder.rng
+    home = builder.node("Главный экран", 0, 0, "Отображается главное меню", initial=True)
+    created = 1
+    section = 0
+    while created < size:
+        section += 1
+        previous = home
+        for step in range(min(screens_per_section, size - created)):
+            screen = builder.node(f"Раздел {section}: экран {step + 1}", step + 1, section)
+            created += 1
+            builder.transition(previous, screen, f"Открыть экран {step + 1}")
+            if step and rng.random() < 0.5:
+                builder.transition(screen, previous, "Назад")
+            if rng.random() < 0.3:
+                # Форма: некорректный ввод оставляет на том же экране
+                builder.transition(screen, screen, "Отправить форму", "Пустые поля", error=True)
+            if rng.random() < 0.15:
+                builder.transition(screen, home, "На главный экран")
+            previous = screen
+        builder.transition(previous, home, "Завершить сценарий", f"Данные раздела {section}")
+    return builder.result()
+
+
+# Формы моделей: ключ -> генератор(size, seed)
+SHAPES = {
+    "chain": build_chain,
+    "fan_out": build_fan_out,
+    "dense_cyclic": build_dense_cyclic,
+    "layered_dag": build_layered_dag,
+    "ui_flow": build_ui_flow,
+}
+
+
+def build_model(shape, size, seed=0):
+    """Строит модель формы shape из size узлов. Возвращает (Graph, ProjectLayout)"""
+    if shape not in SHAPES:
+        raise ValueError(f"Неизвестная форма модели: {shape}")
+    return SHAPES[shape](size, seed)
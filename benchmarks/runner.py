@@ -0,0 +1,220 @@
+"""
+Замеры этапов работы с моделью: построение графа, сохранение и загрузка проекта,
+генерация путей, форматирование тест-кейсов и экспорт.
+Время каждого этапа меряется repeat раз без tracemalloc, пиковая память - отдельным
+прогоном под tracemalloc (он заметно замедляет выполнение и исказил бы время).
+"""
+import datetime
+import gc
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from app.core.exporters import get_exporter
+from app.core.project_io import save_project, load_project
+from app.core.test_generator import TestGenerator, GenerationLimits, STRATEGY_ALL_PATHS
+
+from .models import build_model
+
+# Версия формата файла результатов
+RESULTS_FORMAT = 1
+
+# Именованные размеры моделей (число узлов)
+SIZES = {
+    "small": 100,
+    "medium": 1000,
+    "large": 10000,
+}
+
+
+class Stage:
+    """
+    Этап замера. func(context) выполняет работу и возвращает словарь
+    с подробностями (число путей, размер файла...) или None.
+    Этап можно повторять: он берет входные данные из context и перезаписывает свой результат
+    """
+    def __init__(self, name, func):
+        self.name = name
+        self.func = func
+
+    def __repr__(self):
+        return f"Stage('{self.name}')"
+
+
+class StageResult:
+    def __init__(self, stage, runs, peak_bytes=None, retained_bytes=None, info=None):
+        self.stage = stage
+        self.runs = runs # Время каждого повтора, сек
+        self.peak_bytes = peak_bytes
+        self.retained_bytes = retained_bytes
+        self.info = info or {}
+
+    def to_dict(self):
+        return {
+            "stage": self.stage,
+            "seconds": statistics.median(self.runs),
+            "seconds_min": min(self.runs),
+            "runs": self.runs,
+            "peak_bytes": self.peak_bytes,
+            "retained_bytes": self.retained_bytes,
+            "info": self.info,
+        }
+
+
+def build_stages(shape, size, seed, limits, strategies, formats, work_dir):
+    """Список этапов для одной модели в порядке выполнения"""
+    json_path = os.path.join(work_dir, "project.json")
+    binary_path = os.path.join(work_dir, "project.mbtp")
+
+    def build(context):
+        context["graph"], context["layout"] = build_model(shape, size, seed)
+        context.pop("generator", None)
+        return {"nodes": context["graph"].node_count, "transitions": context["graph"].transition_count}
+
+    def saver(path):
+        def save(context):
+            save_project(context["graph"], context["layout"], path)
+            return {"file_bytes": os.path.getsize(path)}
+        return save
+
+    def loader(path):
+        def load(context):
+            graph, _ = load_project(path)
+            return {"nodes": graph.node_count}
+        return load
+
+    def generator(context):
+        if "generator" not in context:
+            context["generator"] = TestGenerator(context["graph"])
+        return context["generator"]
+
+    def generate_with(strategy):
+        def generate(context):
+            # Свежий генератор: таблица переходов строится заново, как при первом запуске
+            context.pop("generator", None)
+            result = generator(context).generate(strategy, limits)
+            context.setdefault("results", {})[strategy] = result
+            return {
+                "paths": len(result.paths),
+                "steps": sum(len(path) for path in result.paths),
+                "coverage": round(result.coverage, 2),
+                "truncation": result.truncation.summary(),
+            }
+        return generate
+
+    def main_paths(context):
+        """Пути для форматирования и экспорта: полный перебор, если он был, иначе первая стратегия"""
+        results = context["results"]
+        return results.get(STRATEGY_ALL_PATHS, results[strategies[0]]).paths
+
+    def format_cases(context):
+        test_cases = generator(context).format_test_cases(main_paths(context))
+        return {"test_cases": len(test_cases)}
+
+    def exporter_to(exporter):
+        path = os.path.join(work_dir, "export" + exporter.extension)
+
+        def export(context):
+            rows = exporter.func(generator(context).iter_test_cases(main_paths(context)), path)
+            return {"rows": rows, "file_bytes": os.path.getsize(path)}
+        return export
+
+    stages = [
+        Stage("build", build),
+        Stage("save_json", saver(json_path)),
+        Stage("load_json", loader(json_path)),
+        Stage("save_binary", saver(binary_path)),
+        Stage("load_binary", loader(binary_path)),
+    ]
+    stages += [Stage(f"generate:{strategy}", generate_with(strategy)) for strategy in strategies]
+    stages.append(Stage("format_test_cases", format_cases))
+    for key in formats:
+        exporter = get_exporter(key)
+        if exporter.available:
+            stages.append(Stage(f"export:{exporter.key}", exporter_to(exporter)))
+    return stages
+
+
+def measure(stage, context, repeat, memory=True):
+    """Выполняет этап repeat раз (и еще раз под tracemalloc, если memory)"""
+    runs = []
+    info = None
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        info = stage.func(context)
+        runs.append(time.perf_counter() - started)
+
+    peak = retained = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            info = stage.func(context)
+            # Что осталось после этапа (граф, пути) и максимум по ходу этапа
+            retained, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return StageResult(stage.name, runs, peak, retained, info)
+
+
+def run_case(shape, size, seed=0, limits=None, strategies=(STRATEGY_ALL_PATHS,), formats=("csv",),
+             repeat=3, memory=True, on_result=None):
+    """
+    Прогоняет все этапы для одной модели. Возвращает список словарей результатов.
+    on_result(shape, size, StageResult) вызывается после каждого этапа
+    """
+    limits = limits or GenerationLimits()
+    strategies = list(strategies)
+    results = []
+    context = {}
+    with tempfile.TemporaryDirectory(prefix="mbt-bench-") as work_dir:
+        for stage in build_stages(shape, size, seed, limits, strategies, formats, work_dir):
+            stage_result = measure(stage, context, repeat, memory)
+            if on_result is not None:
+                on_result(shape, size, stage_result)
+            record = {"shape": shape, "size": size}
+            record.update(stage_result.to_dict())
+            results.append(record)
+    return results
+
+
+def environment(seed, repeat, limits):
+    """Сведения о запуске, по которым результаты разных коммитов можно сопоставить"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=10,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "format": RESULTS_FORMAT,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "limits": {
+            "max_depth": limits.max_depth,
+            "max_paths": limits.max_paths,
+            "loop_unroll": limits.loop_unroll,
+            "time_budget": limits.time_budget,
+        },
+    }
+
+
+def parse_size(value):
+    """Размер модели: имя из SIZES или число узлов"""
+    if value in SIZES:
+        return SIZES[value]
+    size = int(value)
+    if size < 1:
+        raise ValueError(f"Размер модели должен быть положительным: {value}")
+    return size
@@ -1,14 +1,32 @@
 import sys
-from PyQt6.QtWidgets import QApplication
-from app.gui.main_window import MainWindow
+from app.utils.startup import startup_timer
+from app.utils.profiling import profiler
 
 def main():
+    startup_timer.enable_from(sys.argv)
+    profiler.enable_from(sys.argv)
+
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QTimer
+    startup_timer.mark("Импорт PyQt6")
+
+    from app.gui.main_window import MainWindow
+    startup_timer.mark("Импорт модулей приложения")
+
     app = QApplication(sys.argv)
+    startup_timer.mark("Создание QApplication")
 
     window = MainWindow()
+    startup_timer.mark("Построение главного окна")
     window.show()
 
+    # Отчет печатается, когда окно уже показано и цикл событий запущен
+    def first_frame():
+        startup_timer.mark("Первый кадр")
+        startup_timer.report()
+    QTimer.singleShot(0, first_frame)
+
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()